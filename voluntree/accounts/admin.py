@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import User, VolunteerProfile, NGO
+from .models import User, VolunteerProfile, NGO, Skill
 
 class CustomUserAdmin(UserAdmin):
     list_display = ['username', 'email', 'user_type', 'is_staff']
@@ -14,4 +14,10 @@ class CustomUserAdmin(UserAdmin):
 
 admin.site.register(User, CustomUserAdmin)
 admin.site.register(VolunteerProfile)
-admin.site.register(NGO)
\ No newline at end of file
+admin.site.register(NGO)
+
+
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ['name', 'canonical_name']
+    search_fields = ['name', 'canonical_name']
\ No newline at end of file
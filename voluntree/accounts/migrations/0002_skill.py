@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:57
+
+from django.db import migrations, models
+
+
+def _tags_for(Skill, cache, text):
+    """Skills for a comma-separated string, creating missing ones"""
+    tags = []
+    for name in (item.strip() for item in (text or '').split(',')):
+        key = ' '.join(name.split()).casefold()
+        if not key:
+            continue
+        if key not in cache:
+            cache[key], _ = Skill.objects.get_or_create(canonical_name=key, defaults={'name': ' '.join(name.split())})
+        tags.append(cache[key])
+    return tags
+
+
+def populate_profile_tags(apps, schema_editor):
+    Skill = apps.get_model('accounts', 'Skill')
+    VolunteerProfile = apps.get_model('accounts', 'VolunteerProfile')
+    cache = {}
+    for profile in VolunteerProfile.objects.iterator():
+        profile.skill_tags.set(_tags_for(Skill, cache, profile.skills))
+        profile.interest_tags.set(_tags_for(Skill, cache, profile.interests))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('canonical_name', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='volunteerprofile',
+            name='interest_tags',
+            field=models.ManyToManyField(blank=True, related_name='interested_volunteers', to='accounts.skill'),
+        ),
+        migrations.AddField(
+            model_name='volunteerprofile',
+            name='skill_tags',
+            field=models.ManyToManyField(blank=True, related_name='volunteers', to='accounts.skill'),
+        ),
+        migrations.RunPython(populate_profile_tags, migrations.RunPython.noop),
+    ]
@@ -4,6 +4,77 @@ from django.contrib.auth.models import AbstractUser
 from django.db import models
 
 
+def split_comma_list(value):
+    """Split a comma-separated text field into trimmed, non-empty items"""
+    return [item.strip() for item in value.split(',') if item.strip()] if value else []
+
+
+def canonical_skill_name(name):
+    """Case- and whitespace-insensitive key so 'First  aid' and 'first Aid' match"""
+    return ' '.join(name.split()).casefold()
+
+
+class SkillManager(models.Manager):
+
+    def from_names(self, names):
+        """Get or create the Skills for a list of names in two queries"""
+        display_names = {}
+        for name in names:
+            key = canonical_skill_name(name)
+            if key:
+                display_names.setdefault(key, ' '.join(name.split()))
+        if not display_names:
+            return []
+
+        self.bulk_create(
+            [Skill(name=name, canonical_name=key) for key, name in display_names.items()],
+            ignore_conflicts=True,
+        )
+        return list(self.filter(canonical_name__in=display_names))
+
+
+class Skill(models.Model):
+    """Normalized skill/interest tag shared by events and volunteers"""
+    name = models.CharField(max_length=100)
+    canonical_name = models.CharField(max_length=100, unique=True)
+
+    objects = SkillManager()
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        ordering = ['name']
+
+
+class SkillTagsMixin:
+    """
+    Keep Skill many-to-many relations in step with comma-separated text
+    fields, which stay the editable form used by the current forms.
+
+    skill_tag_fields maps each text field to its M2M field.
+    """
+    skill_tag_fields = {}
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._synced_skill_text = {field: instance.__dict__.get(field) for field in cls.skill_tag_fields}
+        return instance
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+
+        synced = getattr(self, '_synced_skill_text', {})
+        for text_field, tag_field in self.skill_tag_fields.items():
+            text = getattr(self, text_field)
+            if text == synced.get(text_field) or (adding and not text):
+                continue
+            getattr(self, tag_field).set(Skill.objects.from_names(split_comma_list(text)))
+        self._synced_skill_text = {field: getattr(self, field) for field in self.skill_tag_fields}
+
+
 class User(AbstractUser):
     USER_TYPE_CHOICES = (
         ('volunteer', 'Volunteer'),
@@ -17,7 +88,7 @@ class User(AbstractUser):
         return self.username
 
 
-class VolunteerProfile(models.Model):
+class VolunteerProfile(SkillTagsMixin, models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='volunteer_profile')
     phone = models.CharField(max_length=15, blank=True)
     date_of_birth = models.DateField(null=True, blank=True)
@@ -28,12 +99,16 @@ class VolunteerProfile(models.Model):
     country = models.CharField(max_length=100, blank=True)
     skills = models.TextField(blank=True, help_text="Comma-separated skills")
     interests = models.TextField(blank=True, help_text="Comma-separated interests")
+    skill_tags = models.ManyToManyField(Skill, blank=True, related_name='volunteers')
+    interest_tags = models.ManyToManyField(Skill, blank=True, related_name='interested_volunteers')
     availability = models.CharField(max_length=200, blank=True)
     hours_completed = models.IntegerField(default=0)
     events_completed = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    skill_tag_fields = {'skills': 'skill_tags', 'interests': 'interest_tags'}
+
     def __str__(self):
         return f"{self.user.username}'s Profile"
 
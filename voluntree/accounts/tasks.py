@@ -0,0 +1,19 @@
+# accounts/tasks.py
+
+from admin_panel.models import PlatformSettings
+from core.notifications import build_notification, queue_notifications
+from core.taskqueue import task
+from .models import User
+
+
+@task
+def send_welcome_email(user_id):
+    platform = PlatformSettings.load()
+    user = User.objects.filter(pk=user_id).first()
+    if user is None or not platform.send_welcome_email:
+        return
+
+    queue_notifications([build_notification(
+        user, f'Welcome to {platform.site_name}', 'accounts/emails/welcome.txt',
+        {'site_name': platform.site_name}, dedupe_key='welcome',
+    )])
@@ -1,7 +1,7 @@
 # accounts/tests/test_models.py
 
 from django.test import TestCase
-from ..models import User, VolunteerProfile, NGO
+from ..models import User, VolunteerProfile, NGO, Skill
 
 
 class ModelTests(TestCase):
@@ -36,4 +36,27 @@ class ModelTests(TestCase):
         )
 
         # The __str__ method should return the organization's name
-        self.assertEqual(str(ngo), 'Helping Hands')
\ No newline at end of file
+        self.assertEqual(str(ngo), 'Helping Hands')
+
+
+class SkillModelTests(TestCase):
+
+    def test_from_names_canonicalizes_and_deduplicates(self):
+        skills = Skill.objects.from_names(['First Aid', ' first  aid', 'Teaching', ''])
+        self.assertEqual(sorted(skill.name for skill in skills), ['First Aid', 'Teaching'])
+        self.assertEqual(Skill.objects.count(), 2)
+
+        # Existing skills are reused, not duplicated
+        Skill.objects.from_names(['FIRST AID'])
+        self.assertEqual(Skill.objects.count(), 2)
+
+    def test_profile_tags_follow_comma_fields(self):
+        user = User.objects.create_user(username='skillvol', user_type='volunteer', email='skillvol@test.com')
+        profile = VolunteerProfile.objects.create(user=user, skills='Teaching, First Aid', interests='Environment')
+        self.assertEqual([skill.name for skill in profile.skill_tags.all()], ['First Aid', 'Teaching'])
+        self.assertEqual([skill.name for skill in profile.interest_tags.all()], ['Environment'])
+
+        profile = VolunteerProfile.objects.get(pk=profile.pk)
+        profile.skills = 'teaching'
+        profile.save()
+        self.assertEqual([skill.name for skill in profile.skill_tags.all()], ['Teaching'])
@@ -6,6 +6,7 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from .forms import VolunteerRegistrationForm, NGORegistrationForm, CustomLoginForm
 from .models import User, VolunteerProfile, NGO
+from .tasks import send_welcome_email
 from django.shortcuts import get_object_or_404
 
 
@@ -33,6 +34,7 @@ def register_volunteer(request):
         form = VolunteerRegistrationForm(request.POST)
         if form.is_valid():
             user = form.save()
+            send_welcome_email.delay(user.pk)
             login(request, user)
             messages.success(request, 'Registration successful! Welcome to Voluntree.')
             return redirect('event_list')  # Changed to event_list
@@ -56,6 +58,7 @@ def register_ngo(request):
         form = NGORegistrationForm(request.POST)
         if form.is_valid():
             user = form.save()
+            send_welcome_email.delay(user.pk)
             login(request, user)
             messages.success(request, 'Registration successful! Your NGO account is pending approval.')
             return redirect('event_list')  # Changed to event_list
@@ -109,12 +112,10 @@ def profile_view(request):
     user = request.user
     if user.user_type == 'volunteer':
         profile = VolunteerProfile.objects.get(user=user)
-        # Split comma-separated fields
         context = {
             'profile': profile,
-            'skills_list': [s.strip() for s in profile.skills.split(',') if s.strip()] if profile.skills else [],
-            'interests_list': [i.strip() for i in profile.interests.split(',') if
-                               i.strip()] if profile.interests else [],
+            'skills_list': profile.skill_tags.all(),
+            'interests_list': profile.interest_tags.all(),
         }
         return render(request, 'accounts/volunteer_profile.html', context)
     elif user.user_type == 'ngo':
@@ -222,8 +223,8 @@ def view_volunteer_profile(request, user_id):
 
     context = {
         'profile': profile,
-        'skills_list': [s.strip() for s in profile.skills.split(',') if s.strip()] if profile.skills else [],
-        'interests_list': [i.strip() for i in profile.interests.split(',') if i.strip()] if profile.interests else [],
+        'skills_list': profile.skill_tags.all(),
+        'interests_list': profile.interest_tags.all(),
     }
     return render(request, 'accounts/volunteer_profile.html', context)
 
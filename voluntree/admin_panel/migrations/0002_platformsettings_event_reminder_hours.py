@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='platformsettings',
+            name='event_reminder_hours',
+            field=models.IntegerField(default=24, help_text='Hours before an event its reminders go out'),
+        ),
+    ]
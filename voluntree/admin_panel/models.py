@@ -18,6 +18,7 @@ class PlatformSettings(models.Model):
     send_welcome_email = models.BooleanField(default=True)
     send_approval_emails = models.BooleanField(default=True)
     send_event_reminders = models.BooleanField(default=True)
+    event_reminder_hours = models.IntegerField(default=24, help_text="Hours before an event its reminders go out")
 
     # Event Settings
     require_event_approval = models.BooleanField(default=False)
@@ -0,0 +1,31 @@
+# admin_panel/tasks.py
+
+from accounts.models import NGO, User
+from core.notifications import build_notification, queue_notifications
+from core.taskqueue import task
+from .models import PlatformSettings
+
+
+@task
+def delete_user(user_id):
+    """Delete a user with everything that cascades from it (NGO, events, registrations, ...)"""
+    user = User.objects.filter(pk=user_id).first()
+    if user is not None:
+        user.delete()
+
+
+@task
+def notify_ngo_status(ngo_id):
+    """Tell an NGO its account was approved or rejected"""
+    platform = PlatformSettings.load()
+    ngo = NGO.objects.select_related('user').filter(pk=ngo_id).first()
+    if ngo is None or ngo.status not in ('approved', 'rejected') or not platform.send_approval_emails:
+        return
+
+    verdict = 'approved' if ngo.status == 'approved' else 'not approved'
+    queue_notifications([build_notification(
+        ngo.user, f'{ngo.organization_name} was {verdict} on {platform.site_name}',
+        f'admin_panel/emails/ngo_{ngo.status}.txt',
+        {'ngo': ngo, 'site_name': platform.site_name, 'support_email': platform.support_email},
+        dedupe_key=f'ngo-status:{ngo.pk}',
+    )], replace=True)
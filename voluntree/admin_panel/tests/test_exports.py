@@ -0,0 +1,53 @@
+# admin_panel/tests/test_exports.py
+
+import csv
+import io
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from accounts.models import User, NGO
+from events.models import Event
+
+
+class AdminExportTests(TestCase):
+
+    def setUp(self):
+        User.objects.create_user(username='exportadmin', password='password', user_type='admin',
+                                 email='exportadmin@test.com')
+        ngo_user = User.objects.create_user(username='adminexportngo', password='password', user_type='ngo',
+                                            email='adminexportngo@test.com')
+        ngo = NGO.objects.create(user=ngo_user, organization_name='Export Org', registration_number='AX-1',
+                                 status='approved')
+        for index, status in enumerate(['published', 'completed']):
+            Event.objects.create(
+                ngo=ngo, title=f'Exported {status}', description='...', location='Dhaka', status=status,
+                date=timezone.now() + timedelta(days=index + 1), max_volunteers=5
+            )
+        User.objects.create_user(username='rosteruser', password='password', user_type='volunteer',
+                                 email='rosteruser@test.com')
+        self.client.login(username='exportadmin', password='password')
+
+    def _csv(self, url_name, **params):
+        response = self.client.get(reverse(url_name), params)
+        self.assertTrue(response.streaming)
+        return list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode('utf-8-sig'))))
+
+    def test_users_export(self):
+        rows = self._csv('admin_users_export')
+        self.assertEqual(rows[0][:2], ['ID', 'Username'])
+        self.assertEqual([row[1] for row in rows[1:]], ['rosteruser'])
+
+    def test_ngos_export(self):
+        rows = self._csv('admin_ngos_export', search='Export')
+        self.assertEqual([row[1] for row in rows[1:]], ['Export Org'])
+
+    def test_events_export_honors_filters(self):
+        rows = self._csv('admin_events_export', status='completed')
+        self.assertEqual([row[1] for row in rows[1:]], ['Exported completed'])
+        self.assertEqual(rows[1][2], 'Export Org')
+
+    def test_requires_admin(self):
+        self.client.login(username='rosteruser', password='password')
+        response = self.client.get(reverse('admin_events_export'))
+        self.assertEqual(response.status_code, 302)
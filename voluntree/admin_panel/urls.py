@@ -15,17 +15,20 @@ urlpatterns = [
 
     # Users Management
     path('users/', views.users_list, name='admin_users'),
+    path('users/export/', views.users_export, name='admin_users_export'),
     path('user/<int:user_id>/detail/', views.user_detail, name='admin_user_detail'),
     path('user/<int:user_id>/edit/', views.user_edit, name='admin_user_edit'),
     path('user/<int:user_id>/delete/', views.user_delete, name='admin_user_delete'),
 
     # NGOs Management
     path('ngos/', views.ngos_list, name='admin_ngos'),
+    path('ngos/export/', views.ngos_export, name='admin_ngos_export'),
     path('ngo/<int:ngo_id>/edit/', views.ngo_edit, name='admin_ngo_edit'),
     path('ngo/<int:ngo_id>/delete/', views.ngo_delete, name='admin_ngo_delete'),
 
     # Events Management
     path('events/', views.events_list, name='admin_events'),
+    path('events/export/', views.events_export, name='admin_events_export'),
     path('event/<int:event_id>/detail/', views.event_detail, name='admin_event_detail'),
     path('event/<int:event_id>/edit/', views.event_edit, name='admin_event_edit'),
     path('event/<int:event_id>/delete/', views.event_delete, name='admin_event_delete'),
@@ -8,7 +8,11 @@ from django.utils import timezone
 from datetime import timedelta
 from accounts.models import User, VolunteerProfile, NGO
 from events.models import Event, EventRegistration
+from events.cards import card_cache_stats
+from events.exports import EXPORT_CHUNK_SIZE, export_response
+from events.search import get_search_backend
 from .models import PlatformSettings
+from .tasks import delete_user, notify_ngo_status
 from certificates.models import Certificate
 from django.utils import timezone
 from certificates.models import Certificate, CertificateAssignment
@@ -43,7 +47,7 @@ def admin_dashboard(request):
     recent_ngos = NGO.objects.order_by('-created_at')[:5]
 
     # Upcoming events (next 5)
-    upcoming_events_list = Event.objects.filter(
+    upcoming_events_list = Event.objects.with_stats().filter(
         date__gte=timezone.now(),
         status='published'
     ).order_by('date')[:5]
@@ -105,6 +109,7 @@ def approve_ngo(request, ngo_id):
         ngo.status = 'approved'
         ngo.approved_at = timezone.now()
         ngo.save()
+        notify_ngo_status.delay(ngo.pk)
         messages.success(request, f'{ngo.organization_name} has been approved successfully!')
     return redirect('admin_ngo_approvals')
 
@@ -118,6 +123,7 @@ def reject_ngo(request, ngo_id):
         ngo.status = 'rejected'
         ngo.approved_at = None
         ngo.save()
+        notify_ngo_status.delay(ngo.pk)
         messages.warning(request, f'{ngo.organization_name} has been rejected.')
     return redirect('admin_ngo_approvals')
 
@@ -127,7 +133,7 @@ def reject_ngo(request, ngo_id):
 def ngo_detail(request, ngo_id):
     """View NGO details"""
     ngo = get_object_or_404(NGO, id=ngo_id)
-    events = ngo.events.all()
+    events = ngo.events.with_stats()
 
     context = {
         'ngo': ngo,
@@ -136,13 +142,9 @@ def ngo_detail(request, ngo_id):
     return render(request, 'admin_panel/ngo_detail.html', context)
 
 
-@login_required
-@user_passes_test(is_admin)
-def users_list(request):
-    """List all volunteers"""
-
+def _filtered_volunteers(request):
+    """Volunteers matching the users list filters, shared with the export"""
     search_query = request.GET.get('search', '')
-
     volunteers = User.objects.filter(user_type='volunteer')
 
     if search_query:
@@ -153,7 +155,48 @@ def users_list(request):
             Q(last_name__icontains=search_query)
         )
 
-    volunteers = volunteers.order_by('-date_joined')
+    return volunteers.order_by('-date_joined')
+
+
+def _filtered_ngos(request):
+    """NGOs matching the NGOs list filters, shared with the export"""
+    search_query = request.GET.get('search', '')
+    ngos = NGO.objects.all()
+
+    if search_query:
+        ngos = ngos.filter(
+            Q(organization_name__icontains=search_query) |
+            Q(email__icontains=search_query) |
+            Q(registration_number__icontains=search_query)
+        )
+
+    return ngos.order_by('-created_at')
+
+
+def _filtered_events(request):
+    """Events matching the events list filters, shared with the export"""
+    search_query = request.GET.get('search', '')
+    status_filter = request.GET.get('status', '')
+
+    events = Event.objects.with_stats().select_related('ngo').order_by('-created_at')
+
+    if status_filter:
+        events = events.filter(status=status_filter)
+
+    # Search ranks by relevance instead of recency
+    if search_query:
+        events = get_search_backend().search(events, search_query)
+
+    return events
+
+
+@login_required
+@user_passes_test(is_admin)
+def users_list(request):
+    """List all volunteers"""
+
+    search_query = request.GET.get('search', '')
+    volunteers = _filtered_volunteers(request)
 
     context = {
         'volunteers': volunteers,
@@ -186,9 +229,10 @@ def user_delete(request, user_id):
     """Delete a volunteer"""
     if request.method == 'POST':
         user = get_object_or_404(User, id=user_id, user_type='volunteer')
-        username = user.username
-        user.delete()
-        messages.success(request, f'User {username} has been deleted.')
+        # Lock the account now; the cascade runs on the task worker
+        User.objects.filter(pk=user.pk).update(is_active=False)
+        delete_user.delay(user.pk)
+        messages.success(request, f'User {user.username} has been scheduled for deletion.')
     return redirect('admin_users')
 
 
@@ -198,17 +242,7 @@ def ngos_list(request):
     """List all NGOs"""
 
     search_query = request.GET.get('search', '')
-
-    ngos = NGO.objects.all()
-
-    if search_query:
-        ngos = ngos.filter(
-            Q(organization_name__icontains=search_query) |
-            Q(email__icontains=search_query) |
-            Q(registration_number__icontains=search_query)
-        )
-
-    ngos = ngos.order_by('-created_at')
+    ngos = _filtered_ngos(request)
 
     approved_ngos = NGO.objects.filter(status='approved').count()
 
@@ -228,9 +262,9 @@ def ngo_delete(request, ngo_id):
     """Delete an NGO"""
     if request.method == 'POST':
         ngo = get_object_or_404(NGO, id=ngo_id)
-        org_name = ngo.organization_name
-        ngo.user.delete()  # This will cascade delete the NGO
-        messages.success(request, f'{org_name} has been deleted.')
+        User.objects.filter(pk=ngo.user_id).update(is_active=False)
+        delete_user.delay(ngo.user_id)  # Deleting the user cascades to the NGO and its events
+        messages.success(request, f'{ngo.organization_name} has been scheduled for deletion.')
     return redirect('admin_ngos')
 
 
@@ -241,19 +275,7 @@ def events_list(request):
 
     search_query = request.GET.get('search', '')
     status_filter = request.GET.get('status', '')
-
-    events = Event.objects.all()
-
-    if search_query:
-        events = events.filter(
-            Q(title__icontains=search_query) |
-            Q(ngo__organization_name__icontains=search_query)
-        )
-
-    if status_filter:
-        events = events.filter(status=status_filter)
-
-    events = events.order_by('-created_at')
+    events = _filtered_events(request).select_related('certificate')
 
     context = {
         'events': events,
@@ -265,22 +287,75 @@ def events_list(request):
     return render(request, 'admin_panel/events.html', context)
 
 
+@login_required
+@user_passes_test(is_admin)
+def users_export(request):
+    """Stream the (filtered) volunteers list as CSV or ?format=xlsx"""
+    volunteers = _filtered_volunteers(request).select_related('volunteer_profile')
+
+    def rows():
+        for volunteer in volunteers.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            profile = getattr(volunteer, 'volunteer_profile', None)
+            yield [
+                volunteer.pk, volunteer.username, volunteer.get_full_name(), volunteer.email,
+                profile.phone if profile else '', profile.city if profile else '',
+                profile.country if profile else '', profile.skills if profile else '',
+                profile.events_completed if profile else 0, volunteer.is_active, volunteer.date_joined,
+            ]
+
+    header = ['ID', 'Username', 'Name', 'Email', 'Phone', 'City', 'Country', 'Skills', 'Events completed',
+              'Active', 'Joined']
+    return export_response(request.GET.get('format'), 'volunteers', header, rows())
+
+
+@login_required
+@user_passes_test(is_admin)
+def ngos_export(request):
+    """Stream the (filtered) NGOs list as CSV or ?format=xlsx"""
+    ngos = _filtered_ngos(request).select_related('user')
+
+    def rows():
+        for ngo in ngos.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield [
+                ngo.pk, ngo.organization_name, ngo.registration_number, ngo.user.username, ngo.email, ngo.phone,
+                ngo.city, ngo.country, ngo.website, ngo.get_status_display(), ngo.created_at, ngo.approved_at,
+            ]
+
+    header = ['ID', 'Organization', 'Registration number', 'Account', 'Email', 'Phone', 'City', 'Country',
+              'Website', 'Status', 'Created', 'Approved']
+    return export_response(request.GET.get('format'), 'ngos', header, rows())
+
+
+@login_required
+@user_passes_test(is_admin)
+def events_export(request):
+    """Stream the (filtered) events list as CSV or ?format=xlsx"""
+    events = _filtered_events(request)
+
+    def rows():
+        for event in events.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield [
+                event.pk, event.title, event.ngo.organization_name, event.date, event.location,
+                event.get_status_display(), event.max_volunteers, event.approved_count, event.pending_count,
+                event.get_available_spots(), event.created_at,
+            ]
+
+    header = ['ID', 'Title', 'NGO', 'Date', 'Location', 'Status', 'Max volunteers', 'Approved', 'Pending',
+              'Available spots', 'Created']
+    return export_response(request.GET.get('format'), 'events', header, rows())
+
+
 @login_required
 @user_passes_test(is_admin)
 def event_detail(request, event_id):
     """View event details"""
-    event = get_object_or_404(Event, id=event_id)
+    event = get_object_or_404(Event.objects.with_stats(), id=event_id)
     registrations = event.registrations.all()
 
-    # Split comma-separated skills
-    skills_list = []
-    if event.required_skills:
-        skills_list = [skill.strip() for skill in event.required_skills.split(',') if skill.strip()]
-
     context = {
         'event': event,
         'registrations': registrations,
-        'skills_list': skills_list,  # Add this
+        'skills_list': event.skill_tags.all(),
     }
     return render(request, 'admin_panel/admin_event_detail.html', context)
 
@@ -323,6 +398,7 @@ def platform_settings(request):
         settings.min_volunteers_per_event = int(request.POST.get('min_volunteers_per_event', 1))
         settings.max_volunteers_per_event = int(request.POST.get('max_volunteers_per_event', 100))
         settings.event_cancellation_hours = int(request.POST.get('event_cancellation_hours', 24))
+        settings.event_reminder_hours = int(request.POST.get('event_reminder_hours', 24))
         settings.auto_complete_events = 'auto_complete_events' in request.POST
 
         # Registration Settings
@@ -352,6 +428,7 @@ def platform_settings(request):
 
     context = {
         'settings': settings,
+        'card_cache': card_cache_stats(),
     }
 
     return render(request, 'admin_panel/settings.html', context)
@@ -446,12 +523,9 @@ def certificate_approvals(request):
     else:
         certificates = certificates.filter(status=status_filter)
 
-    # Apply search filter
+    # Apply search filter (the selected sort order still applies)
     if search_query:
-        certificates = certificates.filter(
-            Q(event__title__icontains=search_query) |
-            Q(event__ngo__organization_name__icontains=search_query)
-        )
+        certificates = get_search_backend().search(certificates, search_query, event_field='event', rank=False)
 
     # Apply sorting
     if sort_by == 'oldest':
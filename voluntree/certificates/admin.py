@@ -1,7 +1,7 @@
 #certificates/admin.py
 
 from django.contrib import admin
-from .models import Certificate, CertificateAssignment
+from .models import Certificate, CertificateAssignment, CertificateRun
 
 
 @admin.register(Certificate)
@@ -13,6 +13,14 @@ class CertificateAdmin(admin.ModelAdmin):
 
 @admin.register(CertificateAssignment)
 class CertificateAssignmentAdmin(admin.ModelAdmin):
-    list_display = ['volunteer', 'certificate', 'assigned_at']
+    list_display = ['volunteer', 'certificate', 'verification_code', 'file', 'assigned_at']
     list_filter = ['assigned_at']
-    search_fields = ['volunteer__username', 'certificate__event__title']
\ No newline at end of file
+    search_fields = ['verification_code', 'volunteer__username', 'certificate__event__title']
+    readonly_fields = ['verification_code']
+
+
+@admin.register(CertificateRun)
+class CertificateRunAdmin(admin.ModelAdmin):
+    list_display = ['certificate', 'status', 'completed', 'total', 'created_at', 'finished_at']
+    list_filter = ['status', 'created_at']
+    readonly_fields = ['created_at', 'finished_at']
@@ -5,4 +5,7 @@ from django.apps import AppConfig
 
 class CertificatesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'certificates'
\ No newline at end of file
+    name = 'certificates'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -2,6 +2,28 @@
 
 from django import forms
 from .models import Certificate
+from .rendering import is_image_template
+
+TEMPLATE_EXTENSIONS = ['.jpg', '.jpeg', '.png']
+TEMPLATE_ACCEPT = ','.join(TEMPLATE_EXTENSIONS)
+TEMPLATE_HELP_TEXT = ("A PNG or JPEG image of the certificate, up to 10MB. Each volunteer's name, the event "
+                      "and its date are printed across the middle of their copy, so leave that area blank.")
+
+
+def clean_template_file(file):
+    """Validate a certificate template upload: size, extension and that it really is a PNG or JPEG"""
+    if file:
+        # Check file size (max 10MB)
+        if file.size > 10 * 1024 * 1024:
+            raise forms.ValidationError('File size must be less than 10MB.')
+
+        # Names are printed on the image, so the extension alone isn't enough
+        file_ext = file.name.lower().split('.')[-1]
+        if f'.{file_ext}' not in TEMPLATE_EXTENSIONS or not is_image_template(file):
+            raise forms.ValidationError('Only PNG or JPEG images are allowed.')
+        file.seek(0)
+
+    return file
 
 
 class CertificateUploadForm(forms.ModelForm):
@@ -13,31 +35,16 @@ class CertificateUploadForm(forms.ModelForm):
         widgets = {
             'certificate_file': forms.FileInput(attrs={
                 'class': 'form-control',
-                'accept': '.pdf,.doc,.docx,.jpg,.jpeg,.png'
+                'accept': TEMPLATE_ACCEPT
             })
         }
         labels = {
             'certificate_file': 'Certificate Template'
         }
         help_texts = {
-            'certificate_file': 'Please upload a PDF file for best results. Other formats (Word, Image) are accepted but may not be approved by admin.'
+            'certificate_file': TEMPLATE_HELP_TEXT
         }
 
     def clean_certificate_file(self):
         """Validate file upload"""
-        file = self.cleaned_data.get('certificate_file')
-
-        if file:
-            # Check file size (max 10MB)
-            if file.size > 10 * 1024 * 1024:
-                raise forms.ValidationError('File size must be less than 10MB.')
-
-            # Optional: Check file extension
-            allowed_extensions = ['.pdf', '.doc', '.docx', '.jpg', '.jpeg', '.png']
-            file_ext = file.name.lower().split('.')[-1]
-            if f'.{file_ext}' not in allowed_extensions:
-                raise forms.ValidationError(
-                    'Only PDF, Word documents, and images are allowed.'
-                )
-
-        return file
\ No newline at end of file
+        return clean_template_file(self.cleaned_data.get('certificate_file'))
@@ -0,0 +1,135 @@
+# certificates/generation.py
+
+"""
+Personalized certificate PDFs for an event's volunteers.
+
+start_generation() records a CertificateRun and queues a
+generate_certificates task (certificates/tasks.py). The task renders
+every assignment that has no file yet (certificates/rendering.py), in
+a process pool of CERTIFICATE_WORKERS once there are POOL_THRESHOLD or
+more. Each finished chunk is saved to storage and counted on the run,
+which the NGO's page polls for progress.
+
+A PDF is written once under a fixed name and then served from storage.
+Assigning more volunteers later only renders the new ones, and a
+retried run carries on where it stopped. Only force=True, e.g. after
+the hours change, renders everything again. Templates uploaded as PDF or
+Word files, before the forms required an image, are never personalized:
+their volunteers get the approved file as uploaded.
+"""
+
+import os
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import F
+from django.utils import dateformat, timezone
+from .models import CertificateAssignment, CertificateRun
+from .rendering import CHUNK_SIZE, is_image_template, render_many
+from .verification import format_code
+
+CERTIFICATE_WORKERS = getattr(settings, 'CERTIFICATE_WORKERS', min(4, os.cpu_count() or 1))
+# Below this many certificates, starting a process pool costs more than it saves
+POOL_THRESHOLD = 50
+
+
+def issued_name(certificate_id, volunteer_id):
+    return f'certificates/issued/{certificate_id}/{volunteer_id}.pdf'
+
+
+def certificate_fields(assignment, event, hours):
+    """What is stamped on one volunteer's certificate"""
+    return {
+        'name': assignment.volunteer.get_full_name() or assignment.volunteer.username,
+        'event': event.title,
+        'date': dateformat.format(timezone.localtime(event.date), 'F j, Y'),
+        'hours': hours,
+        'code': format_code(assignment.verification_code),
+    }
+
+
+def can_personalize(certificate):
+    """Whether the certificate's template is an image that names can be printed on"""
+    try:
+        with certificate.certificate_file.open('rb') as template:
+            return is_image_template(template)
+    except OSError:
+        return False
+
+
+def start_generation(certificate, force=False):
+    """
+    Queue rendering of the certificate's missing PDFs (all of them with
+    force). Returns the run, the one already in progress if there is one,
+    or None when there is nothing to render or the template can't be
+    personalized.
+    """
+    if not can_personalize(certificate):
+        return None
+    with transaction.atomic():
+        active = certificate.runs.filter(status__in=['queued', 'running']).first()
+        if active:
+            return active
+        if force:
+            # Files are overwritten in place, so the old ones are served until replaced
+            certificate.assignments.exclude(file='').update(file='')
+        pending = certificate.assignments.filter(file='').count()
+        if not pending:
+            return None
+        run = CertificateRun.objects.create(certificate=certificate, total=pending)
+
+    from .tasks import generate_certificates
+    generate_certificates.delay(run.pk)
+    return run
+
+
+def _save(storage, name, data):
+    # storage.save() would pick a new name instead of overwriting
+    if storage.exists(name):
+        storage.delete(name)
+    return storage.save(name, ContentFile(data))
+
+
+def run_generation(run_id, workers=None):
+    """Render and store the PDFs for a run, recording progress as chunks finish"""
+    run = CertificateRun.objects.select_related('certificate__event').get(pk=run_id)
+    if run.status == 'done':
+        return run
+    certificate = run.certificate
+    event = certificate.event
+
+    pending = {
+        assignment.pk: assignment
+        for assignment in certificate.assignments.filter(file='').select_related('volunteer')
+        .only('certificate_id', 'volunteer_id', 'file', 'verification_code',
+              'volunteer__username', 'volunteer__first_name', 'volunteer__last_name')
+        .order_by('pk')
+    }
+    CertificateRun.objects.filter(pk=run.pk).update(
+        status='running', error='', total=F('completed') + len(pending))
+
+    workers = workers or CERTIFICATE_WORKERS
+    if len(pending) < POOL_THRESHOLD:
+        workers = 1
+    storage = CertificateAssignment._meta.get_field('file').storage
+
+    try:
+        with certificate.certificate_file.open('rb') as template:
+            template_data = template.read()
+        items = [(pk, certificate_fields(assignment, event, certificate.hours)) for pk, assignment in pending.items()]
+        for chunk in render_many(template_data, items, workers=workers, chunk_size=CHUNK_SIZE,
+                                 font_path=getattr(settings, 'CERTIFICATE_FONT', None)):
+            done = []
+            for pk, data in chunk:
+                assignment = pending[pk]
+                assignment.file.name = _save(storage, issued_name(certificate.pk, assignment.volunteer_id), data)
+                done.append(assignment)
+            CertificateAssignment.objects.bulk_update(done, ['file'])
+            CertificateRun.objects.filter(pk=run.pk).update(completed=F('completed') + len(done))
+    except Exception as exc:
+        CertificateRun.objects.filter(pk=run.pk).update(status='failed', error=str(exc)[:500])
+        raise
+
+    CertificateRun.objects.filter(pk=run.pk).update(status='done', finished_at=timezone.now())
+    run.refresh_from_db()
+    return run
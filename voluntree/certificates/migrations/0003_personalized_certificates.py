@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0002_certificate_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificate',
+            name='hours',
+            field=models.PositiveIntegerField(blank=True, help_text='Volunteer hours printed on personalized certificates', null=True),
+        ),
+        migrations.AddField(
+            model_name='certificateassignment',
+            name='file',
+            field=models.FileField(blank=True, upload_to='certificates/issued/'),
+        ),
+        migrations.CreateModel(
+            name='CertificateRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('completed', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('certificate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='runs', to='certificates.certificate')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
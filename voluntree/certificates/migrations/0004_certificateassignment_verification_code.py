@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:02
+
+import certificates.verification
+from django.db import migrations, models
+
+
+def assign_codes(apps, schema_editor):
+    """Give each existing assignment its own code; a field default would give them all the same one"""
+    CertificateAssignment = apps.get_model('certificates', 'CertificateAssignment')
+    batch = []
+    for assignment in CertificateAssignment.objects.only('pk').iterator(chunk_size=1000):
+        assignment.verification_code = certificates.verification.new_code()
+        batch.append(assignment)
+        if len(batch) == 500:
+            CertificateAssignment.objects.bulk_update(batch, ['verification_code'])
+            batch = []
+    CertificateAssignment.objects.bulk_update(batch, ['verification_code'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0003_personalized_certificates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificateassignment',
+            name='verification_code',
+            field=models.CharField(editable=False, max_length=12, null=True),
+        ),
+        migrations.RunPython(assign_codes, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='certificateassignment',
+            name='verification_code',
+            field=models.CharField(default=certificates.verification.new_code, editable=False, max_length=12, unique=True),
+        ),
+    ]
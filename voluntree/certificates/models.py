@@ -1,9 +1,21 @@
 # certificates/models.py
 
-from django.db import models
+import json
+from django.db import IntegrityError, connections, models, router, transaction
 from django.utils import timezone
 from accounts.models import User
-from events.models import Event
+from events.models import Event, EventRegistration
+from .verification import format_code, new_code, qr_path, verification_path
+
+# Rounds of new codes for rows whose 60-bit code collided, which is already rare
+ASSIGN_ATTEMPTS = 3
+
+# Backends that can insert every assignment in one INSERT ... SELECT over a JSON
+# array of [volunteer_id, code] pairs: (volunteer id, code, row source) SQL
+JSON_ROWS_SQL = {
+    'sqlite': ("json_extract(value, '$[0]')", "json_extract(value, '$[1]')", 'json_each(%s)'),
+    'postgresql': ('(value->>0)::bigint', 'value->>1', 'jsonb_array_elements(%s::jsonb)'),
+}
 
 
 class Certificate(models.Model):
@@ -28,13 +40,85 @@ class Certificate(models.Model):
         choices=STATUS_CHOICES,
         default='pending'
     )
+    hours = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text='Volunteer hours printed on personalized certificates'
+    )
     uploaded_at = models.DateTimeField(auto_now_add=True)
     approved_at = models.DateTimeField(null=True, blank=True)
     rejected_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"Certificate for {self.event.title}"
 
+    def assign(self, volunteer_ids=None):
+        """
+        Assign this certificate to the given volunteers, or to every approved
+        volunteer of the event when volunteer_ids is None. Ids of volunteers
+        not approved for the event are ignored.
+
+        Works on id sets: one query for the approved volunteers, one for the
+        existing assignments, then one INSERT ... SELECT of every new row with
+        its verification code (new_code(), drawn in Python) passed as a single
+        JSON parameter, so the query count doesn't grow with the event. A code
+        collision fails the whole insert, which is retried with new codes.
+        Backends without JSON_ROWS_SQL fall back to bulk_create.
+        Returns (newly assigned, already assigned) counts.
+        """
+        registrations = EventRegistration.objects.filter(event_id=self.event_id, status='approved')
+        if volunteer_ids is not None:
+            registrations = registrations.filter(volunteer_id__in=list(volunteer_ids))
+        connection = connections[router.db_for_write(CertificateAssignment)]
+
+        with transaction.atomic(using=connection.alias):
+            selected = set(registrations.values_list('volunteer_id', flat=True))
+            already_assigned = selected & set(self.assignments.values_list('volunteer_id', flat=True))
+            new = selected - already_assigned
+            if new and connection.vendor in JSON_ROWS_SQL:
+                self._insert_assignments(connection, sorted(new))
+            elif new:
+                self._bulk_create_assignments(new)
+        return len(new), len(already_assigned)
+
+    def _insert_assignments(self, connection, volunteer_ids):
+        volunteer_sql, code_sql, rows_sql = JSON_ROWS_SQL[connection.vendor]
+        table = connection.ops.quote_name(CertificateAssignment._meta.db_table)
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        for attempt in range(ASSIGN_ATTEMPTS):
+            rows = json.dumps([[volunteer_id, new_code()] for volunteer_id in volunteer_ids])
+            try:
+                # Savepoint, so a failed attempt can be retried inside the caller's transaction
+                with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+                    # The conflict target only covers a concurrent request assigning the same
+                    # volunteer; a colliding verification code still raises IntegrityError
+                    cursor.execute(
+                        f'INSERT INTO {table} (certificate_id, volunteer_id, file, verification_code, assigned_at) '
+                        f'SELECT %s, {volunteer_sql}, %s, {code_sql}, %s FROM {rows_sql} WHERE true '
+                        f'ON CONFLICT (certificate_id, volunteer_id) DO NOTHING',
+                        [self.pk, '', now, rows],
+                    )
+                return
+            except IntegrityError:
+                if attempt == ASSIGN_ATTEMPTS - 1:
+                    raise
+
+    def _bulk_create_assignments(self, volunteer_ids):
+        missing = set(volunteer_ids)
+        for _ in range(ASSIGN_ATTEMPTS):
+            # ignore_conflicts: a concurrent request may have assigned some of them meanwhile;
+            # it also skips colliding codes, so the volunteers still missing are retried
+            CertificateAssignment.objects.bulk_create(
+                [CertificateAssignment(certificate=self, volunteer_id=volunteer_id, verification_code=new_code())
+                 for volunteer_id in sorted(missing)],
+                ignore_conflicts=True,
+            )
+            missing -= set(self.assignments.values_list('volunteer_id', flat=True))
+            if not missing:
+                return
+        raise IntegrityError(f'No unique verification code for {len(missing)} volunteer(s)')
+
     class Meta:
         ordering = ['-uploaded_at']
 
@@ -51,11 +135,77 @@ class CertificateAssignment(models.Model):
         on_delete=models.CASCADE,
         related_name='certificate_assignments'
     )
+    # Personalized PDF, rendered once by certificates/generation.py
+    file = models.FileField(upload_to='certificates/issued/', blank=True)
+    # Public proof the certificate was issued (see certificates/verification.py)
+    verification_code = models.CharField(max_length=12, unique=True, default=new_code, editable=False)
     assigned_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return f"{self.volunteer.username} - {self.certificate.event.title}"
 
+    @property
+    def download_url(self):
+        """The personalized PDF once rendered, the shared template until then"""
+        return self.file.url if self.file else self.certificate.certificate_file.url
+
+    @property
+    def formatted_code(self):
+        return format_code(self.verification_code)
+
+    @property
+    def verification_url(self):
+        return verification_path(self.verification_code)
+
+    @property
+    def qr_url(self):
+        return qr_path(self.verification_code)
+
     class Meta:
         unique_together = ('certificate', 'volunteer')
-        ordering = ['-assigned_at']
\ No newline at end of file
+        ordering = ['-assigned_at']
+
+
+class CertificateRun(models.Model):
+    """Progress of a batch of personalized certificates being rendered"""
+    STATUS_CHOICES = (
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    )
+
+    certificate = models.ForeignKey(
+        Certificate,
+        on_delete=models.CASCADE,
+        related_name='runs'
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    total = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.certificate} - {self.completed}/{self.total} ({self.get_status_display()})"
+
+    @property
+    def is_active(self):
+        return self.status in ('queued', 'running')
+
+    @property
+    def percent(self):
+        return 100 if not self.total else min(100, round(self.completed * 100 / self.total))
+
+    def as_dict(self):
+        return {
+            'status': self.status,
+            'total': self.total,
+            'completed': self.completed,
+            'percent': self.percent,
+            'error': self.error,
+        }
+
+    class Meta:
+        ordering = ['-created_at']
@@ -0,0 +1,154 @@
+# certificates/rendering.py
+
+"""
+Stamping a volunteer's details onto a certificate template.
+
+Pure Pillow and the standard library, no Django: the process pool used
+for large events starts its workers with 'spawn', and they only need to
+import this module. Templates are PNG or JPEG images (TEMPLATE_FORMATS),
+which the upload forms require. A PDF or Word template uploaded before
+that is never stamped; its volunteers get it as uploaded (see
+is_image_template). The result is saved as a one-page PDF.
+"""
+
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image, ImageDraw, ImageFont
+
+# A4 landscape at 150 dpi; larger image templates are scaled down to this width
+PAGE_SIZE = (1754, 1240)
+PAGE_WIDTH_INCHES = 11.69
+CHUNK_SIZE = 25
+# Image formats a template can be stamped in; the messages shown to NGOs name these
+TEMPLATE_FORMATS = ('PNG', 'JPEG')
+
+TEXT_COLOR = (31, 41, 55)
+ACCENT_COLOR = (102, 126, 234)
+
+# (field, height of the line's centre, font size), both as fractions of the page height
+LINES = [
+    ('name', 0.45, 0.085),
+    ('event', 0.58, 0.04),
+    ('details', 0.67, 0.032),
+    ('verification', 0.9, 0.02),
+]
+
+# The template and font of a pool worker, loaded once by _init_pool
+_worker = {}
+
+
+def sample_template():
+    """PNG bytes of a plain bordered page, for benchmarks and tests"""
+    page = Image.new('RGB', PAGE_SIZE, (255, 255, 255))
+    draw = ImageDraw.Draw(page)
+    width, height = PAGE_SIZE
+    draw.rectangle([30, 30, width - 31, height - 31], outline=ACCENT_COLOR, width=12)
+    draw.rectangle([60, 60, width - 61, height - 61], outline=ACCENT_COLOR, width=3)
+    title_font = ImageFont.load_default(size=int(height * 0.07))
+    draw.text((width / 2, height * 0.22), 'Certificate of Appreciation', fill=ACCENT_COLOR,
+              font=title_font, anchor='mm')
+    draw.text((width / 2, height * 0.34), 'This certificate is presented to', fill=TEXT_COLOR,
+              font=ImageFont.load_default(size=int(height * 0.03)), anchor='mm')
+    output = io.BytesIO()
+    page.save(output, format='PNG')
+    return output.getvalue()
+
+
+def is_image_template(source):
+    """Whether a template (a binary file object) is an image that can be stamped; reads only the header"""
+    try:
+        with Image.open(source) as image:
+            return image.format in TEMPLATE_FORMATS
+    except (OSError, Image.DecompressionBombError):
+        return False
+
+
+def load_template(data):
+    """The image to draw on; ValueError if the template isn't a PNG or JPEG"""
+    try:
+        image = Image.open(io.BytesIO(data))
+        image.load()
+    except (OSError, Image.DecompressionBombError) as exc:
+        raise ValueError('Only PNG or JPEG templates can be personalized') from exc
+    if image.format not in TEMPLATE_FORMATS:
+        raise ValueError('Only PNG or JPEG templates can be personalized')
+    if image.width > PAGE_SIZE[0]:
+        image = image.resize((PAGE_SIZE[0], round(image.height * PAGE_SIZE[0] / image.width)),
+                             Image.Resampling.LANCZOS)
+    return image.convert('RGB')
+
+
+def _font(font_path, size):
+    return ImageFont.truetype(font_path, size) if font_path else ImageFont.load_default(size=size)
+
+
+def _fit(draw, text, font_path, size, max_width):
+    """The largest font up to `size` that fits `text` in `max_width`"""
+    font = _font(font_path, size)
+    while size > 12 and draw.textlength(text, font=font) > max_width:
+        size = int(size * 0.9)
+        font = _font(font_path, size)
+    return font
+
+
+def fields_text(fields):
+    """The text of each line for a volunteer: name, event, 'date · hours' and the verification code"""
+    details = fields['date']
+    if fields.get('hours'):
+        details += f" · {fields['hours']} volunteer hour{'s' if fields['hours'] != 1 else ''}"
+    return {
+        'name': fields['name'],
+        'event': f"for volunteering at {fields['event']}",
+        'details': details,
+        'verification': f"Verification code {fields['code']}" if fields.get('code') else '',
+    }
+
+
+def render_certificate(template, fields, font_path=None):
+    """One volunteer's certificate as PDF bytes"""
+    page = template.copy()
+    draw = ImageDraw.Draw(page)
+    text = fields_text(fields)
+    for field, top, size in LINES:
+        if not text[field]:
+            continue
+        font = _fit(draw, text[field], font_path, int(page.height * size), page.width * 0.8)
+        draw.text((page.width / 2, page.height * top), text[field], fill=TEXT_COLOR, font=font, anchor='mm')
+
+    output = io.BytesIO()
+    page.save(output, format='PDF', resolution=page.width / PAGE_WIDTH_INCHES)
+    return output.getvalue()
+
+
+def _init_pool(template_data, font_path):
+    _worker['template'] = load_template(template_data)
+    _worker['font_path'] = font_path
+
+
+def _render_chunk(items):
+    return [(key, render_certificate(_worker['template'], fields, _worker['font_path'])) for key, fields in items]
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def render_many(template_data, items, workers=1, chunk_size=CHUNK_SIZE, font_path=None):
+    """
+    Render (key, fields) items, yielding lists of (key, PDF bytes) as each
+    chunk is done so the caller can store them and report progress. With
+    more than one worker the chunks are spread over a process pool.
+    """
+    items = list(items)
+    if workers <= 1:
+        template = load_template(template_data)
+        for chunk in _chunks(items, chunk_size):
+            yield [(key, render_certificate(template, fields, font_path)) for key, fields in chunk]
+        return
+
+    # 'spawn' so workers don't inherit the caller's database connections or threads
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=_init_pool, initargs=(template_data, font_path)) as executor:
+        yield from executor.map(_render_chunk, _chunks(items, chunk_size))
@@ -0,0 +1,19 @@
+# certificates/signals.py
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Certificate, CertificateAssignment
+from .verification import forget
+
+
+@receiver(post_delete, sender=CertificateAssignment)
+def forget_deleted_assignment(sender, instance, **kwargs):
+    """A deleted certificate stops verifying at once, not when its cached result expires"""
+    forget(instance.verification_code)
+
+
+@receiver(post_save, sender=Certificate)
+def forget_certificate_assignments(sender, instance, raw=False, **kwargs):
+    """Approval status and hours are shown on the verification page"""
+    if not raw:
+        forget(*instance.assignments.values_list('verification_code', flat=True))
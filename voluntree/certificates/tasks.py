@@ -0,0 +1,10 @@
+# certificates/tasks.py
+
+from core.taskqueue import task
+from .generation import run_generation
+
+
+@task(max_attempts=3)
+def generate_certificates(run_id):
+    """Render the personalized PDFs of a CertificateRun (see certificates/generation.py)"""
+    run_generation(run_id)
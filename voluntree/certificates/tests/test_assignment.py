@@ -0,0 +1,120 @@
+# certificates/tests/test_assignment.py
+
+import shutil
+import tempfile
+from unittest import mock
+from django.contrib.messages import get_messages
+from django.core.files.base import ContentFile
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from accounts.models import User, NGO
+from events.models import Event, EventRegistration
+from ..models import Certificate, CertificateAssignment
+from ..verification import CODE_ALPHABET, CODE_LENGTH
+
+
+class CertificateAssignmentTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root)
+        self.override.enable()
+
+        self.ngo_user = User.objects.create_user(username='certngo', password='password', user_type='ngo',
+                                                 email='certngo@test.com')
+        self.ngo = NGO.objects.create(user=self.ngo_user, organization_name='Cert NGO', registration_number='C-1')
+        self.event = Event.objects.create(ngo=self.ngo, title='Cert Event', description='...', location='Dhaka',
+                                          date=timezone.now(), max_volunteers=1000)
+        self.certificate = Certificate(event=self.event, status='approved')
+        self.certificate.certificate_file.save('template.pdf', ContentFile(b'%PDF-1.4'), save=False)
+        self.certificate.save()
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _volunteers(self, count, status='approved', prefix='certvol'):
+        volunteers = User.objects.bulk_create([
+            User(username=f'{prefix}{index}', email=f'{prefix}{index}@test.com', user_type='volunteer')
+            for index in range(count)
+        ])
+        EventRegistration.objects.bulk_create([
+            EventRegistration(event=self.event, volunteer=volunteer, status=status) for volunteer in volunteers
+        ])
+        return [volunteer.pk for volunteer in User.objects.filter(username__startswith=prefix).order_by('pk')]
+
+    def test_only_approved_selected_volunteers_are_assigned(self):
+        approved = self._volunteers(3)
+        pending = self._volunteers(1, status='pending', prefix='pendvol')
+        CertificateAssignment.objects.create(certificate=self.certificate, volunteer_id=approved[0])
+
+        self.assertEqual(self.certificate.assign([*approved, *pending]), (2, 1))
+        self.assertEqual(set(self.certificate.assignments.values_list('volunteer_id', flat=True)), set(approved))
+
+    def test_assign_all_takes_the_same_queries_at_any_size(self):
+        self._volunteers(10, prefix='small')
+        # savepoint, approved ids, existing assignments, insert savepoint, insert, release both
+        with self.assertNumQueries(7):
+            self.assertEqual(self.certificate.assign(), (10, 0))
+
+        # Far past SQLite's 999 parameters per statement
+        self._volunteers(5000, prefix='large')
+        with self.assertNumQueries(7):
+            self.assertEqual(self.certificate.assign(), (5000, 10))
+
+        codes = self.certificate.assignments.values_list('verification_code', flat=True)
+        self.assertEqual(len(set(codes)), 5010)
+        self.assertTrue(all(len(code) == CODE_LENGTH and set(code) <= set(CODE_ALPHABET) for code in codes))
+
+    def test_colliding_verification_code_is_retried(self):
+        approved = self._volunteers(3)
+        CertificateAssignment.objects.create(certificate=self.certificate, volunteer_id=approved[0],
+                                             verification_code='AAAAAAAAAAAA')
+
+        # The collision fails the whole insert, so both codes are drawn again
+        codes = ['AAAAAAAAAAAA', 'BBBBBBBBBBBB', 'CCCCCCCCCCCC', 'DDDDDDDDDDDD']
+        with mock.patch('certificates.models.new_code', side_effect=codes):
+            self.assertEqual(self.certificate.assign(), (2, 1))
+        self.assertEqual(dict(self.certificate.assignments.values_list('volunteer_id', 'verification_code')), {
+            approved[0]: 'AAAAAAAAAAAA', approved[1]: 'CCCCCCCCCCCC', approved[2]: 'DDDDDDDDDDDD',
+        })
+
+    def test_other_backends_fall_back_to_bulk_create(self):
+        approved = self._volunteers(3)
+        CertificateAssignment.objects.create(certificate=self.certificate, volunteer_id=approved[0],
+                                             verification_code='AAAAAAAAAAAA')
+
+        # bulk_create skips the colliding row, which gets a new code in the next round
+        codes = ['AAAAAAAAAAAA', 'BBBBBBBBBBBB', 'CCCCCCCCCCCC']
+        with mock.patch.dict('certificates.models.JSON_ROWS_SQL', clear=True), \
+                mock.patch('certificates.models.new_code', side_effect=codes):
+            self.assertEqual(self.certificate.assign(), (2, 1))
+        self.assertEqual(dict(self.certificate.assignments.values_list('volunteer_id', 'verification_code')), {
+            approved[0]: 'AAAAAAAAAAAA', approved[1]: 'CCCCCCCCCCCC', approved[2]: 'BBBBBBBBBBBB',
+        })
+
+    def test_unresolvable_code_collision_raises(self):
+        approved = self._volunteers(2)
+        CertificateAssignment.objects.create(certificate=self.certificate, volunteer_id=approved[0],
+                                             verification_code='AAAAAAAAAAAA')
+
+        with mock.patch('certificates.models.new_code', return_value='AAAAAAAAAAAA'):
+            with self.assertRaises(IntegrityError):
+                self.certificate.assign()
+        self.assertEqual(self.certificate.assignments.count(), 1)
+
+    def test_assign_all_action(self):
+        self._volunteers(4)
+        self.client.login(username='certngo', password='password')
+
+        url = reverse('assign_certificates', args=[self.event.pk])
+        response = self.client.post(url, {'action': 'assign_all'})
+        self.assertRedirects(response, url, fetch_redirect_response=False)
+        self.assertEqual(self.certificate.assignments.count(), 4)
+        self.assertIn('Certificate assigned to 4 volunteer(s).',
+                      [str(message) for message in get_messages(response.wsgi_request)])
+
+        response = self.client.get(url)
+        self.assertEqual(response.context['unassigned_count'], 0)
@@ -0,0 +1,107 @@
+# certificates/tests/test_downloads.py
+
+import io
+import os
+import shutil
+import tempfile
+import zipfile
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from accounts.models import User, NGO
+from events.models import Event, EventRegistration
+from ..models import Certificate, CertificateAssignment
+
+
+class CertificateDownloadTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root)
+        self.override.enable()
+
+        ngo_user = User.objects.create_user(username='zipngo', password='password', user_type='ngo',
+                                            email='zipngo@test.com')
+        self.ngo = NGO.objects.create(user=ngo_user, organization_name='Zip NGO', registration_number='Z-1')
+        self.volunteers = [
+            User.objects.create_user(username=f'zipvol{index}', password='password', user_type='volunteer',
+                                     email=f'zipvol{index}@test.com', first_name='Zip', last_name=f'Vol {index}')
+            for index in range(3)
+        ]
+        self.events = [self._event(f'Zip Event {index}') for index in range(2)]
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _event(self, title):
+        event = Event.objects.create(ngo=self.ngo, title=title, description='...', location='Dhaka',
+                                     date=timezone.now(), max_volunteers=10)
+        certificate = Certificate(event=event, status='approved')
+        certificate.certificate_file.save('template.pdf', ContentFile(f'%PDF template {title}'.encode()), save=False)
+        certificate.save()
+        for volunteer in self.volunteers:
+            EventRegistration.objects.create(event=event, volunteer=volunteer, status='approved')
+        certificate.assign()
+        return event
+
+    def _download(self, url, **headers):
+        response = self.client.get(url, headers=headers)
+        return response, b''.join(response.streaming_content)
+
+    def test_ngo_downloads_every_certificate_of_an_event(self):
+        personalized = CertificateAssignment.objects.get(certificate__event=self.events[0], volunteer=self.volunteers[0])
+        personalized.file.save('issued.pdf', ContentFile(b'%PDF personal'))
+
+        self.client.login(username='zipngo', password='password')
+        response, data = self._download(reverse('download_event_certificates', args=[self.events[0].pk]))
+
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        self.assertEqual(int(response['Content-Length']), len(data))
+        self.assertIn('certificates-zip-event-0-', response['Content-Disposition'])
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            self.assertEqual(archive.namelist(), [f'zip-vol-{index}-{volunteer.pk}.pdf'
+                                                  for index, volunteer in enumerate(self.volunteers)])
+            self.assertEqual(archive.read(archive.namelist()[0]), b'%PDF personal')
+            self.assertEqual(archive.read(archive.namelist()[1]), b'%PDF template Zip Event 0')
+
+    def test_volunteer_downloads_only_their_own(self):
+        self.client.login(username='zipvol1', password='password')
+        response, data = self._download(reverse('download_my_certificates'))
+
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            self.assertEqual(archive.namelist(), [f'zip-event-{index}-{event.pk}.pdf'
+                                                  for index, event in enumerate(self.events)])
+
+        response = self.client.get(reverse('download_event_certificates', args=[self.events[0].pk]))
+        self.assertEqual(response.status_code, 302)
+
+    def test_interrupted_downloads_resume_with_a_range(self):
+        self.client.login(username='zipvol0', password='password')
+        url = reverse('download_my_certificates')
+        response, whole = self._download(url)
+        etag = response['ETag']
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+        response, rest = self._download(url, range='bytes=100-', if_range=etag)
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 100-{len(whole) - 1}/{len(whole)}')
+        self.assertEqual(rest, whole[100:])
+
+        # The archive changed since: start over
+        response, data = self._download(url, range='bytes=100-', if_range='"stale"')
+        self.assertEqual((response.status_code, data), (200, whole))
+
+        response = self.client.get(url, headers={'range': f'bytes={len(whole)}-'})
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(self.client.get(url, headers={'if-none-match': etag}).status_code, 304)
+
+    def test_missing_files_are_left_out(self):
+        os.remove(self.events[1].certificate.certificate_file.path)
+
+        self.client.login(username='zipvol0', password='password')
+        with self.assertLogs('certificates.views', 'WARNING'):
+            response, data = self._download(reverse('download_my_certificates'))
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            self.assertEqual(archive.namelist(), [f'zip-event-0-{self.events[0].pk}.pdf'])
@@ -0,0 +1,167 @@
+# certificates/tests/test_generation.py
+
+import io
+import shutil
+import tempfile
+from unittest import mock
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+from accounts.models import User, NGO
+from core.models import Task
+from events.models import Event, EventRegistration
+from .. import generation
+from ..generation import issued_name, run_generation, start_generation
+from ..rendering import is_image_template, load_template
+from ..models import Certificate, CertificateRun
+
+
+def _png_template():
+    buffer = io.BytesIO()
+    Image.new('RGB', (800, 565), (250, 245, 230)).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class CertificateGenerationTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root)
+        self.override.enable()
+
+        self.ngo_user = User.objects.create_user(username='genngo', password='password', user_type='ngo',
+                                                 email='genngo@test.com')
+        self.ngo = NGO.objects.create(user=self.ngo_user, organization_name='Gen NGO', registration_number='G-1')
+        self.event = Event.objects.create(ngo=self.ngo, title='Gen Event', description='...', location='Dhaka',
+                                          date=timezone.now(), max_volunteers=1000)
+        self.certificate = Certificate(event=self.event, status='approved', hours=4)
+        self.certificate.certificate_file.save('template.png', ContentFile(_png_template()), save=False)
+        self.certificate.save()
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _volunteers(self, count, prefix='genvol'):
+        volunteers = User.objects.bulk_create([
+            User(username=f'{prefix}{index}', first_name='Gen', last_name=f'Volunteer {index}',
+                 email=f'{prefix}{index}@test.com', user_type='volunteer')
+            for index in range(count)
+        ])
+        EventRegistration.objects.bulk_create([
+            EventRegistration(event=self.event, volunteer=volunteer, status='approved') for volunteer in volunteers
+        ])
+
+    def _assign(self, count, prefix='genvol'):
+        self._volunteers(count, prefix)
+        self.certificate.assign()
+
+    @override_settings(TASK_QUEUE_EAGER=True)
+    def test_assigning_renders_each_volunteers_pdf(self):
+        self._volunteers(2)
+        self.client.login(username='genngo', password='password')
+        url = reverse('assign_certificates', args=[self.event.pk])
+        self.client.post(url, {'action': 'assign_all'})
+        self._volunteers(3, prefix='latevol')
+        self.client.post(url, {'action': 'assign_all'})
+
+        first, second = CertificateRun.objects.order_by('pk')
+        self.assertEqual((first.status, first.completed, first.total), ('done', 2, 2))
+        self.assertEqual((second.status, second.completed, second.total), ('done', 3, 3))
+        self.assertEqual(self.client.get(url).context['run'], second)
+        for assignment in self.certificate.assignments.all():
+            self.assertEqual(assignment.file.name, issued_name(self.certificate.pk, assignment.volunteer_id))
+            with assignment.file.open('rb') as pdf:
+                self.assertEqual(pdf.read(5), b'%PDF-')
+            self.assertEqual(assignment.download_url, assignment.file.url)
+
+    @override_settings(TASK_QUEUE_EAGER=True)
+    def test_files_are_rendered_once_and_reused(self):
+        self._assign(2)
+        start_generation(self.certificate)
+        first = {assignment.pk: default_storage.open(assignment.file.name).read()
+                 for assignment in self.certificate.assignments.all()}
+
+        self.assertIsNone(start_generation(self.certificate))
+        self._assign(1, prefix='newvol')
+        with mock.patch('certificates.generation.render_many', wraps=generation.render_many) as render:
+            run = start_generation(self.certificate)
+        self.assertEqual(run.total, 1)
+        self.assertEqual(len(render.call_args.args[1]), 1)
+        for pk, data in first.items():
+            assignment = self.certificate.assignments.get(pk=pk)
+            self.assertEqual(default_storage.open(assignment.file.name).read(), data)
+
+    def test_changing_the_hours_regenerates_every_certificate(self):
+        self._assign(2)
+        self.client.login(username='genngo', password='password')
+        url = reverse('generate_certificates', args=[self.event.pk])
+
+        self.client.post(url, {'hours': '4'})
+        run = CertificateRun.objects.get()
+        self.assertEqual(Task.objects.filter(name='certificates.tasks.generate_certificates').count(), 1)
+        run_generation(run.pk)
+
+        self.client.post(url, {'hours': '6'})
+        self.certificate.refresh_from_db()
+        self.assertEqual(self.certificate.hours, 6)
+        latest = self.certificate.runs.first()
+        self.assertNotEqual(latest, run)
+        self.assertEqual(latest.total, 2)
+        self.assertFalse(self.certificate.assignments.exclude(file='').exists())
+
+    def test_progress_is_polled_by_the_owning_ngo_only(self):
+        self._assign(3)
+        run = start_generation(self.certificate)
+        url = reverse('certificate_run_status', args=[self.event.pk])
+
+        self.client.login(username='genngo', password='password')
+        self.assertEqual(self.client.get(url).json()['run'],
+                         {'status': 'queued', 'total': 3, 'completed': 0, 'percent': 0, 'error': ''})
+        run_generation(run.pk)
+        self.assertEqual(self.client.get(url).json()['run']['percent'], 100)
+
+        User.objects.create_user(username='otherngo', password='password', user_type='ngo',
+                                 email='otherngo@test.com')
+        self.client.login(username='otherngo', password='password')
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_large_runs_use_the_process_pool(self):
+        self._assign(4)
+        run = start_generation(self.certificate)
+        with mock.patch.object(generation, 'POOL_THRESHOLD', 2), \
+                mock.patch('certificates.generation.CHUNK_SIZE', 2):
+            run = run_generation(run.pk, workers=2)
+
+        self.assertEqual((run.status, run.completed), ('done', 4))
+        self.assertFalse(self.certificate.assignments.filter(file='').exists())
+
+    @override_settings(TASK_QUEUE_EAGER=True)
+    def test_pdf_templates_are_served_as_approved(self):
+        self.certificate.certificate_file.save('template.pdf', ContentFile(b'%PDF-1.4 approved design'))
+        self._volunteers(2)
+        self.client.login(username='genngo', password='password')
+        url = reverse('assign_certificates', args=[self.event.pk])
+        self.client.post(url, {'action': 'assign_all'})
+
+        self.assertFalse(CertificateRun.objects.exists())
+        for assignment in self.certificate.assignments.all():
+            self.assertEqual(assignment.download_url, self.certificate.certificate_file.url)
+        self.assertFalse(self.client.get(url).context['can_personalize'])
+
+        self.client.post(reverse('generate_certificates', args=[self.event.pk]), {'hours': '3'})
+        self.assertFalse(CertificateRun.objects.exists())
+        with self.assertRaises(ValueError):
+            load_template(b'%PDF-1.4 approved design')
+
+    def test_only_png_and_jpeg_templates_are_personalized(self):
+        for image_format, personalized in [('PNG', True), ('JPEG', True), ('GIF', False), ('WEBP', False)]:
+            buffer = io.BytesIO()
+            Image.new('RGB', (80, 56), (250, 245, 230)).save(buffer, image_format)
+            self.assertEqual(is_image_template(io.BytesIO(buffer.getvalue())), personalized)
+            if not personalized:
+                with self.assertRaisesMessage(ValueError, 'Only PNG or JPEG templates can be personalized'):
+                    load_template(buffer.getvalue())
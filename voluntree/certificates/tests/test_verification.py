@@ -0,0 +1,123 @@
+# certificates/tests/test_verification.py
+
+import io
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+from accounts.models import User, NGO
+from events.models import Event, EventRegistration
+from ..generation import certificate_fields
+from ..models import Certificate, CertificateAssignment
+from ..rendering import fields_text
+from ..verification import CODE_ALPHABET, CODE_LENGTH, sign_code
+
+
+class CertificateVerificationTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        ngo_user = User.objects.create_user(username='verifyngo', password='password', user_type='ngo',
+                                            email='verifyngo@test.com')
+        ngo = NGO.objects.create(user=ngo_user, organization_name='Verify NGO', registration_number='V-1')
+        self.event = Event.objects.create(ngo=ngo, title='Beach Cleanup', description='...', location='Cox',
+                                          date=timezone.now(), max_volunteers=10)
+        self.certificate = Certificate.objects.create(event=self.event, certificate_file='certificates/templates/t.pdf',
+                                                      status='approved', hours=5)
+        for index in range(3):
+            volunteer = User.objects.create_user(username=f'verifyvol{index}', password='password',
+                                                 user_type='volunteer', email=f'verifyvol{index}@test.com',
+                                                 first_name='Rahim', last_name=f'Uddin {index}')
+            EventRegistration.objects.create(event=self.event, volunteer=volunteer, status='approved')
+        self.certificate.assign()
+        self.assignment = CertificateAssignment.objects.get(volunteer__username='verifyvol0')
+
+    def test_each_assignment_gets_its_own_code(self):
+        codes = list(CertificateAssignment.objects.values_list('verification_code', flat=True))
+        self.assertEqual(len(set(codes)), 3)
+        for code in codes:
+            self.assertEqual(len(code), CODE_LENGTH)
+            self.assertTrue(set(code) <= set(CODE_ALPHABET))
+
+        fields = certificate_fields(self.assignment, self.event, 5)
+        self.assertEqual(fields_text(fields)['verification'], f'Verification code {self.assignment.formatted_code}')
+
+    def test_signed_link_confirms_the_certificate_with_one_lookup(self):
+        url = self.assignment.verification_url
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertContains(response, 'Genuine certificate')
+        self.assertContains(response, 'Rahim Uddin 0')
+        self.assertContains(response, 'Beach Cleanup')
+        self.assertContains(response, 'Verify NGO')
+
+        # Shared and cacheable: nothing depends on who asks
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn('max-age=300', response['Cache-Control'])
+        self.assertNotIn('Cookie', response.get('Vary', ''))
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(url, headers={'if-none-match': response['ETag']})
+        self.assertEqual(cached.status_code, 304)
+
+    def test_forged_and_unknown_links_are_rejected(self):
+        code = self.assignment.verification_code
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('verify_certificate', args=[code, 'forged']))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.client.get(reverse('certificate_qr', args=[code, 'forged'])).status_code, 404)
+
+        unknown = '0' * CODE_LENGTH
+        response = self.client.get(reverse('verify_certificate', args=[unknown, sign_code(unknown)]))
+        self.assertContains(response, 'No matching certificate', status_code=404)
+
+    def test_deleted_and_withdrawn_certificates_stop_verifying(self):
+        url = self.assignment.verification_url
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        self.certificate.status = 'rejected'
+        self.certificate.save()
+        self.assertContains(self.client.get(url), 'Certificate withdrawn')
+
+        self.assignment.delete()
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_typed_codes_lead_to_the_signed_page(self):
+        code = self.assignment.verification_code
+        typed = self.assignment.formatted_code.lower().replace('0', 'o').replace('1', 'l')
+        response = self.client.get(reverse('verify_certificate_lookup'), {'code': f' {typed} '})
+        self.assertRedirects(response, reverse('verify_certificate', args=[code, sign_code(code)]))
+
+        response = self.client.get(reverse('verify_certificate_lookup'), {'code': 'not-a-code'})
+        self.assertContains(response, "That isn't a valid code")
+
+    def test_typed_unknown_codes_get_no_signed_link(self):
+        unknown = 'ZZZZ-ZZZZ-ZZZZ'
+        response = self.client.get(reverse('verify_certificate_lookup'), {'code': unknown})
+        self.assertContains(response, "This code doesn't match any certificate", status_code=404)
+        self.assertNotContains(response, sign_code('ZZZZZZZZZZZZ'), status_code=404)
+
+    def test_typed_lookups_are_rate_limited_per_client(self):
+        url = reverse('verify_certificate_lookup')
+        with mock.patch('certificates.verification.LOOKUP_RATE', 2):
+            for _ in range(2):
+                self.assertEqual(self.client.get(url, {'code': 'ZZZZ-ZZZZ-ZZZZ'}).status_code, 404)
+            response = self.client.get(url, {'code': self.assignment.formatted_code})
+            self.assertContains(response, 'Too many lookups', status_code=429)
+            self.assertIn('no-store', response['Cache-Control'])
+
+            # Other clients, and signed links, are unaffected
+            response = self.client.get(url, {'code': self.assignment.formatted_code}, REMOTE_ADDR='10.0.0.2')
+            self.assertEqual(response.status_code, 302)
+            self.assertEqual(self.client.get(self.assignment.verification_url).status_code, 200)
+
+    def test_qr_code_of_the_link(self):
+        response = self.client.get(self.assignment.qr_url)
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertIn('max-age=86400', response['Cache-Control'])
+        self.assertEqual(Image.open(io.BytesIO(response.content)).format, 'PNG')
+
+        self.client.login(username='verifyvol0', password='password')
+        self.assertContains(self.client.get(reverse('my_certificates')), self.assignment.qr_url)
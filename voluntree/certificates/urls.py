@@ -6,7 +6,20 @@ from . import views
 urlpatterns = [
     # Volunteer views their certificates
     path('my-certificates/', views.my_certificates, name='my_certificates'),
+    path('my-certificates/download/', views.download_my_certificates, name='download_my_certificates'),
 
     # NGO assigns certificates to volunteers
     path('event/<int:event_id>/assign/', views.assign_certificates, name='assign_certificates'),
+
+    # NGO generates personalized PDFs and polls their progress
+    path('event/<int:event_id>/generate/', views.generate_certificates, name='generate_certificates'),
+    path('event/<int:event_id>/generate/status/', views.certificate_run_status, name='certificate_run_status'),
+
+    # NGO downloads every certificate of an event as a ZIP
+    path('event/<int:event_id>/download/', views.download_event_certificates, name='download_event_certificates'),
+
+    # Anyone verifies a certificate by its code or signed link
+    path('verify/', views.verify_certificate_lookup, name='verify_certificate_lookup'),
+    path('verify/<str:code>/<str:signature>/', views.verify_certificate, name='verify_certificate'),
+    path('verify/<str:code>/<str:signature>/qr.png', views.certificate_qr, name='certificate_qr'),
 ]
\ No newline at end of file
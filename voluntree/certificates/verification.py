@@ -0,0 +1,124 @@
+# certificates/verification.py
+
+"""
+Public verification of issued certificates.
+
+Every CertificateAssignment gets a random 12-character code (60 bits,
+Crockford base32: no I, L, O or U, so it is easy to read aloud and
+type). The code is unique and indexed, so resolving one is a single
+lookup. It is printed on the personalized PDF and can be typed in at
+/certificates/verify/.
+
+Shared links add an HMAC of the code, signed with SECRET_KEY. A link
+whose signature doesn't match is rejected before any database or cache
+access, so a forged or mangled link costs nothing. Typed codes carry no
+signature: the lookup page resolves them itself, at most LOOKUP_RATE
+per client address a minute (allow_lookup), and redirects to the signed
+link only for a code that exists, so no signature is ever made for a
+guess. Verification links get shared widely and are hit in bursts. Results, including "not found",
+are cached for VERIFICATION_TIMEOUT, and responses are public with the
+same max-age, so repeat hits are answered by the cache or a proxy.
+Deleting an assignment or saving its certificate forgets the cached
+results at once. Other edits (an event title, say) show within the
+timeout.
+"""
+
+import secrets
+from django.core.cache import cache
+from django.core.signing import Signer
+from django.urls import reverse
+from django.utils.crypto import constant_time_compare
+
+CODE_ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+CODE_LENGTH = 12
+# Letters people mistype for digits when copying a code by hand
+CODE_CONFUSABLES = str.maketrans({'O': '0', 'I': '1', 'L': '1'})
+
+SIGNING_SALT = 'certificates.verification'
+VERIFICATION_TIMEOUT = 60 * 5
+# A QR code only encodes the link, which never changes
+QR_MAX_AGE = 60 * 60 * 24
+# Typed codes one client address may look up per LOOKUP_WINDOW seconds
+LOOKUP_RATE = 30
+LOOKUP_WINDOW = 60
+
+
+def new_code():
+    return ''.join(secrets.choice(CODE_ALPHABET) for _ in range(CODE_LENGTH))
+
+
+def normalize_code(text):
+    """The code in `text` as stored ('abcd-efgh-jkmn' -> 'ABCDEFGHJKMN'), or '' if it can't be one"""
+    code = ''.join(str(text).upper().split()).replace('-', '').translate(CODE_CONFUSABLES)
+    if len(code) != CODE_LENGTH or any(char not in CODE_ALPHABET for char in code):
+        return ''
+    return code
+
+
+def format_code(code):
+    """Grouped for reading: ABCD-EFGH-JKMN"""
+    return '-'.join(code[index:index + 4] for index in range(0, len(code), 4))
+
+
+def sign_code(code):
+    return Signer(salt=SIGNING_SALT).signature(code)
+
+
+def signature_matches(code, signature):
+    return constant_time_compare(signature, sign_code(code))
+
+
+def verification_path(code):
+    """Signed path of the public verification page of a code"""
+    return reverse('verify_certificate', args=[code, sign_code(code)])
+
+
+def qr_path(code):
+    return reverse('certificate_qr', args=[code, sign_code(code)])
+
+
+def _cache_key(code):
+    return f'certificate-verification:{code}'
+
+
+def lookup(code):
+    """What the verification page shows for a code, or None if no certificate has it"""
+    from .models import CertificateAssignment
+
+    result = cache.get(_cache_key(code))
+    if result is None:
+        row = CertificateAssignment.objects.filter(verification_code=code).values(
+            'assigned_at', 'volunteer__username', 'volunteer__first_name', 'volunteer__last_name',
+            'certificate__status', 'certificate__hours', 'certificate__event__title', 'certificate__event__date',
+            'certificate__event__ngo__organization_name',
+        ).first()
+        # False, not None, so unknown codes are cached too
+        result = row and {
+            'code': format_code(code),
+            'name': f"{row['volunteer__first_name']} {row['volunteer__last_name']}".strip()
+            or row['volunteer__username'],
+            'event': row['certificate__event__title'],
+            'event_date': row['certificate__event__date'],
+            'organization': row['certificate__event__ngo__organization_name'],
+            'hours': row['certificate__hours'],
+            'issued_at': row['assigned_at'],
+            'valid': row['certificate__status'] == 'approved',
+        } or False
+        cache.set(_cache_key(code), result, VERIFICATION_TIMEOUT)
+    return result or None
+
+
+def allow_lookup(client):
+    """Count a typed-code lookup by `client` (its address); False once it made LOOKUP_RATE this window"""
+    key = f'certificate-verification-rate:{client}'
+    cache.add(key, 0, LOOKUP_WINDOW)
+    try:
+        return cache.incr(key) <= LOOKUP_RATE
+    except ValueError:
+        # The window ran out between add and incr
+        cache.set(key, 1, LOOKUP_WINDOW)
+        return True
+
+
+def forget(*codes):
+    cache.delete_many([_cache_key(code) for code in codes])
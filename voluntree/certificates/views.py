@@ -1,13 +1,32 @@
 # certificates/views.py
 
+import logging
+import os
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.db.models import Q
-from .models import Certificate, CertificateAssignment
+from django.http import Http404, HttpResponse, JsonResponse
+from django.middleware.http import ConditionalGetMiddleware
+from django.utils.cache import add_never_cache_headers, patch_cache_control
+from django.utils.decorators import decorator_from_middleware
+from django.utils.text import slugify
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import require_POST, require_safe
+from core.qr import qr_png
+from core.zipstream import storage_entry, zip_response
+from .generation import can_personalize, start_generation
+from .models import Certificate, CertificateAssignment, CertificateRun
+from .verification import (
+    QR_MAX_AGE, VERIFICATION_TIMEOUT, allow_lookup, lookup, normalize_code, signature_matches, verification_path,
+)
 from events.models import Event, EventRegistration
 from accounts.models import NGO
 
+logger = logging.getLogger(__name__)
+
+content_etag = decorator_from_middleware(ConditionalGetMiddleware)
+
 
 @login_required
 def assign_certificates(request, event_id):
@@ -40,54 +59,110 @@ def assign_certificates(request, event_id):
         status='approved'
     ).select_related('volunteer', 'volunteer__volunteer_profile')
 
-    # Get already assigned volunteers
-    assigned_volunteer_ids = CertificateAssignment.objects.filter(
-        certificate=event.certificate
-    ).values_list('volunteer_id', flat=True)
-
     # Handle certificate assignment
     if request.method == 'POST':
-        selected_volunteers = request.POST.getlist('volunteers')
-
-        if not selected_volunteers:
-            messages.warning(request, 'Please select at least one volunteer.')
+        if request.POST.get('action') == 'assign_all':
+            assigned_count, already_assigned_count = event.certificate.assign()
         else:
-            assigned_count = 0
-            already_assigned_count = 0
+            selected_volunteers = {int(value) for value in request.POST.getlist('volunteers') if value.isdigit()}
+            if not selected_volunteers:
+                messages.warning(request, 'Please select at least one volunteer.')
+                return redirect('assign_certificates', event_id=event_id)
+            assigned_count, already_assigned_count = event.certificate.assign(selected_volunteers)
 
-            for volunteer_id in selected_volunteers:
-                volunteer_id = int(volunteer_id)
+        if assigned_count > 0:
+            messages.success(request, f'Certificate assigned to {assigned_count} volunteer(s).')
+            # Render the new volunteers' personalized PDFs in the background
+            start_generation(event.certificate)
+        if already_assigned_count > 0:
+            messages.info(request, f'{already_assigned_count} volunteer(s) already had this certificate.')
+        if not assigned_count and not already_assigned_count:
+            messages.warning(request, 'None of the selected volunteers are approved for this event.')
 
-                # Check if already assigned
-                if volunteer_id in assigned_volunteer_ids:
-                    already_assigned_count += 1
-                    continue
+        return redirect('assign_certificates', event_id=event_id)
 
-                # Check if volunteer is approved for this event
-                registration = approved_registrations.filter(volunteer_id=volunteer_id).first()
-                if registration:
-                    CertificateAssignment.objects.create(
-                        certificate=event.certificate,
-                        volunteer_id=volunteer_id
-                    )
-                    assigned_count += 1
-
-            if assigned_count > 0:
-                messages.success(request, f'Certificate assigned to {assigned_count} volunteer(s).')
-            if already_assigned_count > 0:
-                messages.info(request, f'{already_assigned_count} volunteer(s) already had this certificate.')
-
-            return redirect('assign_certificates', event_id=event_id)
+    # Already assigned volunteers, as a set for the template's per-row lookups
+    assigned_volunteer_ids = set(
+        CertificateAssignment.objects.filter(certificate=event.certificate).values_list('volunteer_id', flat=True)
+    )
 
     context = {
         'event': event,
         'registrations': approved_registrations,
-        'assigned_volunteer_ids': list(assigned_volunteer_ids),
+        'assigned_volunteer_ids': assigned_volunteer_ids,
+        'unassigned_count': approved_registrations.exclude(
+            volunteer__certificate_assignments__certificate=event.certificate
+        ).count(),
         'certificate': event.certificate,
+        'run': event.certificate.runs.first(),
+        'can_personalize': can_personalize(event.certificate),
     }
     return render(request, 'certificates/assign_certificates.html', context)
 
 
+@login_required
+@require_POST
+def generate_certificates(request, event_id):
+    """NGO (re)generates the personalized certificate PDFs of an event"""
+    if request.user.user_type != 'ngo':
+        messages.error(request, 'Access denied.')
+        return redirect('event_list')
+
+    event = get_object_or_404(Event, pk=event_id)
+    ngo = NGO.objects.get(user=request.user)
+
+    if event.ngo != ngo:
+        messages.error(request, 'You can only generate certificates for your own events.')
+        return redirect('ngo_events')
+
+    certificate = getattr(event, 'certificate', None)
+    if certificate is None or certificate.status != 'approved':
+        messages.error(request, 'This event does not have an approved certificate.')
+        return redirect('ngo_events')
+
+    if not can_personalize(certificate):
+        messages.error(request, 'Only PNG or JPEG templates can be personalized. '
+                                'Volunteers receive the approved certificate file as uploaded.')
+        return redirect('assign_certificates', event_id=event_id)
+
+    if certificate.runs.filter(status__in=['queued', 'running']).exists():
+        messages.warning(request, 'Certificates are already being generated. Try again when they are done.')
+        return redirect('assign_certificates', event_id=event_id)
+
+    force = bool(request.POST.get('force'))
+    hours = request.POST.get('hours', '').strip()
+    if hours and not hours.isdigit():
+        messages.error(request, 'Hours must be a whole number.')
+        return redirect('assign_certificates', event_id=event_id)
+    hours = int(hours) if hours else None
+    if hours != certificate.hours:
+        # Certificates already issued show the old hours
+        certificate.hours = hours
+        certificate.save(update_fields=['hours', 'updated_at'])
+        force = True
+
+    run = start_generation(certificate, force=force)
+    if run is None:
+        messages.info(request, 'Every assigned volunteer already has a personalized certificate.')
+    else:
+        messages.success(request, f'Generating {run.total} personalized certificate(s).')
+    return redirect('assign_certificates', event_id=event_id)
+
+
+@login_required
+def certificate_run_status(request, event_id):
+    """Progress of the latest certificate generation, polled by the assign page"""
+    if request.user.user_type != 'ngo':
+        return JsonResponse({'error': 'Access denied.'}, status=403)
+
+    event = get_object_or_404(Event.objects.select_related('ngo'), pk=event_id)
+    if event.ngo.user_id != request.user.pk:
+        return JsonResponse({'error': 'Access denied.'}, status=403)
+
+    run = CertificateRun.objects.filter(certificate__event=event).first()
+    return JsonResponse({'run': run.as_dict() if run else None})
+
+
 @login_required
 def my_certificates(request):
     """Volunteer views their certificates"""
@@ -103,4 +178,120 @@ def my_certificates(request):
     context = {
         'assignments': assignments,
     }
-    return render(request, 'certificates/my_certificates.html', context)
\ No newline at end of file
+    return render(request, 'certificates/my_certificates.html', context)
+
+
+def _zip_entries(assignments, arcname):
+    """ZipEntry per assignment's certificate (personalized if rendered); missing files are left out"""
+    for assignment in assignments:
+        field_file = assignment.file or assignment.certificate.certificate_file
+        try:
+            yield storage_entry(f'{arcname(assignment)}{os.path.splitext(field_file.name)[1].lower()}', field_file)
+        except OSError:
+            logger.warning('Certificate file %s is missing; left out of the archive', field_file.name)
+
+
+@login_required
+@require_safe
+def download_event_certificates(request, event_id):
+    """NGO downloads every certificate assigned for an event as one ZIP"""
+    if request.user.user_type != 'ngo':
+        messages.error(request, 'Access denied.')
+        return redirect('event_list')
+
+    event = get_object_or_404(Event, pk=event_id)
+    ngo = NGO.objects.get(user=request.user)
+
+    if event.ngo != ngo:
+        messages.error(request, 'You can only download certificates for your own events.')
+        return redirect('ngo_events')
+
+    assignments = (
+        CertificateAssignment.objects.filter(certificate__event=event)
+        .select_related('certificate', 'volunteer').order_by('pk')
+    )
+    entries = _zip_entries(
+        assignments.iterator(chunk_size=500),
+        lambda assignment: f'{slugify(assignment.volunteer.get_full_name()) or assignment.volunteer.username}'
+                           f'-{assignment.volunteer_id}',
+    )
+    return zip_response(request, entries, f'certificates-{slugify(event.title) or "event"}-{event.pk}')
+
+
+@login_required
+@require_safe
+def download_my_certificates(request):
+    """Volunteer downloads all their certificates as one ZIP"""
+    if request.user.user_type != 'volunteer':
+        messages.error(request, 'Access denied.')
+        return redirect('landing')
+
+    assignments = (
+        CertificateAssignment.objects.filter(volunteer=request.user)
+        .select_related('certificate', 'certificate__event').order_by('pk')
+    )
+    entries = _zip_entries(
+        assignments.iterator(chunk_size=500),
+        lambda assignment: f'{slugify(assignment.certificate.event.title) or "event"}-{assignment.certificate.event_id}',
+    )
+    return zip_response(request, entries, 'my-certificates')
+
+
+# Public verification pages: no login and no session access, so one response serves everyone
+
+@require_safe
+@content_etag
+def verify_certificate_lookup(request):
+    """Anyone checks a certificate by typing in its code"""
+    entered = request.GET.get('code', '').strip()
+    code = normalize_code(entered)
+    if code and not allow_lookup(request.META.get('REMOTE_ADDR', '')):
+        context = {
+            'entered': entered,
+            'limited': True,
+        }
+        response = render(request, 'certificates/verify_certificate.html', context, status=429)
+        # Only this client is over the limit, so no shared cache may keep the answer
+        add_never_cache_headers(response)
+        return response
+
+    # Only codes that exist get a signed link, so the signature never vouches for a guess
+    result = lookup(code) if code else None
+    if result:
+        response = redirect(verification_path(code))
+    else:
+        context = {
+            'entered': entered,
+            'invalid': bool(entered) and not code,
+            'checked': bool(code),
+        }
+        response = render(request, 'certificates/verify_certificate.html', context, status=404 if code else 200)
+    patch_cache_control(response, public=True, max_age=VERIFICATION_TIMEOUT)
+    return response
+
+
+@require_safe
+@content_etag
+@cache_control(public=True, max_age=VERIFICATION_TIMEOUT)
+def verify_certificate(request, code, signature):
+    """Anyone confirms a certificate is genuine from its signed link"""
+    code = normalize_code(code)
+    # Forged or mangled links are turned away before touching the cache or database
+    result = lookup(code) if code and signature_matches(code, signature) else None
+
+    context = {
+        'result': result,
+        'checked': True,
+    }
+    return render(request, 'certificates/verify_certificate.html', context, status=200 if result else 404)
+
+
+@require_safe
+@content_etag
+@cache_control(public=True, max_age=QR_MAX_AGE)
+def certificate_qr(request, code, signature):
+    """QR code of a certificate's verification link"""
+    code = normalize_code(code)
+    if not code or not signature_matches(code, signature):
+        raise Http404('Unknown verification link.')
+    return HttpResponse(qr_png(request.build_absolute_uri(verification_path(code))), content_type='image/png')
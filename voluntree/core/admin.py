@@ -0,0 +1,34 @@
+from django.contrib import admin
+from django.utils import timezone
+from .models import Blob, Notification, Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'attempts', 'max_attempts', 'run_at', 'locked_by', 'created_at']
+    list_filter = ['status', 'name']
+    readonly_fields = ['locked_by', 'locked_at', 'last_error', 'created_at']
+    actions = ['retry_now']
+
+    @admin.action(description='Queue selected tasks to run now')
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status='running').update(
+            status='queued', run_at=timezone.now(), attempts=0, locked_by='', locked_at=None)
+        self.message_user(request, f'{updated} task(s) queued.')
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'user', 'status', 'created_at', 'sent_at']
+    list_filter = ['status']
+    search_fields = ['subject', 'user__username', 'user__email']
+    raw_id_fields = ['user']
+    readonly_fields = ['claimed_by', 'claimed_at', 'created_at', 'sent_at']
+
+
+@admin.register(Blob)
+class BlobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'size', 'refs', 'created_at', 'touched_at']
+    list_filter = ['created_at']
+    search_fields = ['name']
+    readonly_fields = ['name', 'size', 'refs', 'created_at', 'touched_at']
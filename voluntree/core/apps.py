@@ -5,3 +5,8 @@ class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
 
+    def ready(self):
+        from . import checks  # noqa: F401
+        from .images import connect_variant_fields
+        connect_variant_fields()
+
@@ -0,0 +1,66 @@
+# core/checks.py
+
+from datetime import timedelta
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+from django.db import DatabaseError
+from django.utils import timezone
+
+# Backends whose entries each process keeps to itself
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+# Seconds a due task may wait before we assume no worker is polling the queue
+WORKER_MISSING_AFTER = 10 * 60
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Invalidation versions bumped in one worker process must be seen by the others"""
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Warning(
+        f'The default cache ({backend}) is not shared between processes.',
+        hint='Event cards and calendar feeds invalidated in one worker stay stale in the others. '
+             'Set CACHE_BACKEND and CACHE_LOCATION to a shared cache such as Redis or Memcached.',
+        id='core.W001',
+    )]
+
+
+@register(deploy=True)
+def check_task_queue_eager(app_configs, **kwargs):
+    """Eager tasks run inside the request that queues them"""
+    if not getattr(settings, 'TASK_QUEUE_EAGER', False):
+        return []
+    return [Warning(
+        'TASK_QUEUE_EAGER is on, so background tasks run inside the requests that queue them.',
+        hint='It is meant for tests. Turn it off and keep `manage.py runworker` running.',
+        id='core.W002',
+    )]
+
+
+@register(Tags.database)
+def check_task_worker(app_configs, databases=None, **kwargs):
+    """Tasks long past their run time mean no worker is running them"""
+    if not databases or 'default' not in databases:
+        return []
+    from .models import Task
+
+    try:
+        overdue = Task.objects.filter(
+            status='queued', run_at__lt=timezone.now() - timedelta(seconds=WORKER_MISSING_AFTER)
+        ).count()
+    except DatabaseError:
+        # Not migrated yet
+        return []
+    if not overdue:
+        return []
+    return [Warning(
+        f'{overdue} background task(s) have been due for over {WORKER_MISSING_AFTER // 60} minutes.',
+        hint='No task worker seems to be running: deletions, emails and image variants wait for it. '
+             'Start `manage.py runworker` next to the web server.',
+        id='core.W003',
+    )]
@@ -0,0 +1,191 @@
+# core/images.py
+
+"""
+Resized WebP/JPEG variants of uploaded images.
+
+Every image in VARIANT_FIELDS gets a thumb, card and hero rendition in
+both formats, stored next to the original (events/beach.png ->
+events/beach.card.webp, events/beach.card.jpg, ...). Saving a model with
+a new image queues a generate_image_variants task (core/tasks.py) for the
+worker once the save commits, so uploads never wait for Pillow. Until the variants exist the
+responsive_image template tag falls back to the original.
+
+The widths actually produced are kept in the cache as a manifest, so
+rendering a page costs one cache read per image and no file access.
+"""
+
+import io
+import os
+from django.apps import apps
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import Signal, receiver
+from PIL import Image, ImageOps
+from .storage import ContentAddressedStorage, blob_deleted
+
+# Target widths, largest first so each variant is scaled down from the previous one
+VARIANT_WIDTHS = {
+    'hero': 1600,
+    'card': 640,
+    'thumb': 240,
+}
+
+# Format -> (file extension, Pillow save options)
+VARIANT_FORMATS = {
+    'webp': ('webp', {'format': 'WEBP', 'quality': 80, 'method': 4}),
+    'jpeg': ('jpg', {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+# Image fields that get variants: (app_label.Model, field name)
+VARIANT_FIELDS = [
+    ('events.Event', 'image'),
+    ('accounts.VolunteerProfile', 'profile_picture'),
+    ('accounts.NGO', 'logo'),
+]
+
+ORIENTATION_TAG = 0x0112
+
+# Sent with the original's name once its variants are written
+variants_generated = Signal()
+
+
+def variant_name(name, variant, image_format):
+    root, _ = os.path.splitext(name)
+    return f'{root}.{variant}.{VARIANT_FORMATS[image_format][0]}'
+
+
+def variant_names(name):
+    return [variant_name(name, variant, image_format)
+            for variant in VARIANT_WIDTHS for image_format in VARIANT_FORMATS]
+
+
+def _manifest_key(name):
+    return f'image-variants:{name}'
+
+
+@receiver(blob_deleted)
+def _forget_variants(sender, name, **kwargs):
+    # The variants went with the blob; the same bytes uploaded again must get new ones
+    cache.delete(_manifest_key(name))
+
+
+def _flatten(image, image_format):
+    """Pillow mode the format can store; JPEG gets transparency on white"""
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    if not has_alpha:
+        return image.convert('RGB') if image.mode != 'RGB' else image
+    image = image.convert('RGBA')
+    if image_format == 'webp':
+        return image
+    background = Image.new('RGB', image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel('A'))
+    return background
+
+
+def _write(storage, name, data):
+    # storage.save() would pick a new name instead of overwriting
+    if storage.exists(name):
+        storage.delete(name)
+    # Variants of originals stored before content addressing are under a hashed prefix too
+    if isinstance(storage, ContentAddressedStorage):
+        storage.save_fixed(name, ContentFile(data))
+    else:
+        storage.save(name, ContentFile(data))
+
+
+def generate_variants(storage, name):
+    """
+    Write every variant of `name` and record the manifest.
+    Returns {variant: width}; originals narrower than a target are not upscaled.
+    """
+    with storage.open(name) as source:
+        image = Image.open(source)
+        image.load()
+    image = ImageOps.exif_transpose(image)
+
+    widths = {}
+    current = image
+    for variant, target in VARIANT_WIDTHS.items():
+        width = min(target, image.width)
+        if width < current.width:
+            height = max(round(current.height * width / current.width), 1)
+            current = current.resize((width, height), Image.LANCZOS)
+        for image_format, (_, options) in VARIANT_FORMATS.items():
+            buffer = io.BytesIO()
+            _flatten(current, image_format).save(buffer, **options)
+            _write(storage, variant_name(name, variant, image_format), buffer.getvalue())
+        widths[variant] = current.width
+
+    # The manifest is cached for good, so it must never claim a file that isn't there
+    missing = [path for path in variant_names(name) if not storage.exists(path)]
+    if missing:
+        raise OSError(f'Variants of {name} were not written: {", ".join(missing)}')
+    cache.set(_manifest_key(name), widths, None)
+    variants_generated.send(sender=None, name=name)
+    return widths
+
+
+def variant_manifest(field_file):
+    """{variant: width} if the variants of this image exist, else None"""
+    name = field_file.name
+    manifest = cache.get(_manifest_key(name))
+    if manifest is not None:
+        return manifest or None
+
+    # Not cached (e.g. after a restart): check storage once and remember
+    storage = field_file.storage
+    manifest = {}
+    if all(storage.exists(path) for path in variant_names(name)):
+        try:
+            with storage.open(name) as source:
+                # Header only: the size, swapped for EXIF rotations of 90/270 degrees
+                original = Image.open(source)
+                rotated = original.getexif().get(ORIENTATION_TAG) in (5, 6, 7, 8)
+                original_width = original.height if rotated else original.width
+            manifest = {variant: min(target, original_width) for variant, target in VARIANT_WIDTHS.items()}
+        except (OSError, Image.DecompressionBombError):
+            manifest = {}
+    cache.set(_manifest_key(name), manifest, None if manifest else 60)
+    return manifest or None
+
+
+def schedule_variants(model_label, field_name, name):
+    """Have the task worker generate variants once the current transaction commits"""
+    from .tasks import generate_image_variants
+    # After commit: never inside the request's transaction, and the worker must find the saved file
+    transaction.on_commit(lambda: generate_image_variants.delay(model_label, field_name, name))
+
+
+def _queue_variants(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    for field_name in sender._variant_fields:
+        field_file = getattr(instance, field_name)
+        if field_file and variant_manifest(field_file) is None:
+            schedule_variants(sender._meta.label, field_name, field_file.name)
+
+
+def connect_variant_fields():
+    """Queue variant generation whenever a model in VARIANT_FIELDS is saved"""
+    for model_label, field_name in VARIANT_FIELDS:
+        model = apps.get_model(model_label)
+        if not hasattr(model, '_variant_fields'):
+            model._variant_fields = []
+            post_save.connect(_queue_variants, sender=model, dispatch_uid=f'image-variants-{model_label}')
+        if field_name not in model._variant_fields:
+            model._variant_fields.append(field_name)
+
+
+def iter_variant_images():
+    """(storage, name) of every stored image in VARIANT_FIELDS"""
+    for model_label, field_name in VARIANT_FIELDS:
+        model = apps.get_model(model_label)
+        storage = model._meta.get_field(field_name).storage
+        names = (
+            model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+            .order_by(field_name).values_list(field_name, flat=True).distinct()
+        )
+        for name in names.iterator(chunk_size=500):
+            yield storage, name
@@ -0,0 +1,31 @@
+# core/management/commands/collect_blobs.py
+
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+from core.storage import BLOB_GRACE_PERIOD, collect_blobs
+
+
+class Command(BaseCommand):
+    help = ('Recount references to stored uploads and delete those no FileField has pointed at '
+            'for the grace period. Safe to run from cron.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-hours', type=float, default=BLOB_GRACE_PERIOD.total_seconds() / 3600,
+                            help=f'Keep unreferenced uploads this long (default {BLOB_GRACE_PERIOD})')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report what would be deleted')
+
+    def handle(self, *args, **options):
+        result = collect_blobs(grace=timedelta(hours=options['grace_hours']), dry_run=options['dry_run'])
+
+        if options['dry_run']:
+            self.stdout.write(
+                f"{result['blobs']} blob(s), {result['recounted']} with a wrong reference count, "
+                f"{result['deleted']} would be deleted."
+            )
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['blobs']} blob(s), {result['recounted']} recounted, "
+            f"{result['deleted']} deleted ({filesizeformat(result['freed'])} freed)."
+        ))
@@ -0,0 +1,31 @@
+# core/management/commands/dedupe_media.py
+
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+from core.storage import dedupe_media
+
+
+class Command(BaseCommand):
+    help = ('Move uploads stored before content-addressed storage into shared blobs, '
+            'one copy per distinct content, and point their FileFields at them')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report how much space would be saved')
+        parser.add_argument('--delete-orphans', action='store_true',
+                            help='Also delete files in the upload directories that no record references')
+
+    def handle(self, *args, **options):
+        result = dedupe_media(dry_run=options['dry_run'], delete_orphans=options['delete_orphans'])
+
+        verb = 'would be' if options['dry_run'] else 'were'
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['files']} file(s) {verb} stored as {result['blobs']} blob(s), "
+            f"{filesizeformat(result['freed'])} saved."
+        ))
+        if result['orphans']:
+            deleted = options['delete_orphans'] and not options['dry_run']
+            self.stdout.write(self.style.WARNING(
+                f"{result['orphans']} file(s) ({filesizeformat(result['orphaned'])}) in the upload directories "
+                f"{'were deleted' if deleted else 'are not referenced by any record (see --delete-orphans)'}."
+            ))
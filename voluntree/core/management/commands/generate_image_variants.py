@@ -0,0 +1,44 @@
+# core/management/commands/generate_image_variants.py
+
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from django.db import connections
+from PIL import Image
+from core.images import generate_variants, iter_variant_images, variant_names
+
+
+class Command(BaseCommand):
+    help = 'Generate the thumb/card/hero WebP and JPEG variants of existing event images, profile pictures and logos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true',
+                            help='Regenerate variants that already exist')
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Images resized in parallel (default 4)')
+
+    def handle(self, *args, **options):
+        def process(item):
+            storage, name = item
+            try:
+                if not options['force'] and all(storage.exists(path) for path in variant_names(name)):
+                    return 'skipped', name
+                if not storage.exists(name):
+                    return 'missing', name
+                generate_variants(storage, name)
+                return 'generated', name
+            except (OSError, Image.DecompressionBombError) as exc:
+                return 'failed', f'{name}: {exc}'
+            finally:
+                connections.close_all()
+
+        counts = {'generated': 0, 'skipped': 0, 'missing': 0, 'failed': 0}
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            for outcome, detail in pool.map(process, iter_variant_images()):
+                counts[outcome] += 1
+                if outcome in ('missing', 'failed'):
+                    self.stdout.write(self.style.WARNING(f'{outcome.capitalize()}: {detail}'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated variants for {counts['generated']} image(s), "
+            f"{counts['skipped']} already up to date, {counts['missing']} missing, {counts['failed']} failed."
+        ))
@@ -0,0 +1,50 @@
+# core/management/commands/runworker.py
+
+import signal
+import threading
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from core.taskqueue import STALE_AFTER, run_worker
+
+
+class Command(BaseCommand):
+    help = ('Run queued background tasks (image variants, deletions, emails) on a thread or process pool. '
+            'Start one or more per server; they share the task table.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Tasks run in parallel (default 4)')
+        parser.add_argument('--pool', choices=['thread', 'process'], default='thread',
+                            help='Run tasks on threads (default) or processes, for CPU-bound work')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Seconds between polls when the queue is empty (default 1)')
+        parser.add_argument('--stale-after', type=int, default=STALE_AFTER,
+                            help=f'Seconds before a running task of a dead worker is retried (default {STALE_AFTER})')
+        parser.add_argument('--burst', action='store_true',
+                            help='Exit once no task is due instead of waiting for more')
+
+    def handle(self, *args, **options):
+        if settings.TASK_QUEUE_EAGER:
+            self.stdout.write(self.style.WARNING(
+                'TASK_QUEUE_EAGER is on, so tasks run inline where they are queued instead of here. '
+                'It is meant for tests only.'
+            ))
+        stop = threading.Event()
+
+        def shut_down(signum, frame):
+            self.stdout.write('Stopping after the tasks in progress...')
+            stop.set()
+
+        previous = {signum: signal.signal(signum, shut_down) for signum in (signal.SIGTERM, signal.SIGINT)}
+        try:
+            if not options['burst']:
+                self.stdout.write(f"Worker started with {options['workers']} {options['pool']}(s).")
+            counts = run_worker(workers=options['workers'], pool=options['pool'],
+                                poll_interval=options['poll_interval'], burst=options['burst'],
+                                stale_after=options['stale_after'], stop=stop)
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+        self.stdout.write(self.style.SUCCESS(
+            f"{counts['done']} task(s) done, {counts['retried']} retried, {counts['failed']} failed."
+        ))
@@ -0,0 +1,93 @@
+# core/models.py
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Task(models.Model):
+    """A queued call of a @task function, run by `manage.py runworker` (see core/taskqueue.py)"""
+
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('failed', 'Failed'),
+    ]
+
+    name = models.CharField(max_length=200)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['run_at', 'pk']
+        indexes = [
+            # The worker's poll: due tasks in run_at order
+            models.Index(fields=['status', 'run_at'], name='core_task_status_run_at_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.get_status_display()})"
+
+
+class Notification(models.Model):
+    """An email to a user, waiting in the outbox or sent (see core/notifications.py)"""
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notifications')
+    subject = models.CharField(max_length=200)
+    body = models.TextField()
+    # Same key for the same news, e.g. 'registration:12:approved'
+    dedupe_key = models.CharField(max_length=200, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    claimed_by = models.CharField(max_length=64, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'user'], name='core_notification_outbox_idx'),
+        ]
+        constraints = [
+            # A user is never queued the same news twice while the first copy is unsent
+            models.UniqueConstraint(
+                fields=['user', 'dedupe_key'], condition=Q(status='pending') & ~Q(dedupe_key=''),
+                name='core_notification_pending_dedupe',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} to {self.user.username} ({self.get_status_display()})"
+
+
+class Blob(models.Model):
+    """A stored file shared by every upload with the same bytes (see core/storage.py)"""
+
+    name = models.CharField(max_length=100, unique=True)
+    size = models.BigIntegerField()
+    # FileField values pointing at the blob; recounted by `manage.py collect_blobs`
+    refs = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    touched_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.name} ({self.refs} reference(s))"
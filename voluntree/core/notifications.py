@@ -0,0 +1,155 @@
+# core/notifications.py
+
+"""
+Email notifications through an outbox.
+
+Views and signal receivers queue a task; the task renders a Notification
+row per recipient (queue_notifications). Rows are only written to the
+outbox, never mailed inline. A send_notifications task (core/tasks.py) is
+scheduled NOTIFICATION_DELAY seconds out, so news that arrives meanwhile
+goes out with it:
+
+* dedupe: a user's pending notification with the same dedupe_key is not
+  queued twice (a partial unique constraint, so once sent it can recur);
+* coalescing: everything pending for one recipient becomes one email, a
+  digest when there is more than one item;
+* batching: recipients are claimed DELIVERY_BATCH_SIZE at a time and all
+  of them are sent over a single backend connection.
+
+Which news is sent at all follows the PlatformSettings email flags; the
+tasks that queue notifications check them. Tests get Django's locmem
+backend; settings.EMAIL_BACKEND defaults to the console backend here.
+"""
+
+import smtplib
+import uuid
+from datetime import timedelta
+from itertools import groupby
+from operator import attrgetter
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Exists, OuterRef
+from django.template.loader import render_to_string
+from django.utils import timezone
+from admin_panel.models import PlatformSettings
+from .models import Notification, Task
+
+# Seconds notifications wait in the outbox so later ones can join them
+NOTIFICATION_DELAY = 60
+DELIVERY_BATCH_SIZE = 200
+INSERT_BATCH_SIZE = 500
+# Seconds before notifications claimed by a crashed sender are released
+STALE_AFTER = 10 * 60
+
+
+def build_notification(user, subject, template_name, context=None, dedupe_key=''):
+    """An unsaved Notification with the body rendered from a text template"""
+    body = render_to_string(template_name, {'user': user, **(context or {})})
+    return Notification(user=user, subject=subject[:200], body=body.strip(), dedupe_key=dedupe_key)
+
+
+def queue_notifications(notifications, replace=False):
+    """
+    Add notifications to the outbox and make sure a delivery is scheduled.
+
+    Duplicates of a pending notification are dropped. With replace, pending
+    notifications with any of the given dedupe keys are removed first, so
+    the newest version of the news is the one sent.
+    """
+    notifications = list(notifications)
+    if not notifications:
+        return
+    if replace:
+        keys = {notification.dedupe_key for notification in notifications if notification.dedupe_key}
+        Notification.objects.filter(status='pending', dedupe_key__in=keys).delete()
+    Notification.objects.bulk_create(notifications, batch_size=INSERT_BATCH_SIZE, ignore_conflicts=True)
+    schedule_delivery()
+
+
+def schedule_delivery():
+    """Queue send_notifications unless one is already waiting to run"""
+    from .tasks import send_notifications
+
+    if not Task.objects.filter(name=send_notifications.name, status='queued').exists():
+        send_notifications.enqueue(countdown=NOTIFICATION_DELAY)
+
+
+def _message(notifications, from_email, site_name):
+    """One email for everything pending for a recipient"""
+    if len(notifications) == 1:
+        subject, body = notifications[0].subject, notifications[0].body
+    else:
+        subject = f'{len(notifications)} updates from {site_name}'
+        body = '\n\n'.join(
+            f'{notification.subject}\n{"-" * len(notification.subject)}\n{notification.body}'
+            for notification in sorted(notifications, key=attrgetter('pk'))
+        )
+    return EmailMessage(subject, body, from_email, [notifications[0].user.email])
+
+
+def _release(claimed):
+    """Put claimed notifications back in the outbox, unless an identical one was queued meanwhile"""
+    duplicate = Notification.objects.filter(status='pending', user_id=OuterRef('user_id'),
+                                            dedupe_key=OuterRef('dedupe_key'))
+    claimed.exclude(dedupe_key='').filter(Exists(duplicate)).delete()
+    claimed.update(status='pending', claimed_by='', claimed_at=None)
+
+
+def deliver_notifications(batch_size=DELIVERY_BATCH_SIZE):
+    """
+    Send the outbox. Returns the number of emails sent.
+
+    A connection error leaves the unsent notifications pending and is
+    raised, so the calling task retries with backoff.
+    """
+    _release(Notification.objects.filter(
+        status='sending', claimed_at__lt=timezone.now() - timedelta(seconds=STALE_AFTER)))
+
+    platform = PlatformSettings.load()
+    from_email = platform.noreply_email or settings.DEFAULT_FROM_EMAIL
+    pending = Notification.objects.filter(status='pending')
+    token = uuid.uuid4().hex
+    connection = None
+    sent = 0
+
+    try:
+        while True:
+            # Whole recipients per batch, so nobody's digest is split
+            user_ids = list(pending.order_by('user_id').values_list('user_id', flat=True).distinct()[:batch_size])
+            if not user_ids:
+                break
+            pending.filter(user_id__in=user_ids).update(status='sending', claimed_by=token,
+                                                        claimed_at=timezone.now())
+            claimed = (
+                Notification.objects.filter(status='sending', claimed_by=token)
+                .select_related('user').order_by('user_id', 'pk')
+            )
+
+            if connection is None:
+                connection = get_connection()
+                connection.open()
+
+            sent_ids, failed_ids = [], []
+            try:
+                for _, group in groupby(claimed, key=attrgetter('user_id')):
+                    group = list(group)
+                    ids = [notification.pk for notification in group]
+                    if not group[0].user.email or not group[0].user.is_active:
+                        failed_ids += ids
+                        continue
+                    try:
+                        connection.send_messages([_message(group, from_email, platform.site_name)])
+                    except smtplib.SMTPRecipientsRefused:
+                        failed_ids += ids
+                        continue
+                    sent_ids += ids
+                    sent += 1
+            finally:
+                Notification.objects.filter(pk__in=sent_ids).update(status='sent', sent_at=timezone.now())
+                Notification.objects.filter(pk__in=failed_ids).update(status='failed')
+                # Whatever is left was not sent: back to the outbox for the retry
+                _release(Notification.objects.filter(status='sending', claimed_by=token))
+    finally:
+        if connection is not None:
+            connection.close()
+    return sent
@@ -0,0 +1,266 @@
+# core/qr.py
+
+"""
+QR codes for short links, drawn with Pillow.
+
+No QR library is installed, and links (a verification URL, say) need
+only a small part of the standard: byte mode at error correction level M
+(about 15% of the symbol can be damaged or covered), versions 1 to 10.
+That holds up to 213 bytes. The smallest version that fits is used, and
+of the eight data masks the one with the lowest penalty score (ISO/IEC
+18004, 7.8.3), so scanners lock on easily.
+"""
+
+import io
+from PIL import Image
+
+# Error correction level M, versions 1..10: (EC codewords per block, [(blocks, data codewords per block)])
+BLOCKS = {
+    1: (10, [(1, 16)]),
+    2: (16, [(1, 28)]),
+    3: (26, [(1, 44)]),
+    4: (18, [(2, 32)]),
+    5: (24, [(2, 43)]),
+    6: (16, [(4, 27)]),
+    7: (18, [(4, 31)]),
+    8: (22, [(2, 38), (2, 39)]),
+    9: (22, [(3, 36), (2, 37)]),
+    10: (26, [(4, 43), (1, 44)]),
+}
+ALIGNMENT = {
+    1: [], 2: [6, 18], 3: [6, 22], 4: [6, 26], 5: [6, 30],
+    6: [6, 34], 7: [6, 22, 38], 8: [6, 24, 42], 9: [6, 26, 46], 10: [6, 28, 50],
+}
+LEVEL_M = 0b00
+
+MASKS = [
+    lambda x, y: (x + y) % 2 == 0,
+    lambda x, y: y % 2 == 0,
+    lambda x, y: x % 3 == 0,
+    lambda x, y: (x + y) % 3 == 0,
+    lambda x, y: (x // 3 + y // 2) % 2 == 0,
+    lambda x, y: x * y % 2 + x * y % 3 == 0,
+    lambda x, y: (x * y % 2 + x * y % 3) % 2 == 0,
+    lambda x, y: ((x + y) % 2 + x * y % 3) % 2 == 0,
+]
+
+# GF(256) with the QR polynomial x^8 + x^4 + x^3 + x^2 + 1
+_EXP = [0] * 512
+_LOG = [0] * 256
+_value = 1
+for _power in range(255):
+    _EXP[_power] = _value
+    _LOG[_value] = _power
+    _value <<= 1
+    if _value & 0x100:
+        _value ^= 0x11D
+for _power in range(255, 512):
+    _EXP[_power] = _EXP[_power - 255]
+
+
+def _multiply(a, b):
+    return 0 if not a or not b else _EXP[_LOG[a] + _LOG[b]]
+
+
+def _generator(degree):
+    """Coefficients of (x - a^0)...(x - a^(degree-1)), leading term dropped"""
+    poly = [1]
+    for power in range(degree):
+        poly = [
+            (poly[index] if index < len(poly) else 0) ^ (_multiply(poly[index - 1], _EXP[power]) if index else 0)
+            for index in range(len(poly) + 1)
+        ]
+    return poly[1:]
+
+
+def _error_correction(data, degree):
+    """Reed-Solomon error correction codewords of one block"""
+    generator = _generator(degree)
+    remainder = [0] * degree
+    for byte in data:
+        factor = byte ^ remainder.pop(0)
+        remainder.append(0)
+        for index, coefficient in enumerate(generator):
+            remainder[index] ^= _multiply(coefficient, factor)
+    return remainder
+
+
+def _capacity(version):
+    return sum(count * size for count, size in BLOCKS[version][1])
+
+
+def _codewords(data, version):
+    """Data and error correction codewords of `data`, interleaved across blocks"""
+    bits = [0, 1, 0, 0]  # byte mode
+    for value, length in [(len(data), 8 if version < 10 else 16), *((byte, 8) for byte in data)]:
+        bits.extend((value >> shift) & 1 for shift in reversed(range(length)))
+    capacity = _capacity(version) * 8
+    bits.extend([0] * min(4, capacity - len(bits)))
+    bits.extend([0] * (-len(bits) % 8))
+    payload = [int(''.join(map(str, bits[index:index + 8])), 2) for index in range(0, len(bits), 8)]
+    payload.extend(([0xEC, 0x11] * capacity)[:capacity // 8 - len(payload)])
+
+    degree, groups = BLOCKS[version]
+    blocks, position = [], 0
+    for count, size in groups:
+        for _ in range(count):
+            blocks.append(payload[position:position + size])
+            position += size
+    corrections = [_error_correction(block, degree) for block in blocks]
+
+    result = [block[index] for index in range(max(map(len, blocks))) for block in blocks if index < len(block)]
+    return result + [correction[index] for index in range(degree) for correction in corrections]
+
+
+class _Symbol:
+
+    def __init__(self, version):
+        self.version = version
+        self.size = 17 + 4 * version
+        self.modules = [[False] * self.size for _ in range(self.size)]
+        self.reserved = [[False] * self.size for _ in range(self.size)]
+        self._draw_function_patterns()
+
+    def set(self, x, y, dark):
+        self.modules[y][x] = dark
+        self.reserved[y][x] = True
+
+    def _draw_function_patterns(self):
+        size = self.size
+        for index in range(size):
+            self.set(6, index, index % 2 == 0)
+            self.set(index, 6, index % 2 == 0)
+        for cx, cy in [(3, 3), (size - 4, 3), (3, size - 4)]:
+            for dy in range(-4, 5):
+                for dx in range(-4, 5):
+                    if 0 <= cx + dx < size and 0 <= cy + dy < size:
+                        self.set(cx + dx, cy + dy, max(abs(dx), abs(dy)) not in (2, 4))
+        positions = ALIGNMENT[self.version]
+        for cy in positions:
+            for cx in positions:
+                if (cx, cy) in [(6, 6), (6, positions[-1]), (positions[-1], 6)]:
+                    continue
+                for dy in range(-2, 3):
+                    for dx in range(-2, 3):
+                        self.set(cx + dx, cy + dy, max(abs(dx), abs(dy)) != 1)
+        self.draw_format(0)
+        if self.version >= 7:
+            remainder = self.version
+            for _ in range(12):
+                remainder = (remainder << 1) ^ ((remainder >> 11) * 0x1F25)
+            bits = self.version << 12 | remainder
+            for index in range(18):
+                dark = bool(bits >> index & 1)
+                self.set(size - 11 + index % 3, index // 3, dark)
+                self.set(index // 3, size - 11 + index % 3, dark)
+
+    def draw_format(self, mask):
+        size = self.size
+        data = LEVEL_M << 3 | mask
+        remainder = data
+        for _ in range(10):
+            remainder = (remainder << 1) ^ ((remainder >> 9) * 0x537)
+        bits = (data << 10 | remainder) ^ 0x5412
+
+        def bit(index):
+            return bool(bits >> index & 1)
+
+        for index in range(6):
+            self.set(8, index, bit(index))
+        self.set(8, 7, bit(6))
+        self.set(8, 8, bit(7))
+        self.set(7, 8, bit(8))
+        for index in range(9, 15):
+            self.set(14 - index, 8, bit(index))
+        for index in range(8):
+            self.set(size - 1 - index, 8, bit(index))
+        for index in range(8, 15):
+            self.set(8, size - 15 + index, bit(index))
+        self.set(8, size - 8, True)
+
+    def draw_codewords(self, codewords):
+        """Place the bits in the two-column zigzag from the bottom right, skipping function patterns"""
+        size, position, total = self.size, 0, len(codewords) * 8
+        right = size - 1
+        while right >= 1:
+            if right == 6:
+                right = 5
+            upward = (right + 1) & 2 == 0
+            for vertical in range(size):
+                y = size - 1 - vertical if upward else vertical
+                for x in (right, right - 1):
+                    if not self.reserved[y][x] and position < total:
+                        self.modules[y][x] = bool(codewords[position >> 3] >> (7 - (position & 7)) & 1)
+                        position += 1
+            right -= 2
+
+    def masked(self, mask):
+        symbol = _Symbol.__new__(_Symbol)
+        symbol.version, symbol.size = self.version, self.size
+        symbol.reserved = self.reserved
+        symbol.modules = [
+            [dark ^ (not self.reserved[y][x] and MASKS[mask](x, y)) for x, dark in enumerate(row)]
+            for y, row in enumerate(self.modules)
+        ]
+        symbol.draw_format(mask)
+        return symbol
+
+    def penalty(self):
+        rows = self.modules
+        lines = rows + [list(column) for column in zip(*rows)]
+        score = 0
+        for line in lines:
+            run, previous = 0, None
+            for dark in line:
+                run = run + 1 if dark == previous else 1
+                previous = dark
+                if run == 5:
+                    score += 3
+                elif run > 5:
+                    score += 1
+            # Finder-like 1:1:3:1:1 runs next to four light modules
+            text = '0000' + ''.join('1' if dark else '0' for dark in line) + '0000'
+            for pattern in ('00001011101', '10111010000'):
+                start = text.find(pattern)
+                while start != -1:
+                    score += 40
+                    start = text.find(pattern, start + 1)
+        for y in range(self.size - 1):
+            for x in range(self.size - 1):
+                if rows[y][x] == rows[y][x + 1] == rows[y + 1][x] == rows[y + 1][x + 1]:
+                    score += 3
+        dark = sum(map(sum, rows))
+        score += int(abs(dark * 100 / self.size ** 2 - 50) // 5) * 10
+        return score
+
+
+def qr_matrix(data):
+    """Rows of modules (True is dark) of the smallest QR code holding `data` (bytes or str)"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    for version in BLOCKS:
+        count_bits = 8 if version < 10 else 16
+        if 4 + count_bits + 8 * len(data) <= _capacity(version) * 8:
+            break
+    else:
+        raise ValueError(f'{len(data)} bytes is too long for a QR code')
+
+    symbol = _Symbol(version)
+    symbol.draw_codewords(_codewords(data, version))
+    best = min((symbol.masked(mask) for mask in range(len(MASKS))), key=_Symbol.penalty)
+    return best.modules
+
+
+def qr_png(data, scale=8, border=4):
+    """PNG bytes of a QR code for `data`, `scale` pixels per module inside a `border`-module quiet zone"""
+    modules = qr_matrix(data)
+    size = len(modules) + 2 * border
+    image = Image.new('1', (size, size), 1)
+    pixels = image.load()
+    for y, row in enumerate(modules):
+        for x, dark in enumerate(row):
+            if dark:
+                pixels[x + border, y + border] = 0
+    output = io.BytesIO()
+    image.resize((size * scale, size * scale), Image.Resampling.NEAREST).save(output, format='PNG', optimize=True)
+    return output.getvalue()
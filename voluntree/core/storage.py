@@ -0,0 +1,289 @@
+# core/storage.py
+
+"""
+Content-addressed storage for uploaded media.
+
+The default storage hashes every upload under DEDUPLICATED_PREFIXES
+(the upload_to directories of user uploads) while streaming it to disk,
+and keeps one copy per digest at blobs/<2 hex>/<sha256><ext>. That blob
+name is what the FileField stores. The same logo uploaded by an NGO and
+its volunteers, or a certificate template uploaded again, takes the
+space of one file. Models and forms are unchanged: FieldFile.url, open()
+and path all work on the blob name. Files the app writes under fixed
+names bypass the hashing: issued certificates live outside the
+prefixes, and image variants, which sit next to their original (still
+under a prefix for files stored before this backend), are written with
+save_fixed().
+
+Each blob has a Blob row with a reference count. Saving adds a
+reference and deleting a FieldFile releases one. `manage.py collect_blobs`
+recounts the references from the FileFields themselves, since rows
+deleted in bulk never release theirs. It then removes blobs that have
+been unreferenced for longer than BLOB_GRACE_PERIOD, with the files
+derived from them. The grace period covers uploads whose row isn't
+saved yet. `manage.py dedupe_media` moves files stored before this
+backend into blobs.
+"""
+
+import hashlib
+import os
+import posixpath
+import re
+import uuid
+from collections import Counter
+from datetime import timedelta
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import transaction
+from django.db.models import Count, F, FileField
+from django.dispatch import Signal
+from django.utils import timezone
+
+BLOB_DIR = 'blobs'
+BLOB_NAME = re.compile(r'^blobs/[0-9a-f]{2}/([0-9a-f]{64})(\.[0-9a-z]{1,10})?$')
+DEDUPLICATED_PREFIXES = ('certificates/templates/', 'events/', 'profiles/', 'ngo_documents/')
+BLOB_GRACE_PERIOD = timedelta(days=1)
+
+# Sent with the blob's name after its files are removed
+blob_deleted = Signal()
+
+
+def blob_name(digest, name):
+    extension = os.path.splitext(name)[1].lower()
+    if not re.fullmatch(r'\.[0-9a-z]{1,10}', extension):
+        extension = ''
+    return f'{BLOB_DIR}/{digest[:2]}/{digest}{extension}'
+
+
+def is_blob(name):
+    return bool(name) and BLOB_NAME.match(name) is not None
+
+
+class _HashingContent:
+    """Feeds each chunk to a digest as FileSystemStorage streams it to disk"""
+
+    def __init__(self, content, digest):
+        self.content = content
+        self.digest = digest
+
+    def chunks(self, chunk_size=None):
+        for chunk in self.content.chunks(chunk_size):
+            self.digest.update(chunk.encode() if isinstance(chunk, str) else chunk)
+            yield chunk
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that keeps one copy of identical uploads"""
+
+    chunk_size = 64 * 1024
+
+    def __init__(self, prefixes=DEDUPLICATED_PREFIXES, **kwargs):
+        super().__init__(**kwargs)
+        self.prefixes = tuple(prefixes)
+
+    def deduplicates(self, name):
+        return name.replace('\\', '/').startswith(self.prefixes)
+
+    def get_available_name(self, name, max_length=None):
+        # The digest decides the final name, so there is nothing to make unique
+        if self.deduplicates(name):
+            return name
+        return super().get_available_name(name, max_length)
+
+    def _save(self, name, content):
+        if not self.deduplicates(name):
+            return super()._save(name, content)
+
+        digest = hashlib.sha256()
+        temporary = f'{BLOB_DIR}/tmp/{uuid.uuid4().hex}'
+        if hasattr(content, 'temporary_file_path'):
+            # A large upload already on disk: hash it in place, then it is moved rather than copied
+            with open(content.temporary_file_path(), 'rb') as source:
+                for chunk in iter(lambda: source.read(self.chunk_size), b''):
+                    digest.update(chunk)
+            temporary = super()._save(temporary, content)
+        else:
+            temporary = super()._save(temporary, _HashingContent(content, digest))
+
+        name = blob_name(digest.hexdigest(), name)
+        # Reference first, so collect_blobs can't remove a blob this upload is about to use
+        add_reference(name, os.path.getsize(self.path(temporary)))
+        path = self.path(name)
+        if os.path.exists(path):
+            os.remove(self.path(temporary))
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(self.path(temporary), path)
+        return name
+
+    def save_fixed(self, name, content):
+        """Save under exactly `name`, never hashed into a blob; the name must be free"""
+        return super()._save(name, content)
+
+    def delete(self, name):
+        """Release a reference to a blob; other files are deleted as usual"""
+        if is_blob(name):
+            release_reference(name)
+        else:
+            super().delete(name)
+
+    def delete_blob(self, name):
+        """Remove a blob's file and any files derived from it (e.g. image variants)"""
+        directory, filename = posixpath.split(name)
+        stem = BLOB_NAME.match(name).group(1)
+        try:
+            files = self.listdir(directory)[1]
+        except FileNotFoundError:
+            files = []
+        freed = 0
+        for file in files:
+            if file == filename or file.startswith(f'{stem}.'):
+                path = self.path(posixpath.join(directory, file))
+                freed += os.path.getsize(path)
+                os.remove(path)
+        blob_deleted.send(sender=self.__class__, name=name)
+        return freed
+
+
+def add_reference(name, size):
+    from .models import Blob
+
+    now = timezone.now()
+    Blob.objects.bulk_create([Blob(name=name, size=size, touched_at=now)], ignore_conflicts=True)
+    Blob.objects.filter(name=name).update(refs=F('refs') + 1, touched_at=now)
+
+
+def release_reference(name):
+    from .models import Blob
+
+    Blob.objects.filter(name=name).update(refs=F('refs') - 1, touched_at=timezone.now())
+
+
+def blob_fields():
+    """(model, field) of every FileField stored in content-addressed storage"""
+    return [
+        (model, field)
+        for model in apps.get_models()
+        for field in model._meta.local_concrete_fields
+        if isinstance(field, FileField) and isinstance(field.storage, ContentAddressedStorage)
+    ]
+
+
+def count_references():
+    """How many FileField values point at each blob"""
+    counts = Counter()
+    for model, field in blob_fields():
+        rows = (
+            model._base_manager.filter(**{f'{field.attname}__startswith': f'{BLOB_DIR}/'})
+            .values(field.attname).annotate(count=Count('pk')).order_by()
+        )
+        for row in rows:
+            counts[row[field.attname]] += row['count']
+    return counts
+
+
+def recount_blobs(dry_run=False):
+    """Set every Blob's refs from the FileFields; returns (number corrected, counts)"""
+    from .models import Blob
+
+    counts = count_references()
+    stale = [
+        blob for blob in Blob.objects.only('pk', 'name', 'refs').iterator(chunk_size=1000)
+        if blob.refs != counts.get(blob.name, 0)
+    ]
+    if not dry_run:
+        for blob in stale:
+            blob.refs = counts.get(blob.name, 0)
+        Blob.objects.bulk_update(stale, ['refs'], batch_size=500)
+    return len(stale), counts
+
+
+def collect_blobs(grace=BLOB_GRACE_PERIOD, dry_run=False, now=None):
+    """
+    Recount references and remove blobs unreferenced for longer than
+    `grace`. Returns {'blobs', 'recounted', 'deleted', 'freed'}.
+    """
+    from .models import Blob
+
+    now = now or timezone.now()
+    recounted, counts = recount_blobs(dry_run)
+    result = {'blobs': Blob.objects.count(), 'recounted': recounted, 'deleted': 0, 'freed': 0}
+    if dry_run:
+        unreferenced = Blob.objects.filter(touched_at__lt=now - grace).exclude(name__in=list(counts))
+        result['deleted'] = unreferenced.count()
+        return result
+
+    for blob in Blob.objects.filter(refs__lte=0, touched_at__lt=now - grace).only('pk', 'name', 'touched_at'):
+        with transaction.atomic():
+            # Unless an upload took a reference meanwhile
+            if not Blob.objects.filter(pk=blob.pk, refs__lte=0, touched_at=blob.touched_at).delete()[0]:
+                continue
+        result['freed'] += default_storage.delete_blob(blob.name)
+        result['deleted'] += 1
+    return result
+
+
+def dedupe_media(dry_run=False, delete_orphans=False):
+    """
+    Move files stored under their upload names into blobs and point the
+    FileFields at them. Files left in the upload directories that nothing
+    references are counted, and removed with delete_orphans.
+    Returns {'files', 'blobs', 'freed', 'orphans', 'orphaned'}.
+    """
+    from .images import VARIANT_FIELDS, schedule_variants, variant_names
+
+    referencing = {}
+    for model, field in blob_fields():
+        names = (
+            model._base_manager.exclude(**{field.attname: ''}).exclude(**{f'{field.attname}__isnull': True})
+            .exclude(**{f'{field.attname}__startswith': f'{BLOB_DIR}/'})
+            .values_list(field.attname, flat=True).distinct()
+        )
+        for name in names:
+            if field.storage.deduplicates(name):
+                referencing.setdefault(name, []).append((model, field))
+
+    result = {'files': 0, 'blobs': set(), 'freed': 0, 'orphans': 0, 'orphaned': 0}
+    for name, fields in referencing.items():
+        storage = fields[0][1].storage
+        if not storage.exists(name):
+            continue
+        size = storage.size(name)
+        with storage.open(name) as source:
+            new_name = blob_name(hashlib.file_digest(source, 'sha256').hexdigest(), name)
+        duplicate = new_name in result['blobs'] or storage.exists(new_name)
+        if not dry_run:
+            with storage.open(name) as source:
+                storage.save(name, source)
+            with transaction.atomic():
+                for model, field in fields:
+                    model._base_manager.filter(**{field.attname: name}).update(**{field.attname: new_name})
+            for old in [name, *variant_names(name)]:
+                if storage.exists(old):
+                    os.remove(storage.path(old))
+            for model, field in fields:
+                if (model._meta.label, field.name) in VARIANT_FIELDS:
+                    schedule_variants(model._meta.label, field.name, new_name)
+
+        result['freed'] += size if duplicate else 0
+        result['files'] += 1
+        result['blobs'].add(new_name)
+
+    # Whatever is still in the upload directories is referenced by nothing (or, in a dry run, about to move)
+    moving = {path for name in referencing for path in [name, *variant_names(name)]} if dry_run else set()
+    for prefix in default_storage.prefixes:
+        for directory, _, files in os.walk(default_storage.path(prefix)):
+            for file in files:
+                path = os.path.join(directory, file)
+                if os.path.relpath(path, default_storage.location).replace(os.sep, '/') in moving:
+                    continue
+                result['orphans'] += 1
+                result['orphaned'] += os.path.getsize(path)
+                if delete_orphans and not dry_run:
+                    os.remove(path)
+
+    if not dry_run:
+        # One reference was added per file moved, not per row
+        recount_blobs()
+    result['blobs'] = len(result['blobs'])
+    return result
@@ -0,0 +1,248 @@
+# core/taskqueue.py
+
+"""
+A small database-backed task queue for work that should not hold up a
+request: image resizing, cascading deletes, emails.
+
+Functions decorated with @task are queued with .delay(*args, **kwargs),
+which inserts a Task row. The row is part of the caller's transaction, so
+a task queued by a view that later fails is never run, and one queued
+inside atomic() only becomes visible to the worker on commit. Arguments
+must be JSON serializable; pass primary keys, not model instances.
+
+`manage.py runworker` polls for due tasks and runs them on a thread or
+process pool. A worker claims a task with a conditional UPDATE
+(status queued -> running), so any number of workers can share the table
+without a broker or row locks. A task that raises is retried with
+exponential backoff until it has used max_attempts, then left as 'failed'
+for inspection in the admin. Successful tasks are deleted. Tasks whose
+worker died mid-run are handed out again after STALE_AFTER seconds.
+
+With settings.TASK_QUEUE_EAGER the call runs inline instead, unless it
+has a countdown, which is always queued. That is for tests only: in
+production it would put the work back in the request. The core.W002 and
+core.W003 checks (core/checks.py) warn when it is on or when queued
+tasks sit overdue because no worker is running.
+"""
+
+import functools
+import json
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import timedelta
+from django.conf import settings
+from django.db import connections
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+# Seconds before the first retry; doubled for every further attempt
+RETRY_BACKOFF = 10
+RETRY_BACKOFF_MAX = 60 * 60
+# Seconds a task may stay 'running' before it is assumed lost
+STALE_AFTER = 15 * 60
+HOUSEKEEPING_INTERVAL = 60
+
+_registry = {}
+
+
+class TaskFunction:
+    """A function registered with @task; calling it still runs it directly"""
+
+    def __init__(self, func, name, max_attempts, retry_backoff):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def delay(self, *args, **kwargs):
+        return self.enqueue(args, kwargs)
+
+    def enqueue(self, args=(), kwargs=None, countdown=0):
+        """Queue a call, to run no sooner than `countdown` seconds from now"""
+        from .models import Task
+
+        kwargs = kwargs or {}
+        # A countdown is part of what the task does (e.g. the notification outbox delay), so it is queued even then
+        if getattr(settings, 'TASK_QUEUE_EAGER', False) and countdown <= 0:
+            # Same JSON round trip as the queue, so eager tests catch unserializable arguments
+            args, kwargs = json.loads(json.dumps([list(args), kwargs]))
+            self.func(*args, **kwargs)
+            return None
+
+        return Task.objects.create(
+            name=self.name, args=list(args), kwargs=kwargs, max_attempts=self.max_attempts,
+            run_at=timezone.now() + timedelta(seconds=countdown),
+        )
+
+    def backoff(self, attempts):
+        """Seconds to wait before retrying after `attempts` failures, with jitter"""
+        delay = min(self.retry_backoff * 2 ** (attempts - 1), RETRY_BACKOFF_MAX)
+        return delay * random.uniform(0.75, 1.25)
+
+
+def task(func=None, *, name=None, max_attempts=MAX_ATTEMPTS, retry_backoff=RETRY_BACKOFF):
+    """Register a function as a task: `@task` or `@task(max_attempts=3)`"""
+    def decorate(func):
+        task_function = TaskFunction(func, name or f'{func.__module__}.{func.__qualname__}',
+                                     max_attempts, retry_backoff)
+        _registry[task_function.name] = task_function
+        return task_function
+
+    return decorate(func) if func is not None else decorate
+
+
+def autodiscover_tasks():
+    """Import every installed app's tasks module so its tasks are registered"""
+    autodiscover_modules('tasks')
+
+
+def claim_tasks(worker, limit, now=None):
+    """Mark up to `limit` due tasks as running for `worker`; returns their pks"""
+    from .models import Task
+
+    now = now or timezone.now()
+    candidates = (
+        Task.objects.filter(status='queued', run_at__lte=now)
+        .order_by('run_at', 'pk').values_list('pk', flat=True)[:limit * 2]
+    )
+    claimed = []
+    for pk in list(candidates):
+        # Only one worker's UPDATE can still see the task queued
+        if Task.objects.filter(pk=pk, status='queued').update(
+                status='running', locked_by=worker, locked_at=now, attempts=F('attempts') + 1):
+            claimed.append(pk)
+            if len(claimed) == limit:
+                break
+    return claimed
+
+
+def execute(pk):
+    """Run a claimed task and record the outcome"""
+    from .models import Task
+
+    task_row = Task.objects.filter(pk=pk, status='running').first()
+    if task_row is None:
+        return None
+    claim = Task.objects.filter(pk=pk, status='running', attempts=task_row.attempts)
+    task_function = _registry.get(task_row.name)
+
+    try:
+        if task_function is None:
+            raise LookupError(f'No task named {task_row.name!r} is registered')
+        task_function.func(*task_row.args, **task_row.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        if task_function is not None and task_row.attempts < task_row.max_attempts:
+            delay = task_function.backoff(task_row.attempts)
+            logger.warning('Task %s (%s) failed on attempt %d, retrying in %.0fs',
+                           task_row.pk, task_row.name, task_row.attempts, delay, exc_info=True)
+            claim.update(status='queued', run_at=timezone.now() + timedelta(seconds=delay),
+                         locked_by='', locked_at=None, last_error=error)
+            return 'retried'
+        logger.error('Task %s (%s) failed for good after %d attempt(s)',
+                     task_row.pk, task_row.name, task_row.attempts, exc_info=True)
+        claim.update(status='failed', locked_at=None, last_error=error)
+        return 'failed'
+
+    claim.delete()
+    return 'done'
+
+
+def _run_in_pool(pk):
+    try:
+        return execute(pk)
+    finally:
+        # Each pool thread/process has its own connection; don't leave it open between tasks
+        connections.close_all()
+
+
+def requeue_stale(stale_after=STALE_AFTER, now=None):
+    """Hand out again tasks whose worker stopped before finishing them"""
+    from .models import Task
+
+    now = now or timezone.now()
+    stale = Task.objects.filter(status='running', locked_at__lt=now - timedelta(seconds=stale_after))
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status='failed', locked_at=None, last_error='Worker stopped before the task finished')
+    requeued = stale.update(status='queued', run_at=now, locked_by='', locked_at=None)
+    return requeued, failed
+
+
+def _init_process(settings_module):
+    """Pool process initializer; needed when processes are spawned rather than forked"""
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    django.setup()
+    autodiscover_tasks()
+
+
+def _tally(counts, future):
+    try:
+        outcome = future.result()
+    except Exception:
+        # e.g. the database went away while recording the outcome; the task goes stale and is retried
+        logger.exception('Task worker error')
+        return
+    if outcome:
+        counts[outcome] += 1
+
+
+def run_worker(workers=4, pool='thread', poll_interval=1.0, burst=False, stale_after=STALE_AFTER, stop=None):
+    """
+    Claim and run tasks until `stop` is set, or until none are due if `burst`.
+    Returns a count per outcome.
+    """
+    autodiscover_tasks()
+    worker = f'{socket.gethostname()}:{os.getpid()}'
+    stop = stop or threading.Event()
+    counts = {'done': 0, 'retried': 0, 'failed': 0}
+
+    if pool == 'process':
+        # Children must not share the parent's database connections
+        connections.close_all()
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_process,
+                                       initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', ''),))
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='task-worker')
+
+    running = set()
+    last_housekeeping = None
+    try:
+        while not stop.is_set():
+            if last_housekeeping is None or time.monotonic() - last_housekeeping >= HOUSEKEEPING_INTERVAL:
+                requeue_stale(stale_after)
+                last_housekeeping = time.monotonic()
+
+            claimed = claim_tasks(worker, workers - len(running)) if len(running) < workers else []
+            running.update(executor.submit(_run_in_pool, pk) for pk in claimed)
+
+            if burst and not claimed and not running:
+                break
+            if running and (not claimed or len(running) >= workers):
+                finished, running = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    _tally(counts, future)
+            elif not claimed:
+                stop.wait(poll_interval)
+    finally:
+        # Let tasks already running finish; their rows are updated as they complete
+        for future in wait(running).done:
+            _tally(counts, future)
+        executor.shutdown()
+        connections.close_all()
+    return counts
@@ -0,0 +1,27 @@
+# core/tasks.py
+
+import logging
+from django.apps import apps
+from PIL import Image
+from .images import generate_variants
+from .taskqueue import task
+
+logger = logging.getLogger(__name__)
+
+
+@task(max_attempts=3)
+def generate_image_variants(model_label, field_name, name):
+    """Resize one stored image (see core/images.py)"""
+    storage = apps.get_model(model_label)._meta.get_field(field_name).storage
+    try:
+        generate_variants(storage, name)
+    except (OSError, Image.DecompressionBombError):
+        # Missing or unreadable file: retrying will not help
+        logger.warning('Could not generate image variants for %s', name, exc_info=True)
+
+
+@task
+def send_notifications():
+    """Deliver the email outbox (see core/notifications.py)"""
+    from .notifications import deliver_notifications
+    deliver_notifications()
@@ -0,0 +1,58 @@
+# core/templatetags/images.py
+
+from django import template
+from django.utils.html import format_html, format_html_join
+from core.images import VARIANT_WIDTHS, variant_manifest, variant_name
+
+register = template.Library()
+
+# Layout width each size is shown at, for the browser to pick a candidate
+DEFAULT_SIZES = {
+    'thumb': '120px',
+    'card': '(max-width: 768px) 100vw, 400px',
+    'hero': '100vw',
+}
+
+
+def _srcset(image, manifest, image_format):
+    """'url 240w, url 640w, ...', skipping repeats of the same width from small originals"""
+    candidates = {}
+    for variant, width in sorted(manifest.items(), key=lambda item: item[1]):
+        candidates.setdefault(width, variant)
+    return ', '.join(
+        f'{image.storage.url(variant_name(image.name, variant, image_format))} {width}w'
+        for width, variant in candidates.items()
+    )
+
+
+@register.simple_tag
+def responsive_image(image, size='card', sizes=None, **attrs):
+    """
+    <picture> with WebP and JPEG srcsets for an ImageField value.
+
+    `size` is the variant used as the plain src; extra keyword arguments
+    become <img> attributes (alt, class, ...). Images are lazy-loaded
+    unless loading= says otherwise. Falls back to the original file while
+    its variants are still being generated.
+    """
+    if not image:
+        return ''
+
+    attrs.setdefault('alt', '')
+    attrs.setdefault('loading', 'lazy')
+    attrs.setdefault('decoding', 'async')
+    extra = format_html_join(' ', '{}="{}"', sorted(attrs.items()))
+
+    manifest = variant_manifest(image)
+    if manifest is None:
+        return format_html('<img src="{}" {}>', image.url, extra)
+
+    sizes = sizes or DEFAULT_SIZES.get(size, DEFAULT_SIZES['card'])
+    src = image.storage.url(variant_name(image.name, size if size in VARIANT_WIDTHS else 'card', 'jpeg'))
+    return format_html(
+        '<picture style="display: contents">'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" {}>'
+        '</picture>',
+        _srcset(image, manifest, 'webp'), sizes, src, _srcset(image, manifest, 'jpeg'), sizes, extra,
+    )
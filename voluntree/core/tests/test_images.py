@@ -0,0 +1,133 @@
+# core/tests/test_images.py
+
+import io
+import os
+import shutil
+import tempfile
+from io import StringIO
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+from accounts.models import User, NGO
+from events.models import Event
+from ..models import Blob, Task
+from ..images import generate_variants, variant_manifest, variant_name, variant_names
+
+
+def _png(width, height, mode='RGBA'):
+    buffer = io.BytesIO()
+    Image.new(mode, (width, height), (200, 50, 50, 128) if mode == 'RGBA' else (200, 50, 50)).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class ImageVariantTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root)
+        self.override.enable()
+        cache.clear()
+
+        ngo_user = User.objects.create_user(username='imgngo', password='password', user_type='ngo',
+                                            email='imgngo@test.com')
+        self.ngo = NGO.objects.create(user=ngo_user, organization_name='Image NGO', registration_number='I-1')
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _event_with_image(self, width=2000, height=1000):
+        event = Event(ngo=self.ngo, title='Image Event', description='...', location='Dhaka',
+                      date=timezone.now(), max_volunteers=5)
+        event.image.save('banner.png', ContentFile(_png(width, height)), save=False)
+        event.save()
+        return event
+
+    def _render(self, event):
+        return Template("{% load images %}{% responsive_image event.image 'card' alt=event.title class='event-image' %}") \
+            .render(Context({'event': event}))
+
+    def test_generates_every_variant_without_upscaling(self):
+        event = self._event_with_image()
+        widths = generate_variants(default_storage, event.image.name)
+
+        self.assertEqual(widths, {'hero': 1600, 'card': 640, 'thumb': 240})
+        self.assertTrue(all(default_storage.exists(name) for name in variant_names(event.image.name)))
+        with default_storage.open(variant_name(event.image.name, 'card', 'jpeg')) as jpeg:
+            self.assertEqual(Image.open(jpeg).size, (640, 320))
+        with default_storage.open(variant_name(event.image.name, 'thumb', 'webp')) as webp:
+            self.assertEqual(Image.open(webp).mode, 'RGBA')
+
+        small = self._event_with_image(width=100, height=100)
+        self.assertEqual(generate_variants(default_storage, small.image.name),
+                         {'hero': 100, 'card': 100, 'thumb': 100})
+
+    def test_variants_of_files_stored_before_blobs_keep_their_names(self):
+        os.makedirs(os.path.join(self.media_root, 'events'))
+        with open(os.path.join(self.media_root, 'events', 'legacy.png'), 'wb') as legacy:
+            legacy.write(_png(800, 400))
+        event = self._event_with_image()
+        Event.objects.filter(pk=event.pk).update(image='events/legacy.png')
+        event.refresh_from_db()
+        blobs = list(Blob.objects.values_list('name', 'refs'))
+
+        generate_variants(default_storage, 'events/legacy.png')
+        self.assertTrue(all(default_storage.exists(name) for name in variant_names('events/legacy.png')))
+        self.assertEqual(list(Blob.objects.values_list('name', 'refs')), blobs)
+        self.assertIn(default_storage.url('events/legacy.card.webp'), self._render(event))
+
+        # Regenerating overwrites them in place
+        generate_variants(default_storage, 'events/legacy.png')
+        self.assertEqual(sorted(os.listdir(os.path.join(self.media_root, 'events'))),
+                         sorted(['legacy.png', *(os.path.basename(name) for name in variant_names('legacy.png'))]))
+
+    def test_tag_falls_back_until_variants_exist(self):
+        event = self._event_with_image()
+        html = self._render(event)
+        self.assertIn(f'src="{event.image.url}"', html)
+        self.assertIn('loading="lazy"', html)
+
+        generate_variants(default_storage, event.image.name)
+        html = self._render(event)
+        self.assertIn('<source type="image/webp"', html)
+        self.assertIn(f"{default_storage.url(variant_name(event.image.name, 'thumb', 'webp'))} 240w", html)
+        self.assertIn(f'src="{default_storage.url(variant_name(event.image.name, "card", "jpeg"))}"', html)
+        self.assertIn('class="event-image"', html)
+
+    def test_manifest_rebuilt_from_storage(self):
+        event = self._event_with_image()
+        generate_variants(default_storage, event.image.name)
+        cache.clear()
+        self.assertEqual(variant_manifest(event.image), {'hero': 1600, 'card': 640, 'thumb': 240})
+
+    def test_saving_a_new_image_queues_generation(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            event = self._event_with_image()
+        variant_tasks = Task.objects.filter(name='core.tasks.generate_image_variants')
+        # Nothing is queued until the save commits
+        self.assertFalse(variant_tasks.exists())
+        for callback in callbacks:
+            callback()
+        self.assertEqual(list(variant_tasks.values_list('args', flat=True)),
+                         [['events.Event', 'image', event.image.name]])
+
+        with override_settings(TASK_QUEUE_EAGER=True), self.captureOnCommitCallbacks(execute=True):
+            self.ngo.logo.save('logo.png', ContentFile(_png(300, 300, mode='RGB')))
+        self.assertEqual(variant_manifest(self.ngo.logo), {'hero': 300, 'card': 300, 'thumb': 240})
+
+    def test_backfill_command(self):
+        self.ngo.logo.save('logo.png', ContentFile(_png(300, 300, mode='RGB')))
+
+        out = StringIO()
+        call_command('generate_image_variants', '--workers', '1', stdout=out)
+        self.assertIn('Generated variants for 1 image(s)', out.getvalue())
+        self.assertTrue(default_storage.exists(variant_name(self.ngo.logo.name, 'thumb', 'webp')))
+
+        out = StringIO()
+        call_command('generate_image_variants', stdout=out)
+        self.assertIn('0 image(s), 1 already up to date', out.getvalue())
@@ -0,0 +1,135 @@
+# core/tests/test_notifications.py
+
+import smtplib
+from datetime import timedelta
+from unittest import mock
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from accounts.models import User, NGO
+from admin_panel.models import PlatformSettings
+from events.models import Event, EventRegistration
+from events.tasks import notify_event_updated
+from ..models import Notification, Task
+from ..notifications import deliver_notifications, queue_notifications
+
+
+class NotificationTests(TestCase):
+
+    def setUp(self):
+        ngo_user = User.objects.create_user(username='mailngo', password='password', user_type='ngo',
+                                            email='mailngo@test.com')
+        self.ngo = NGO.objects.create(user=ngo_user, organization_name='Mail NGO', registration_number='M-1')
+        self.event = Event.objects.create(
+            ngo=self.ngo, title='Mail Event', description='...', location='Dhaka',
+            date=timezone.now() + timedelta(days=3), max_volunteers=5
+        )
+        self.volunteers = [
+            User.objects.create_user(username=f'mailvol{index}', password='password',
+                                     user_type='volunteer', email=f'mailvol{index}@test.com')
+            for index in range(3)
+        ]
+
+    def _notification(self, user, subject, dedupe_key=''):
+        return Notification(user=user, subject=subject, body=f'{subject} body', dedupe_key=dedupe_key)
+
+    def test_pending_news_is_coalesced_per_recipient(self):
+        first, second = self.volunteers[:2]
+        queue_notifications([
+            self._notification(first, 'One'), self._notification(first, 'Two'), self._notification(second, 'Three'),
+        ])
+        self.assertEqual(Task.objects.filter(name='core.tasks.send_notifications').count(), 1)
+
+        self.assertEqual(deliver_notifications(), 2)
+        digest = next(message for message in mail.outbox if message.to == [first.email])
+        self.assertEqual(digest.subject, '2 updates from Voluntree')
+        self.assertIn('One body', digest.body)
+        self.assertIn('Two body', digest.body)
+        self.assertFalse(Notification.objects.exclude(status='sent').exists())
+
+    def test_batches_share_one_connection(self):
+        queue_notifications(self._notification(volunteer, 'Hello') for volunteer in self.volunteers)
+        with mock.patch.object(EmailBackend, 'open', autospec=True, side_effect=EmailBackend.open) as opened:
+            self.assertEqual(deliver_notifications(batch_size=1), 3)
+        self.assertEqual(opened.call_count, 1)
+
+    def test_duplicates_are_dropped_while_pending(self):
+        volunteer = self.volunteers[0]
+        queue_notifications([self._notification(volunteer, 'Hi', dedupe_key='news')])
+        queue_notifications([self._notification(volunteer, 'Hi', dedupe_key='news')])
+        self.assertEqual(Notification.objects.count(), 1)
+
+        deliver_notifications()
+        queue_notifications([self._notification(volunteer, 'Hi again', dedupe_key='news')])
+        self.assertEqual(Notification.objects.filter(status='pending').count(), 1)
+
+    def test_connection_failure_keeps_the_outbox(self):
+        queue_notifications(self._notification(volunteer, 'Hello') for volunteer in self.volunteers)
+        with mock.patch.object(EmailBackend, 'send_messages', side_effect=smtplib.SMTPServerDisconnected):
+            with self.assertRaises(smtplib.SMTPServerDisconnected):
+                deliver_notifications()
+        self.assertEqual(Notification.objects.filter(status='pending').count(), 3)
+
+        self.assertEqual(deliver_notifications(), 3)
+
+    @override_settings(TASK_QUEUE_EAGER=True)
+    def test_registration_decisions_are_emailed(self):
+        registration = EventRegistration.objects.create(event=self.event, volunteer=self.volunteers[0])
+        with self.captureOnCommitCallbacks(execute=True):
+            registration.change_status('approved')
+
+        # Even eager, delivery waits out the outbox delay on the queue
+        self.assertEqual(mail.outbox, [])
+        self.assertGreater(Task.objects.get(name='core.tasks.send_notifications').run_at, timezone.now())
+        deliver_notifications()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['mailvol0@test.com'])
+        self.assertEqual(mail.outbox[0].subject, 'You are confirmed for Mail Event')
+        self.assertIn('Dhaka', mail.outbox[0].body)
+
+    @override_settings(TASK_QUEUE_EAGER=True)
+    def test_quick_decisions_are_coalesced_into_one_email(self):
+        registration = EventRegistration.objects.create(event=self.event, volunteer=self.volunteers[0])
+        with self.captureOnCommitCallbacks(execute=True):
+            registration.change_status('approved')
+        with self.captureOnCommitCallbacks(execute=True):
+            registration.change_status('rejected')
+
+        self.assertEqual(Task.objects.filter(name='core.tasks.send_notifications').count(), 1)
+        self.assertEqual(deliver_notifications(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, 'Your registration for Mail Event')
+
+    @override_settings(TASK_QUEUE_EAGER=True)
+    def test_mail_errors_do_not_fail_the_decision(self):
+        registration = EventRegistration.objects.create(event=self.event, volunteer=self.volunteers[0])
+        with mock.patch('events.tasks.queue_notifications', side_effect=smtplib.SMTPServerDisconnected), \
+                self.assertLogs('django.test', 'ERROR'):
+            with self.captureOnCommitCallbacks(execute=True):
+                registration.change_status('approved')
+        registration.refresh_from_db()
+        self.assertEqual(registration.status, 'approved')
+
+    @override_settings(TASK_QUEUE_EAGER=True)
+    def test_platform_settings_switch_emails_off(self):
+        platform = PlatformSettings.load()
+        platform.send_approval_emails = False
+        platform.save()
+
+        registration = EventRegistration.objects.create(event=self.event, volunteer=self.volunteers[0])
+        with self.captureOnCommitCallbacks(execute=True):
+            registration.change_status('rejected')
+        self.assertEqual(mail.outbox, [])
+
+    def test_event_updates_replace_the_pending_notice(self):
+        for volunteer in self.volunteers[:2]:
+            EventRegistration.objects.create(event=self.event, volunteer=volunteer)
+
+        notify_event_updated(self.event.pk)
+        Event.objects.filter(pk=self.event.pk).update(location='Chittagong')
+        notify_event_updated(self.event.pk)
+
+        pending = Notification.objects.filter(status='pending')
+        self.assertEqual(pending.count(), 2)
+        self.assertTrue(all('Chittagong' in notification.body for notification in pending))
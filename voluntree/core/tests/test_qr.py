@@ -0,0 +1,59 @@
+# core/tests/test_qr.py
+
+import io
+from django.test import SimpleTestCase
+from PIL import Image
+from ..qr import _error_correction, qr_matrix, qr_png
+
+# Format information of error correction level M with masks 0..7 (ISO/IEC 18004, Annex C)
+LEVEL_M_FORMATS = {
+    0b101010000010010, 0b101000100100101, 0b101111001111100, 0b101101101001011,
+    0b100010111111001, 0b100000011001110, 0b100111110010111, 0b100101010100000,
+}
+
+
+class QRCodeTests(SimpleTestCase):
+
+    def _format_bits(self, modules):
+        """Both copies of the 15 format bits, most significant first"""
+        size = len(modules)
+        first = [modules[index][8] for index in (0, 1, 2, 3, 4, 5, 7, 8)] + [modules[8][7]]
+        first += [modules[8][14 - index] for index in range(9, 15)]
+        second = [modules[8][size - 1 - index] for index in range(8)]
+        second += [modules[size - 15 + index][8] for index in range(8, 15)]
+        return [sum(bit << index for index, bit in enumerate(bits)) for bits in (first, second)]
+
+    def test_error_correction_matches_the_reference_example(self):
+        # 'HELLO WORLD' as version 1-M (data codewords, then the EC codewords the standard lists)
+        data = [32, 91, 11, 120, 209, 114, 220, 77, 67, 64, 236, 17, 236, 17, 236, 17]
+        self.assertEqual(_error_correction(data, 10), [196, 35, 39, 119, 235, 215, 231, 226, 93, 23])
+
+    def test_smallest_version_that_fits(self):
+        self.assertEqual(len(qr_matrix('x' * 14)), 21)
+        self.assertEqual(len(qr_matrix('x' * 15)), 25)
+        self.assertEqual(len(qr_matrix('x' * 213)), 57)
+        with self.assertRaises(ValueError):
+            qr_matrix('x' * 214)
+
+    def test_function_patterns(self):
+        url = 'https://voluntree.example.org/certificates/verify/ABCDEFGHJKMN/' + 's' * 43 + '/'
+        modules = qr_matrix(url)
+        size = len(modules)
+        self.assertEqual(size, 45)  # version 7
+
+        finder = [[max(abs(x - 3), abs(y - 3)) != 2 for x in range(7)] for y in range(7)]
+        for top, left in [(0, 0), (0, size - 7), (size - 7, 0)]:
+            self.assertEqual([row[left:left + 7] for row in modules[top:top + 7]], finder)
+        self.assertEqual(modules[6][8:size - 8], [index % 2 == 0 for index in range(8, size - 8)])
+
+        first, second = self._format_bits(modules)
+        self.assertIn(first, LEVEL_M_FORMATS)
+        self.assertEqual(first, second)
+        version = sum(modules[index // 3][size - 11 + index % 3] << index for index in range(18))
+        self.assertEqual(version, 0b000111110010010100)
+
+    def test_png_has_a_quiet_zone(self):
+        image = Image.open(io.BytesIO(qr_png('hello', scale=2, border=4)))
+        self.assertEqual(image.size, ((21 + 8) * 2, (21 + 8) * 2))
+        self.assertEqual(image.getpixel((7, 7)), 255)
+        self.assertEqual(image.getpixel((8, 8)), 0)
@@ -0,0 +1,121 @@
+# core/tests/test_storage.py
+
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from accounts.models import User, NGO
+from certificates.models import Certificate
+from events.models import Event
+from ..images import _manifest_key, variant_name
+from ..models import Blob
+from ..storage import collect_blobs, dedupe_media, is_blob
+
+LOGO = b'\x89PNG same logo bytes'
+
+
+class ContentAddressedStorageTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root)
+        self.override.enable()
+        cache.clear()
+
+        ngo_user = User.objects.create_user(username='blobngo', password='password', user_type='ngo',
+                                            email='blobngo@test.com')
+        self.ngo = NGO.objects.create(user=ngo_user, organization_name='Blob NGO', registration_number='B-1')
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _event(self, title='Blob Event'):
+        return Event.objects.create(ngo=self.ngo, title=title, description='...', location='Dhaka',
+                                    date=timezone.now(), max_volunteers=5)
+
+    def _files(self):
+        return sorted(
+            os.path.relpath(os.path.join(directory, file), self.media_root)
+            for directory, _, files in os.walk(self.media_root) for file in files
+        )
+
+    def test_identical_uploads_share_one_blob(self):
+        self.ngo.logo.save('logo.png', ContentFile(LOGO))
+        event = self._event()
+        event.image.save('banner.PNG', ContentFile(LOGO))
+        self._event('Other').image.save('other.png', ContentFile(b'other bytes'))
+
+        self.assertEqual(event.image.name, self.ngo.logo.name)
+        self.assertTrue(is_blob(event.image.name))
+        self.assertTrue(event.image.name.endswith('.png'))
+        self.assertEqual(len(self._files()), 2)
+        self.assertEqual(Blob.objects.get(name=event.image.name).refs, 2)
+        with event.image.open('rb') as image:
+            self.assertEqual(image.read(), LOGO)
+
+    def test_large_uploads_are_hashed_on_disk_and_moved(self):
+        upload = TemporaryUploadedFile('big.pdf', 'application/pdf', 0, None)
+        for _ in range(64):
+            upload.write(b'x' * 65536)
+        upload.seek(0)
+        certificate = Certificate(event=self._event())
+        certificate.certificate_file.save('big.pdf', upload)
+
+        self.assertTrue(is_blob(certificate.certificate_file.name))
+        self.assertEqual(certificate.certificate_file.size, 64 * 65536)
+        self.assertFalse(os.path.exists(upload.temporary_file_path()))
+        upload.close()
+
+    def test_files_written_under_fixed_names_are_not_hashed(self):
+        name = default_storage.save('certificates/issued/1/2.pdf', ContentFile(b'%PDF'))
+        self.assertEqual(name, 'certificates/issued/1/2.pdf')
+        self.assertFalse(Blob.objects.exists())
+
+    def test_unreferenced_blobs_are_collected_after_the_grace_period(self):
+        event = self._event()
+        event.image.save('banner.png', ContentFile(LOGO))
+        name = event.image.name
+        default_storage.save(variant_name(name, 'card', 'webp'), ContentFile(b'webp'))
+        cache.set(_manifest_key(name), {'card': 640}, None)
+        self.ngo.logo.save('logo.png', ContentFile(LOGO))
+
+        # Still referenced by the logo
+        Event.objects.filter(pk=event.pk).delete()
+        self.assertEqual(collect_blobs(grace=timedelta(0))['deleted'], 0)
+        self.assertEqual(Blob.objects.get(name=name).refs, 1)
+
+        self.ngo.logo.delete()
+        self.assertEqual(Blob.objects.get(name=name).refs, 0)
+        self.assertEqual(collect_blobs()['deleted'], 0)
+
+        result = collect_blobs(now=timezone.now() + timedelta(days=2))
+        self.assertEqual(result['deleted'], 1)
+        self.assertEqual(result['freed'], len(LOGO) + 4)
+        self.assertEqual(self._files(), [])
+        self.assertIsNone(cache.get(_manifest_key(name)))
+
+    def test_existing_media_is_moved_into_blobs(self):
+        for directory in ('events', 'profiles/ngos'):
+            os.makedirs(os.path.join(self.media_root, directory))
+        for name in ('events/a.png', 'profiles/ngos/b.png', 'events/orphan.png'):
+            with open(os.path.join(self.media_root, name), 'wb') as legacy:
+                legacy.write(LOGO)
+        Event.objects.filter(pk=self._event().pk).update(image='events/a.png')
+        NGO.objects.filter(pk=self.ngo.pk).update(logo='profiles/ngos/b.png')
+
+        self.assertEqual(dedupe_media(dry_run=True)['freed'], len(LOGO))
+        result = dedupe_media(delete_orphans=True)
+
+        self.assertEqual((result['files'], result['blobs'], result['orphans']), (2, 1, 1))
+        self.ngo.refresh_from_db()
+        self.assertTrue(is_blob(self.ngo.logo.name))
+        self.assertEqual(Event.objects.get().image.name, self.ngo.logo.name)
+        self.assertEqual(Blob.objects.get().refs, 2)
+        self.assertEqual(self._files(), [self.ngo.logo.name])
@@ -0,0 +1,124 @@
+# core/tests/test_tasks.py
+
+from datetime import timedelta
+from io import StringIO
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from ..checks import check_task_queue_eager, check_task_worker
+from ..models import Task
+from ..taskqueue import claim_tasks, execute, requeue_stale, task
+
+calls = []
+
+
+@task
+def record(value):
+    calls.append(value)
+
+
+@task(max_attempts=2, retry_backoff=30)
+def flaky():
+    calls.append('flaky')
+    raise RuntimeError('try again')
+
+
+class TaskQueueTests(TestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def test_delay_queues_and_worker_runs_once(self):
+        queued = record.delay('a')
+        self.assertEqual((queued.name, queued.args, queued.status), ('core.tests.test_tasks.record', ['a'], 'queued'))
+        self.assertEqual(calls, [])
+
+        claimed = claim_tasks('worker-1', 10)
+        self.assertEqual(claimed, [queued.pk])
+        # Another worker cannot claim it again
+        self.assertEqual(claim_tasks('worker-2', 10), [])
+
+        self.assertEqual(execute(queued.pk), 'done')
+        self.assertEqual(calls, ['a'])
+        self.assertFalse(Task.objects.exists())
+
+    def test_countdown_delays_the_task(self):
+        record.enqueue(['later'], countdown=60)
+        self.assertEqual(claim_tasks('worker', 10), [])
+        self.assertEqual(len(claim_tasks('worker', 10, now=timezone.now() + timedelta(seconds=61))), 1)
+
+    def test_failures_back_off_then_fail(self):
+        queued = flaky.delay()
+
+        claim_tasks('worker', 1)
+        with self.assertLogs('core.taskqueue', 'WARNING'):
+            self.assertEqual(execute(queued.pk), 'retried')
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ('queued', 1))
+        self.assertIn('RuntimeError: try again', queued.last_error)
+        # 30s backoff with +-25% jitter
+        self.assertGreater(queued.run_at, timezone.now() + timedelta(seconds=20))
+        self.assertEqual(claim_tasks('worker', 1), [])
+
+        claim_tasks('worker', 1, now=queued.run_at)
+        with self.assertLogs('core.taskqueue', 'ERROR'):
+            self.assertEqual(execute(queued.pk), 'failed')
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ('failed', 2))
+        self.assertEqual(calls, ['flaky', 'flaky'])
+
+    def test_unknown_task_fails_without_retry(self):
+        queued = Task.objects.create(name='core.tests.test_tasks.removed')
+        claim_tasks('worker', 1)
+        with self.assertLogs('core.taskqueue', 'ERROR'):
+            self.assertEqual(execute(queued.pk), 'failed')
+
+    def test_stale_tasks_are_requeued(self):
+        queued = record.delay('lost')
+        claim_tasks('dead-worker', 1)
+        self.assertEqual(requeue_stale(stale_after=60), (0, 0))
+        self.assertEqual(requeue_stale(stale_after=60, now=timezone.now() + timedelta(hours=1)), (1, 0))
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.locked_by), ('queued', ''))
+
+    @override_settings(TASK_QUEUE_EAGER=True)
+    def test_eager_mode_runs_inline(self):
+        self.assertIsNone(record.delay('now'))
+        self.assertEqual(calls, ['now'])
+        self.assertFalse(Task.objects.exists())
+        with self.assertRaises(TypeError):
+            record.delay(object())
+
+    def test_default_settings_queue_for_a_worker(self):
+        self.assertFalse(settings.TASK_QUEUE_EAGER)
+        self.assertIsInstance(record.delay('queued'), Task)
+        self.assertEqual(calls, [])
+
+    def test_checks_warn_about_eager_mode_and_a_missing_worker(self):
+        self.assertEqual(check_task_queue_eager(None), [])
+        with override_settings(TASK_QUEUE_EAGER=True):
+            self.assertEqual([warning.id for warning in check_task_queue_eager(None)], ['core.W002'])
+
+        record.delay('waiting')
+        self.assertEqual(check_task_worker(None, databases=['default']), [])
+        Task.objects.update(run_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual([warning.id for warning in check_task_worker(None, databases=['default'])], ['core.W003'])
+        # Only with `check --database`
+        self.assertEqual(check_task_worker(None), [])
+
+
+class RunWorkerTests(TransactionTestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def test_burst_worker_drains_the_queue(self):
+        for value in range(5):
+            record.delay(value)
+
+        out = StringIO()
+        call_command('runworker', '--burst', '--workers', '2', stdout=out)
+        self.assertIn('5 task(s) done, 0 retried, 0 failed.', out.getvalue())
+        self.assertEqual(sorted(calls), [0, 1, 2, 3, 4])
+        self.assertFalse(Task.objects.exists())
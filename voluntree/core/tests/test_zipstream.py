@@ -0,0 +1,63 @@
+# core/tests/test_zipstream.py
+
+import io
+import os
+import shutil
+import tempfile
+import zipfile
+from django.core.files.storage import FileSystemStorage
+from django.test import SimpleTestCase
+from ..zipstream import CHUNK_SIZE, ZipEntry, ZipStream
+
+
+class ZipStreamTests(SimpleTestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.storage = FileSystemStorage(location=self.root)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _entry(self, arcname, data, name=None):
+        name = name or arcname
+        with open(os.path.join(self.root, name), 'wb') as file:
+            file.write(data)
+        return ZipEntry(arcname, self.storage, name, len(data), self.storage.get_modified_time(name))
+
+    def test_archive_matches_its_precomputed_size_and_unzips(self):
+        entries = [self._entry('a.pdf', b'%PDF' * 50000), self._entry('ü/b.png', b'', name='b.png'), self._entry('c.txt', b'c')]
+        archive = ZipStream(entries)
+        data = b''.join(archive.stream())
+
+        self.assertEqual(len(data), archive.size)
+        with zipfile.ZipFile(io.BytesIO(data)) as unzipped:
+            self.assertIsNone(unzipped.testzip())
+            self.assertEqual(unzipped.namelist(), ['a.pdf', 'ü/b.png', 'c.txt'])
+            self.assertEqual(unzipped.read('a.pdf'), b'%PDF' * 50000)
+
+    def test_any_range_is_the_same_bytes_as_the_whole(self):
+        entries = [self._entry(f'{index}.bin', os.urandom(index * 7919)) for index in range(6)]
+        whole = b''.join(ZipStream(entries).stream())
+
+        for start, end in [(0, 0), (10, 29), (30, 200000), (len(whole) - 22, len(whole) - 1), (5000, 5000)]:
+            self.assertEqual(b''.join(ZipStream(entries).stream(start, end)), whole[start:end + 1])
+
+    def test_chunks_stay_small_however_many_files(self):
+        entry = self._entry('shared.pdf', os.urandom(3 * CHUNK_SIZE))
+        entries = [entry._replace(arcname=f'{index}.pdf') for index in range(2000)]
+
+        largest = max(len(chunk) for chunk in ZipStream(entries).stream())
+        self.assertLessEqual(largest, CHUNK_SIZE)
+
+    def test_zip64_records_are_readable(self):
+        entries = [self._entry('a.txt', b'a' * 100), self._entry('b.txt', b'b')]
+        archive = ZipStream(entries)
+        # Lay out the end records as if the archive were past 4 GiB
+        archive.zip64 = True
+        archive.size += 76
+        data = b''.join(archive.stream())
+
+        self.assertEqual(len(data), archive.size)
+        with zipfile.ZipFile(io.BytesIO(data)) as unzipped:
+            self.assertEqual(unzipped.read('a.txt'), b'a' * 100)
@@ -0,0 +1,236 @@
+# core/zipstream.py
+
+"""
+Streaming ZIP downloads of stored files, with HTTP Range support.
+
+zipfile can write to a non-seekable stream (events/exports.py does for
+XLSX), but then its layout is only known once it is written. Here the
+archive is laid out up front instead: entries are stored, not deflated
+(certificates are PDFs and images, already compressed), so every
+header's size and every file's offset follows from the names and file
+sizes. That gives the response a Content-Length, and lets a Range
+request start at any byte by seeking into the file it falls in.
+
+Each file's CRC-32 goes in its local header, so it is read twice: once
+for the checksum, then again to be sent. No data descriptors are used,
+which any unzip tool can read. Only one chunk of one file is in memory
+at a time, however many files the archive holds. ZIP64 records are
+added once offsets pass 4 GiB or there are more than 65,535 entries.
+"""
+
+import hashlib
+import re
+import struct
+import zlib
+from datetime import datetime
+from typing import Any, NamedTuple
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+CHUNK_SIZE = 64 * 1024
+ZIP32_LIMIT = 0xFFFFFFFF
+ZIP32_MAX_ENTRIES = 0xFFFF
+
+LOCAL_HEADER = struct.Struct('<IHHHHHIIIHH')
+CENTRAL_HEADER = struct.Struct('<IHHHHHHIIIHHHHHII')
+ZIP64_OFFSET_EXTRA = struct.Struct('<HHQ')
+ZIP64_END = struct.Struct('<IQHHIIQQQQ')
+ZIP64_LOCATOR = struct.Struct('<IIQI')
+END = struct.Struct('<IHHHHIIH')
+
+UTF8_NAMES = 0x0800
+FILE_ATTRIBUTES = 0o100644 << 16
+
+RANGE_HEADER = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class ZipEntry(NamedTuple):
+    """A stored file to add to an archive as `arcname`"""
+    arcname: str
+    storage: Any
+    name: str
+    size: int
+    modified: datetime
+
+
+def storage_entry(arcname, field_file):
+    """ZipEntry for a FieldFile, with its size and time from storage"""
+    storage, name = field_file.storage, field_file.name
+    return ZipEntry(arcname, storage, name, storage.size(name), storage.get_modified_time(name))
+
+
+def _dos_datetime(moment):
+    if timezone.is_aware(moment):
+        moment = timezone.localtime(moment)
+    moment = min(max(moment.replace(tzinfo=None), datetime(1980, 1, 1)), datetime(2107, 12, 31, 23, 59, 58))
+    return (
+        moment.hour << 11 | moment.minute << 5 | moment.second // 2,
+        (moment.year - 1980) << 9 | moment.month << 5 | moment.day,
+    )
+
+
+class ZipStream:
+    """A stored-only ZIP archive of `entries`, streamed from any byte offset"""
+
+    def __init__(self, entries):
+        self.entries = list(entries)
+        self._names = [entry.arcname.encode('utf-8') for entry in self.entries]
+        self._crcs = {}
+
+        self.offsets = []
+        position = 0
+        for name, entry in zip(self._names, self.entries):
+            if entry.size > ZIP32_LIMIT:
+                raise ValueError(f'{entry.arcname} is too large to store')
+            self.offsets.append(position)
+            position += LOCAL_HEADER.size + len(name) + entry.size
+
+        self.directory_offset = position
+        self.directory_size = sum(self._central_size(index) for index in range(len(self.entries)))
+        self.zip64 = (
+            len(self.entries) > ZIP32_MAX_ENTRIES
+            or self.directory_offset > ZIP32_LIMIT or self.directory_size > ZIP32_LIMIT
+        )
+        self.size = (
+            self.directory_offset + self.directory_size
+            + (ZIP64_END.size + ZIP64_LOCATOR.size if self.zip64 else 0) + END.size
+        )
+
+    @property
+    def etag(self):
+        """Strong ETag: identical entries give a byte-identical archive"""
+        digest = hashlib.sha256()
+        for entry in self.entries:
+            digest.update(f'{entry.arcname}\0{entry.name}\0{entry.size}\0{entry.modified.isoformat()}\n'.encode())
+        return f'"{digest.hexdigest()[:32]}"'
+
+    def _central_size(self, index):
+        extra = ZIP64_OFFSET_EXTRA.size if self.offsets[index] > ZIP32_LIMIT else 0
+        return CENTRAL_HEADER.size + len(self._names[index]) + extra
+
+    def _crc(self, index):
+        if index not in self._crcs:
+            crc = 0
+            for chunk in self._read(index, 0, self.entries[index].size):
+                crc = zlib.crc32(chunk, crc)
+            self._crcs[index] = crc
+        return self._crcs[index]
+
+    def _read(self, index, start, length):
+        entry = self.entries[index]
+        with entry.storage.open(entry.name, 'rb') as source:
+            source.seek(start)
+            while length > 0:
+                chunk = source.read(min(CHUNK_SIZE, length))
+                if not chunk:
+                    raise OSError(f'{entry.name} is shorter than when the archive was laid out')
+                length -= len(chunk)
+                yield chunk
+
+    def _local_header(self, index):
+        entry, name = self.entries[index], self._names[index]
+        time, date = _dos_datetime(entry.modified)
+        return LOCAL_HEADER.pack(
+            0x04034b50, 20, UTF8_NAMES, 0, time, date, self._crc(index), entry.size, entry.size, len(name), 0,
+        ) + name
+
+    def _central_header(self, index):
+        entry, name, offset = self.entries[index], self._names[index], self.offsets[index]
+        time, date = _dos_datetime(entry.modified)
+        extra = ZIP64_OFFSET_EXTRA.pack(1, 8, offset) if offset > ZIP32_LIMIT else b''
+        return CENTRAL_HEADER.pack(
+            0x02014b50, 45 if extra else 20, 45 if extra else 20, UTF8_NAMES, 0, time, date,
+            self._crc(index), entry.size, entry.size, len(name), len(extra), 0, 0, 0, FILE_ATTRIBUTES,
+            min(offset, ZIP32_LIMIT),
+        ) + name + extra
+
+    def _end(self):
+        count, end = len(self.entries), b''
+        if self.zip64:
+            zip64_offset = self.directory_offset + self.directory_size
+            end = (
+                ZIP64_END.pack(0x06064b50, ZIP64_END.size - 12, 45, 45, 0, 0, count, count,
+                               self.directory_size, self.directory_offset)
+                + ZIP64_LOCATOR.pack(0x07064b50, 0, zip64_offset, 1)
+            )
+        return end + END.pack(
+            0x06054b50, 0, 0, min(count, ZIP32_MAX_ENTRIES), min(count, ZIP32_MAX_ENTRIES),
+            min(self.directory_size, ZIP32_LIMIT), min(self.directory_offset, ZIP32_LIMIT), 0,
+        )
+
+    def _segments(self):
+        """(length, produce(start, length)) for every piece of the archive, in order"""
+        def piece(render):
+            return lambda start, length: iter([render()[start:start + length]])
+
+        for index, entry in enumerate(self.entries):
+            yield LOCAL_HEADER.size + len(self._names[index]), piece(lambda index=index: self._local_header(index))
+            yield entry.size, lambda start, length, index=index: self._read(index, start, length)
+        for index in range(len(self.entries)):
+            yield self._central_size(index), piece(lambda index=index: self._central_header(index))
+        yield self.size - self.directory_offset - self.directory_size, piece(self._end)
+
+    def stream(self, start=0, end=None):
+        """Yield bytes start..end (inclusive) of the archive"""
+        end = self.size - 1 if end is None else end
+        position = 0
+        for length, produce in self._segments():
+            if position > end:
+                break
+            if position + length > start and length:
+                offset = max(start - position, 0)
+                yield from produce(offset, min(position + length, end + 1) - position - offset)
+            position += length
+
+
+def _requested_range(request, archive, etag):
+    """(start, end) of a single satisfiable byte range, 'unsatisfiable', or None for the whole archive"""
+    header = request.headers.get('Range', '')
+    match = RANGE_HEADER.match(header.replace(' ', ''))
+    if not match or match.groups() == ('', ''):
+        return None
+    # A resumed download of an archive that has since changed starts over
+    if request.headers.get('If-Range', etag) != etag:
+        return None
+
+    first, last = match.groups()
+    if not first:
+        start, end = max(archive.size - int(last), 0), archive.size - 1
+    else:
+        start, end = int(first), min(int(last), archive.size - 1) if last else archive.size - 1
+    if start > end or start >= archive.size:
+        return 'unsatisfiable'
+    return start, end
+
+
+def zip_response(request, entries, filename):
+    """
+    Download `entries` as filename.zip, streamed, with Content-Length,
+    ETag and single-range (resume) support.
+    """
+    archive = ZipStream(entries)
+    etag = archive.etag
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    requested = _requested_range(request, archive, etag)
+    if requested == 'unsatisfiable':
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{archive.size}'
+        return response
+
+    start, end = requested or (0, archive.size - 1)
+    content = [] if request.method == 'HEAD' else archive.stream(start, end)
+    response = StreamingHttpResponse(content, content_type='application/zip', status=206 if requested else 200)
+    if requested:
+        response['Content-Range'] = f'bytes {start}-{end}/{archive.size}'
+    response['Content-Length'] = end - start + 1
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Content-Disposition'] = f'attachment; filename="{filename}.zip"'
+    # Let proxies pass the chunks through instead of buffering the whole file
+    response['X-Accel-Buffering'] = 'no'
+    patch_cache_control(response, private=True)
+    return response
@@ -8,17 +8,17 @@ class EventAdmin(admin.ModelAdmin):
                     'created_at']
     list_filter = ['status', 'date', 'created_at']
     search_fields = ['title', 'description', 'location', 'ngo__organization_name']
-    readonly_fields = ['created_at', 'updated_at']
+    readonly_fields = ['latitude', 'longitude', 'approved_count', 'pending_count', 'created_at', 'updated_at']
 
     fieldsets = (
         ('Event Information', {
             'fields': ('ngo', 'title', 'description', 'image')
         }),
         ('Event Details', {
-            'fields': ('date', 'location', 'required_skills', 'max_volunteers')
+            'fields': ('date', 'location', 'latitude', 'longitude', 'required_skills', 'max_volunteers')
         }),
         ('Status', {
-            'fields': ('status',)
+            'fields': ('status', 'approved_count', 'pending_count')
         }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
@@ -30,18 +30,19 @@ class EventAdmin(admin.ModelAdmin):
         return obj.get_registered_count()
 
     get_registered_count.short_description = 'Registered'
+    get_registered_count.admin_order_field = 'approved_count'
 
 
 @admin.register(EventRegistration)
 class EventRegistrationAdmin(admin.ModelAdmin):
-    list_display = ['volunteer', 'event', 'status', 'applied_at']
+    list_display = ['volunteer', 'event', 'status', 'waitlist_position', 'applied_at']
     list_filter = ['status', 'applied_at']
     search_fields = ['volunteer__username', 'event__title']
-    readonly_fields = ['applied_at', 'updated_at']
+    readonly_fields = ['waitlist_position', 'applied_at', 'updated_at']
 
     fieldsets = (
         ('Registration Details', {
-            'fields': ('event', 'volunteer', 'status')
+            'fields': ('event', 'volunteer', 'status', 'waitlist_position')
         }),
         ('Timestamps', {
             'fields': ('applied_at', 'updated_at'),
@@ -0,0 +1,262 @@
+# events/api.py
+
+"""
+Read-only JSON API (v1) for events and NGOs.
+
+Every resource declares its fields once: the columns each needs, and any
+annotation. `?fields=a,b` picks a subset, and only those columns are
+SELECTed (via only()) and only those annotations computed, so list pages
+cost a single query. Rows are turned into plain dicts in one pass and
+encoded with orjson when it is installed.
+
+Responses are public (no per-user data) and carry Cache-Control max-age
+plus a content ETag, so clients and proxies can reuse them.
+"""
+
+import json
+from functools import wraps
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Q, Sum
+from django.http import HttpResponse
+from django.middleware.http import ConditionalGetMiddleware
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.decorators import decorator_from_middleware
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import require_safe
+from accounts.models import NGO, split_comma_list
+from .filters import filter_public_events
+from .models import Event
+from .pagination import InvalidCursor, KeysetPaginator
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+API_PAGE_SIZE = 20
+API_MAX_PAGE_SIZE = 100
+MAX_AVAILABILITY_IDS = 100
+
+LIST_MAX_AGE = 60
+AVAILABILITY_MAX_AGE = 10
+
+
+def dumps(data):
+    """Encode to JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+
+
+class APIResponse(HttpResponse):
+
+    def __init__(self, data, status=200):
+        super().__init__(dumps(data), content_type='application/json', status=status)
+
+
+class APIError(Exception):
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def api_view(max_age):
+    """GET/HEAD only, publicly cacheable for max_age seconds, with a content ETag"""
+    content_etag = decorator_from_middleware(ConditionalGetMiddleware)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            try:
+                return view(request, *args, **kwargs)
+            except APIError as exc:
+                return APIResponse({'error': str(exc)}, status=exc.status)
+        return require_safe(content_etag(cache_control(public=True, max_age=max_age)(wrapper)))
+    return decorator
+
+
+class Field:
+    """A serialized field: the columns it reads, an optional annotation, and how to read it"""
+
+    def __init__(self, getter, columns=(), annotation=None):
+        self.getter = getter
+        self.columns = columns
+        self.annotation = annotation
+
+
+def _attr(name):
+    return Field(lambda obj, request: getattr(obj, name), columns=(name,))
+
+
+def _absolute(request, url):
+    return request.build_absolute_uri(url)
+
+
+EVENT_FIELDS = {
+    'id': Field(lambda event, request: event.pk, columns=('id',)),
+    'title': _attr('title'),
+    'description': _attr('description'),
+    'date': _attr('date'),
+    'location': _attr('location'),
+    'latitude': _attr('latitude'),
+    'longitude': _attr('longitude'),
+    'status': _attr('status'),
+    'skills': Field(lambda event, request: split_comma_list(event.required_skills), columns=('required_skills',)),
+    'max_volunteers': _attr('max_volunteers'),
+    'registered': Field(lambda event, request: event.approved_count, columns=('approved_count',)),
+    'pending': Field(lambda event, request: event.pending_count, columns=('pending_count',)),
+    'available_spots': Field(lambda event, request: event.get_available_spots(),
+                             columns=('max_volunteers', 'approved_count')),
+    'image': Field(lambda event, request: _absolute(request, event.image.url) if event.image else None,
+                   columns=('image',)),
+    'ngo': Field(lambda event, request: event.ngo_id, columns=('ngo',)),
+    'ngo_name': Field(lambda event, request: event.ngo.organization_name, columns=('ngo__organization_name',)),
+    'distance': Field(lambda event, request: getattr(event, 'distance', None)),
+    'url': Field(lambda event, request: _absolute(request, reverse('event_detail', args=[event.pk]))),
+    'created_at': _attr('created_at'),
+    'updated_at': _attr('updated_at'),
+}
+EVENT_LIST_FIELDS = ['id', 'title', 'date', 'location', 'status', 'available_spots', 'ngo', 'ngo_name', 'url']
+
+
+NGO_FIELDS = {
+    'id': Field(lambda ngo, request: ngo.pk, columns=('id',)),
+    'name': Field(lambda ngo, request: ngo.organization_name, columns=('organization_name',)),
+    'description': _attr('description'),
+    'city': _attr('city'),
+    'country': _attr('country'),
+    'website': _attr('website'),
+    'focus_areas': Field(lambda ngo, request: split_comma_list(ngo.focus_areas), columns=('focus_areas',)),
+    'logo': Field(lambda ngo, request: _absolute(request, ngo.logo.url) if ngo.logo else None, columns=('logo',)),
+    'upcoming_events': Field(
+        lambda ngo, request: ngo.upcoming_events,
+        annotation=lambda: Count('events', filter=Q(events__date__gte=timezone.now())),
+    ),
+    'total_volunteers': Field(
+        lambda ngo, request: ngo.total_volunteers or 0,
+        annotation=lambda: Sum('events__approved_count'),
+    ),
+    'url': Field(lambda ngo, request: _absolute(request, reverse('view_ngo_profile', args=[ngo.pk]))),
+}
+NGO_LIST_FIELDS = ['id', 'name', 'city', 'country', 'upcoming_events', 'url']
+
+
+def _requested_fields(request, available, default):
+    """Field names from ?fields=, validated against the resource"""
+    raw = request.GET.get('fields')
+    if not raw:
+        return list(default)
+
+    names = split_comma_list(raw)
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise APIError(f'Unknown field(s): {", ".join(unknown)}. Available: {", ".join(available)}.')
+    return names
+
+
+def _select(queryset, fields, names, extra_columns=()):
+    """Restrict the queryset to the columns and annotations the fields need"""
+    columns = {'id', *extra_columns}
+    annotations = {}
+    for name in names:
+        field = fields[name]
+        columns.update(field.columns)
+        if field.annotation:
+            annotations[name] = field.annotation()
+
+    related = {column.split('__')[0] for column in columns if '__' in column}
+    if related:
+        queryset = queryset.select_related(*related)
+    if annotations:
+        queryset = queryset.annotate(**annotations)
+    return queryset.only(*columns)
+
+
+def _serialize(objects, fields, names, request):
+    """Plain dicts for a batch of objects, with the getters resolved once"""
+    getters = [(name, fields[name].getter) for name in names]
+    return [{name: getter(obj, request) for name, getter in getters} for obj in objects]
+
+
+def _page_size(request):
+    try:
+        return min(max(int(request.GET.get('limit', API_PAGE_SIZE)), 1), API_MAX_PAGE_SIZE)
+    except ValueError:
+        raise APIError('limit must be an integer.')
+
+
+def _page(request, queryset, ordering):
+    paginator = KeysetPaginator(queryset, ordering, _page_size(request))
+    try:
+        return paginator.page(request.GET.get('cursor'))
+    except InvalidCursor:
+        raise APIError('Invalid cursor.')
+
+
+@api_view(LIST_MAX_AGE)
+def event_list(request):
+    """Upcoming events; accepts the same filters as the event list page"""
+    names = _requested_fields(request, EVENT_FIELDS, EVENT_LIST_FIELDS)
+    events, ordering, _ = filter_public_events(Event.objects.with_stats(), request.GET)
+    # The cursor is built from the ordering columns, so they must be loaded
+    events = _select(events, EVENT_FIELDS, names, extra_columns=['date'])
+    page, next_cursor = _page(request, events, ordering)
+    return APIResponse({'data': _serialize(page, EVENT_FIELDS, names, request), 'next_cursor': next_cursor})
+
+
+@api_view(LIST_MAX_AGE)
+def event_detail(request, pk):
+    names = _requested_fields(request, EVENT_FIELDS, EVENT_FIELDS)
+    event = _select(Event.objects.with_stats(), EVENT_FIELDS, names).filter(pk=pk).first()
+    if event is None:
+        raise APIError('Event not found.', status=404)
+    return APIResponse({'data': _serialize([event], EVENT_FIELDS, names, request)[0]})
+
+
+@api_view(AVAILABILITY_MAX_AGE)
+def event_availability(request):
+    """Live spot counts for up to MAX_AVAILABILITY_IDS events: ?ids=1,2,3"""
+    try:
+        ids = [int(value) for value in split_comma_list(request.GET.get('ids', ''))]
+    except ValueError:
+        raise APIError('ids must be a comma-separated list of integers.')
+    if not ids:
+        raise APIError('ids is required.')
+    if len(ids) > MAX_AVAILABILITY_IDS:
+        raise APIError(f'At most {MAX_AVAILABILITY_IDS} ids per request.')
+
+    rows = Event.objects.filter(pk__in=ids).order_by('pk').values_list(
+        'pk', 'max_volunteers', 'approved_count', 'pending_count'
+    )
+    data = [
+        {
+            'id': pk,
+            'max_volunteers': max_volunteers,
+            'registered': approved,
+            'pending': pending,
+            'available_spots': max_volunteers - approved,
+            'is_full': approved >= max_volunteers,
+        }
+        for pk, max_volunteers, approved, pending in rows
+    ]
+    return APIResponse({'data': data})
+
+
+@api_view(LIST_MAX_AGE)
+def ngo_list(request):
+    """Approved NGOs with their event counts"""
+    names = _requested_fields(request, NGO_FIELDS, NGO_LIST_FIELDS)
+    ngos = _select(NGO.objects.filter(status='approved'), NGO_FIELDS, names)
+    page, next_cursor = _page(request, ngos, ['id'])
+    return APIResponse({'data': _serialize(page, NGO_FIELDS, names, request), 'next_cursor': next_cursor})
+
+
+@api_view(LIST_MAX_AGE)
+def ngo_detail(request, pk):
+    names = _requested_fields(request, NGO_FIELDS, NGO_FIELDS)
+    ngo = _select(NGO.objects.filter(status='approved'), NGO_FIELDS, names).filter(pk=pk).first()
+    if ngo is None:
+        raise APIError('NGO not found.', status=404)
+    return APIResponse({'data': _serialize([ngo], NGO_FIELDS, names, request)[0]})
@@ -0,0 +1,12 @@
+# events/api_urls.py
+
+from django.urls import path
+from . import api
+
+urlpatterns = [
+    path('events/', api.event_list, name='api_event_list'),
+    path('events/availability/', api.event_availability, name='api_event_availability'),
+    path('events/<int:pk>/', api.event_detail, name='api_event_detail'),
+    path('ngos/', api.ngo_list, name='api_ngo_list'),
+    path('ngos/<int:pk>/', api.ngo_detail, name='api_ngo_detail'),
+]
@@ -0,0 +1,158 @@
+# events/calendar.py
+
+"""
+iCalendar (.ics) feeds of a volunteer's approved events and of an NGO's
+events, served from secret per-user URLs.
+
+Calendar apps poll feeds every few minutes, so a poll is answered from the
+cache: the URL token resolves to its user through the cache, and the
+rendered feed is stored under that user's change version. The signals in
+events/signals.py replace the version whenever something in the feed
+changes, so a poll that finds nothing new costs two cache reads and no
+database query or session access. The versions must be seen by every
+worker process, so this needs a shared cache backend (see CACHES in
+settings.py and the core.W001 check); with a per-process cache a feed
+could stay stale until FEED_TIMEOUT.
+"""
+
+import hashlib
+import time
+from datetime import timezone as dt_timezone
+from django.core.cache import cache
+from django.urls import reverse
+from .models import CalendarFeed, Event, EventRegistration
+
+FEED_TIMEOUT = 60 * 60 * 24
+TOKEN_TIMEOUT = 60 * 60 * 24
+# Suggested poll interval for clients that honor it
+REFRESH_INTERVAL = 'PT15M'
+
+FEED_CHUNK_SIZE = 500
+
+
+def _version_key(user_id):
+    return f'calendar-feed-version:{user_id}'
+
+
+def _token_key(token):
+    return f'calendar-feed-token:{token}'
+
+
+def invalidate_calendar_feed(*user_ids):
+    """Orphan the cached feeds of these users by giving them a new version"""
+    version = time.time_ns()
+    cache.set_many({_version_key(user_id): version for user_id in user_ids}, None)
+
+
+def feed_version(user_id):
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        # Missing (or evicted): start fresh so a stale feed can never match
+        version = time.time_ns()
+        cache.add(_version_key(user_id), version, None)
+        version = cache.get(_version_key(user_id), version)
+    return version
+
+
+def resolve_token(token):
+    """(user_id, user_type) owning a feed token, or None"""
+    owner = cache.get(_token_key(token))
+    if owner is None:
+        owner = CalendarFeed.objects.filter(token=token).values_list('user_id', 'user__user_type').first()
+        if owner is None:
+            return None
+        cache.set(_token_key(token), owner, TOKEN_TIMEOUT)
+    return tuple(owner)
+
+
+def forget_token(token):
+    cache.delete(_token_key(token))
+
+
+def feed_etag(token, version):
+    return '"' + hashlib.md5(f'{token}:{version}'.encode()).hexdigest() + '"'
+
+
+def _escape(text):
+    """TEXT value escaping (RFC 5545 3.3.11)"""
+    return (str(text).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n').replace('\r', '\\n'))
+
+
+def _fold(line):
+    """Fold a content line at 75 octets (RFC 5545 3.1), never inside a character"""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line + '\r\n'
+
+    parts, start, limit = [], 0, 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Back off to a UTF-8 character boundary
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode())
+        start, limit = end, 74  # continuation lines start with a space
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def _timestamp(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _vevent(event, url, domain):
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:event-{event.pk}@{domain}',
+        f'DTSTAMP:{_timestamp(event.updated_at)}',
+        f'LAST-MODIFIED:{_timestamp(event.updated_at)}',
+        f'DTSTART:{_timestamp(event.date)}',
+        f'SUMMARY:{_escape(event.title)}',
+        f'LOCATION:{_escape(event.location)}',
+        f'DESCRIPTION:{_escape(event.description)}',
+        f'URL:{url}',
+        f'ORGANIZER;CN={_escape(event.ngo.organization_name)}:mailto:{event.ngo.email}',
+    ]
+    if event.latitude is not None and event.longitude is not None:
+        lines.append(f'GEO:{event.latitude:.6f};{event.longitude:.6f}')
+    lines.append('END:VEVENT')
+    return ''.join(_fold(line) for line in lines)
+
+
+def _feed_events(user_id, user_type):
+    events = Event.objects.select_related('ngo').order_by('date', 'pk')
+    if user_type == 'ngo':
+        return 'My NGO events', events.filter(ngo__user_id=user_id)
+    approved = EventRegistration.objects.filter(volunteer_id=user_id, status='approved').values('event_id')
+    return 'My volunteer events', events.filter(pk__in=approved)
+
+
+def iter_calendar(request, user_id, user_type):
+    """Yield the feed piece by piece, one VEVENT per event"""
+    name, events = _feed_events(user_id, user_type)
+    domain = request.get_host().split(':')[0]
+    yield ''.join(_fold(line) for line in [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:-//Voluntree//{name}//EN',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:Voluntree - {name}',
+        f'REFRESH-INTERVAL;VALUE=DURATION:{REFRESH_INTERVAL}',
+        f'X-PUBLISHED-TTL:{REFRESH_INTERVAL}',
+    ])
+    for event in events.iterator(chunk_size=FEED_CHUNK_SIZE):
+        url = request.build_absolute_uri(reverse('event_detail', args=[event.pk]))
+        yield _vevent(event, url, domain)
+    yield 'END:VCALENDAR\r\n'
+
+
+def calendar_body(request, token, user_id, user_type, version):
+    """The encoded feed, rendered once per version and host"""
+    key = f'calendar-feed:{token}:{version}:{request.get_host()}'
+    body = cache.get(key)
+    if body is None:
+        # Rendered in full before responding, so the cursor closes before the client reads
+        body = ''.join(iter_calendar(request, user_id, user_type)).encode()
+        cache.set(key, body, FEED_TIMEOUT)
+    return body
@@ -0,0 +1,137 @@
+# events/cards.py
+
+"""
+Fragment cache for event cards.
+
+Listings render each card through render_event_cards(), which stores the
+HTML under a key made of the template, the event id, its updated_at, its
+registration counters (spots left, pending applications) and a per-event
+version token. The signals in events/signals.py replace the version token
+whenever the event, one of its registrations or its certificate changes,
+so an unchanged card is served from the cache and a changed one is
+re-rendered on the next request.
+
+Registrations change the counters but not updated_at, so the counters are
+part of the key: spot counts stay right even if a version bump is missed,
+e.g. with a per-process cache and several workers. Version tokens only
+reach every process through a shared cache backend (see CACHES in
+settings.py and the core.W001 check).
+
+Cards are rendered without the request so the cached HTML never contains
+per-user data; the CSRF token of forms inside a card is filled in after
+the cache lookup.
+"""
+
+import time
+from django.core.cache import cache
+from django.middleware.csrf import get_token
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+CARD_TIMEOUT = 60 * 60 * 24
+
+# Rendered in place of the CSRF token, swapped for the real one per request
+CSRF_PLACEHOLDER = '__event_card_csrf__'
+
+HITS_KEY = 'event-card-stats:hits'
+MISSES_KEY = 'event-card-stats:misses'
+
+
+def _version_key(event_id):
+    return f'event-card-version:{event_id}'
+
+
+def _new_version():
+    return time.time_ns()
+
+
+def invalidate_event_card(event_id):
+    """Orphan every cached card of an event by giving it a new version"""
+    cache.set(_version_key(event_id), _new_version(), None)
+
+
+def _versions(event_ids):
+    keys = {_version_key(event_id): event_id for event_id in event_ids}
+    versions = {keys[key]: version for key, version in cache.get_many(keys).items()}
+
+    # Missing (or evicted) versions start fresh, so stale cards can never match
+    missing = {_version_key(event_id): _new_version() for event_id in event_ids if event_id not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update({keys[key]: version for key, version in missing.items()})
+    return versions
+
+
+def _card_key(template_name, event, version):
+    key = (
+        f'event-card:{template_name}:{event.pk}:{event.updated_at.timestamp()}'
+        f':{event.approved_count}:{event.pending_count}:{version}'
+    )
+    # Query-dependent annotations shown on the card
+    distance = getattr(event, 'distance', None)
+    if distance is not None:
+        key += f':{distance:.1f}'
+    return key
+
+
+def _count(key, amount):
+    if not amount:
+        return
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        # First use, or the counter was evicted
+        cache.add(key, 0, None)
+        cache.incr(key, amount)
+
+
+def render_event_cards(events, template_name, request=None):
+    """
+    Attach the rendered card to each event as `card_html`, reusing cached
+    fragments where possible. Returns the events as a list.
+    """
+    events = list(events)
+    if not events:
+        return events
+
+    versions = _versions([event.pk for event in events])
+    keys = {event.pk: _card_key(template_name, event, versions[event.pk]) for event in events}
+    cached = cache.get_many(keys.values())
+
+    template = None
+    rendered = {}
+    for event in events:
+        html = cached.get(keys[event.pk])
+        if html is None:
+            template = template or get_template(template_name)
+            html = rendered[keys[event.pk]] = template.render({'event': event, 'csrf_token': CSRF_PLACEHOLDER})
+        event.card_html = mark_safe(html)
+
+    if rendered:
+        cache.set_many(rendered, CARD_TIMEOUT)
+    _count(HITS_KEY, len(events) - len(rendered))
+    _count(MISSES_KEY, len(rendered))
+
+    if request is not None:
+        token = None
+        for event in events:
+            if CSRF_PLACEHOLDER in event.card_html:
+                token = token or get_token(request)
+                event.card_html = mark_safe(event.card_html.replace(CSRF_PLACEHOLDER, token))
+    return events
+
+
+def card_cache_stats():
+    """Hit/miss counters since the last reset"""
+    counts = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits, misses = counts.get(HITS_KEY, 0), counts.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': hits / total if total else None,
+    }
+
+
+def reset_card_cache_stats():
+    cache.delete_many([HITS_KEY, MISSES_KEY])
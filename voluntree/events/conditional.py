@@ -0,0 +1,103 @@
+# events/conditional.py
+
+"""
+Conditional GET for the public event pages.
+
+A page's state is summarized from a few aggregate queries: the latest
+updated_at and the row count of the events shown, their NGOs, their
+registrations and their certificates. Counts catch deletions, which
+max(updated_at) alone would miss. When the client already holds that
+state, Django's condition() answers 304 without running the view.
+
+Authenticated pages also depend on who is asking (navigation, the user's
+own registration), so the ETag includes the user id and those responses
+carry no Last-Modified: a bare If-Modified-Since cannot tell users apart.
+"""
+
+import hashlib
+from functools import wraps
+from django.contrib import messages
+from django.db.models import Count, Max
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition
+from certificates.models import Certificate
+from .models import EventRegistration
+
+
+def _latest(*values):
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
+
+
+def event_set_state(events):
+    """(last_modified, fingerprint) for everything a listing of `events` shows"""
+    events = events.order_by()
+    event_ids = events.values('pk')
+    event_stats = events.aggregate(
+        count=Count('pk', distinct=True), updated=Max('updated_at'), ngo_updated=Max('ngo__updated_at')
+    )
+    registration_stats = EventRegistration.objects.filter(event__in=event_ids).aggregate(
+        count=Count('pk'), updated=Max('updated_at')
+    )
+    certificate_stats = Certificate.objects.filter(event__in=event_ids).aggregate(
+        count=Count('pk'), updated=Max('updated_at')
+    )
+
+    last_modified = _latest(
+        event_stats['updated'], event_stats['ngo_updated'], registration_stats['updated'], certificate_stats['updated']
+    )
+    fingerprint = (
+        event_stats['count'], event_stats['updated'], event_stats['ngo_updated'],
+        registration_stats['count'], registration_stats['updated'],
+        certificate_stats['count'], certificate_stats['updated'],
+    )
+    return last_modified, fingerprint
+
+
+def conditional_page(state_func):
+    """
+    Decorator adding ETag/Last-Modified handling to a view.
+
+    state_func(request, *args, **kwargs) returns (last_modified, fingerprint)
+    or None to skip conditional handling (e.g. for a 404).
+    """
+    def page_state(request, *args, **kwargs):
+        # condition() asks for the ETag and Last-Modified separately: compute once
+        if not hasattr(request, '_page_state'):
+            request._page_state = None
+            # Flash messages are consumed by rendering, so the page must render
+            if not len(messages.get_messages(request)):
+                state = state_func(request, *args, **kwargs)
+                if state is not None:
+                    last_modified, fingerprint = state
+                    user_id = request.user.pk if request.user.is_authenticated else None
+                    seed = repr((fingerprint, user_id, request.get_full_path()))
+                    request._page_state = (last_modified, hashlib.md5(seed.encode()).hexdigest())
+        return request._page_state
+
+    def etag(request, *args, **kwargs):
+        state = page_state(request, *args, **kwargs)
+        return state[1] if state else None
+
+    def last_modified(request, *args, **kwargs):
+        state = page_state(request, *args, **kwargs)
+        if not state or request.user.is_authenticated:
+            return None
+        return state[0]
+
+    def decorator(view):
+        conditional_view = condition(etag_func=etag, last_modified_func=last_modified)(view)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            # Always revalidate; never share a logged-in page
+            if request.user.is_authenticated:
+                patch_cache_control(response, no_cache=True, private=True)
+            else:
+                patch_cache_control(response, no_cache=True)
+            patch_vary_headers(response, ['Cookie'])
+            return response
+        return wrapper
+
+    return decorator
@@ -0,0 +1,221 @@
+# events/exports.py
+
+"""
+Streaming CSV/XLSX exports.
+
+Rows come from a generator (normally a queryset iterator), are encoded in
+batches of EXPORT_BATCH_ROWS and handed to a StreamingHttpResponse, so the
+header goes out at once and memory stays flat however many rows there are.
+
+XLSX is written with the standard library: a workbook is a zip of a few
+XML parts, and zipfile can write to a non-seekable stream, so the sheet
+is deflated and sent as it is produced. Cells are inline strings or
+numbers, which keeps the format free of a shared-strings table that would
+have to be held in memory.
+"""
+
+import csv
+import io
+import re
+import zipfile
+from datetime import date, datetime
+from xml.sax.saxutils import escape
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+EXPORT_BATCH_ROWS = 500
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+# Spreadsheet apps run cells starting with these as formulas
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+# Control characters XML 1.0 cannot carry
+INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _text(value):
+    """Display form of a cell value"""
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.strftime('%Y-%m-%d %H:%M')
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def _batches(rows, size=EXPORT_BATCH_ROWS):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _csv_cell(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    text = _text(value)
+    # Neutralize formula injection from user-entered text
+    return f"'{text}" if text.startswith(FORMULA_PREFIXES) else text
+
+
+def stream_csv(header, rows):
+    """Yield a CSV file piece by piece: the header first, then row batches"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(header)
+    # BOM so Excel picks UTF-8
+    yield '\ufeff' + buffer.getvalue()
+
+    for batch in _batches(rows):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_cell(value) for value in row] for row in batch)
+        yield buffer.getvalue()
+
+
+class _ZipStream(io.RawIOBase):
+    """Write-only, non-seekable sink that zipfile writes into and we drain"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+XLSX_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+
+def _xlsx_cell(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f'<c><v>{value}</v></c>'
+    text = escape(INVALID_XML_CHARS.sub('', _text(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(values):
+    return '<row>' + ''.join(_xlsx_cell(value) for value in values) + '</row>'
+
+
+def stream_xlsx(header, rows, sheet_name='Export'):
+    """Yield a single-sheet XLSX workbook piece by piece"""
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_DEFLATED) as workbook:
+        for name, content in XLSX_PARTS.items():
+            workbook.writestr(name, content)
+        # Sheet names are limited to 31 characters and cannot hold []:*?/\
+        sheet_name = escape(re.sub(r'[\[\]:*?/\\]', ' ', sheet_name)[:31], {'"': '&quot;'})
+        workbook.writestr('xl/workbook.xml', XLSX_WORKBOOK.format(name=sheet_name))
+
+        with workbook.open('xl/worksheets/sheet1.xml', 'w') as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            sheet.write(_xlsx_row(header).encode())
+            yield stream.drain()
+
+            for batch in _batches(rows):
+                sheet.write(''.join(_xlsx_row(row) for row in batch).encode())
+                data = stream.drain()
+                if data:
+                    yield data
+            sheet.write(b'</sheetData></worksheet>')
+    # Closing writes the central directory
+    yield stream.drain()
+
+
+def export_response(file_format, filename, header, rows):
+    """StreamingHttpResponse downloading `rows` as filename.csv or filename.xlsx"""
+    if file_format == 'xlsx':
+        content = stream_xlsx(header, rows, sheet_name=filename)
+    else:
+        file_format = 'csv'
+        content = stream_csv(header, rows)
+
+    response = StreamingHttpResponse(content, content_type=EXPORT_FORMATS[file_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{file_format}"'
+    # Let proxies pass the chunks through instead of buffering the whole file
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+REGISTRATION_HEADER = ['Name', 'Username', 'Email', 'Phone', 'City', 'Skills', 'Status', 'Waitlist position',
+                       'Applied']
+
+
+def registration_rows(registrations):
+    """Roster rows for an EventRegistration queryset"""
+    registrations = registrations.select_related('volunteer', 'volunteer__volunteer_profile')
+    for registration in registrations.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        volunteer = registration.volunteer
+        profile = getattr(volunteer, 'volunteer_profile', None)
+        yield [
+            volunteer.get_full_name() or volunteer.username,
+            volunteer.username,
+            volunteer.email,
+            profile.phone if profile else '',
+            profile.city if profile else '',
+            profile.skills if profile else '',
+            registration.get_status_display(),
+            registration.waitlist_position,
+            registration.applied_at,
+        ]
@@ -0,0 +1,65 @@
+# events/filters.py
+
+"""
+Filters of the public event listing, shared by the HTML pages and the API.
+"""
+
+from django.utils import timezone
+from accounts.models import canonical_skill_name
+from .geocoding import parse_point
+from .search import get_search_backend
+
+DEFAULT_RADIUS_KM = 25
+MAX_RADIUS_KM = 500
+
+
+def filter_public_events(events, params):
+    """
+    Apply the listing filters in `params` (a QueryDict) to an Event queryset.
+
+    Returns (events, ordering, filters): the keyset ordering to paginate
+    with, and the active filter values for templates.
+    """
+    # Filter out past events by default
+    events = events.filter(date__gte=timezone.now())
+    ordering = ['date', 'id']
+
+    # Search functionality (ranked by relevance, then by date)
+    search_query = params.get('search', '')
+    if search_query:
+        backend = get_search_backend()
+        events = backend.search(events, search_query)
+        if backend.rank_ordering:
+            ordering.insert(0, backend.rank_ordering)
+
+    # Filter by status
+    status_filter = params.get('status', '')
+    if status_filter:
+        events = events.filter(status=status_filter)
+
+    # Filter by required skill (indexed join through the skill tags)
+    skill_filter = params.get('skill', '')
+    if skill_filter:
+        events = events.filter(skill_tags__canonical_name=canonical_skill_name(skill_filter))
+
+    # Events near a point, nearest first (ignored if malformed)
+    near = params.get('near', '')
+    point = parse_point(near)
+    try:
+        radius = min(max(float(params.get('radius', DEFAULT_RADIUS_KM)), 1), MAX_RADIUS_KM)
+    except ValueError:
+        radius = DEFAULT_RADIUS_KM
+    if point:
+        events = events.near(*point, radius)
+        ordering[ordering.index('date')] = 'distance'
+    else:
+        near = ''
+
+    filters = {
+        'search_query': search_query,
+        'status_filter': status_filter,
+        'skill_filter': skill_filter,
+        'near': near,
+        'radius': radius,
+    }
+    return events, ordering, filters
@@ -2,6 +2,7 @@
 
 from django import forms
 from .models import Event
+from certificates.forms import TEMPLATE_ACCEPT, TEMPLATE_HELP_TEXT, clean_template_file
 from certificates.models import Certificate
 
 
@@ -10,10 +11,10 @@ class EventForm(forms.ModelForm):
     certificate_file = forms.FileField(
         required=True,
         label='Certificate Template',
-        help_text='Upload certificate template (PDF recommended). This will be reviewed by admin before you can assign it to volunteers.',
+        help_text=f'{TEMPLATE_HELP_TEXT} It will be reviewed by admin before you can assign it to volunteers.',
         widget=forms.FileInput(attrs={
             'class': 'form-control',
-            'accept': '.pdf,.doc,.docx,.jpg,.jpeg,.png'
+            'accept': TEMPLATE_ACCEPT
         })
     )
 
@@ -71,19 +72,4 @@ class EventForm(forms.ModelForm):
 
     def clean_certificate_file(self):
         """Validate certificate file"""
-        file = self.cleaned_data.get('certificate_file')
-
-        if file:
-            # Check file size (max 10MB)
-            if file.size > 10 * 1024 * 1024:
-                raise forms.ValidationError('File size must be less than 10MB.')
-
-            # Check file extension
-            allowed_extensions = ['.pdf', '.doc', '.docx', '.jpg', '.jpeg', '.png']
-            file_ext = file.name.lower().split('.')[-1]
-            if f'.{file_ext}' not in allowed_extensions:
-                raise forms.ValidationError(
-                    'Only PDF, Word documents, and images are allowed.'
-                )
-
-        return file
\ No newline at end of file
+        return clean_template_file(self.cleaned_data.get('certificate_file'))
@@ -0,0 +1,189 @@
+# events/geocoding.py
+
+"""
+Coordinates for free-text event locations.
+
+Event.save() clears the coordinates whenever the location changes and,
+once the save commits, queues the geocode_event task (events/tasks.py),
+so no request waits on a geocoder. The task resolves the location through
+the backend named by settings.EVENT_GEOCODER. The default is an offline
+gazetteer of known place names, so development and tests never touch the
+network; NominatimGeocoder queries OpenStreetMap instead.
+
+Also holds the distance helpers behind EventQuerySet.near(): a bounding box
+that the (latitude, longitude) index can range-scan, and the exact
+haversine distance as a database expression.
+"""
+
+import json
+import math
+import urllib.error
+import urllib.parse
+import urllib.request
+from django.conf import settings
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+from django.utils.module_loading import import_string
+
+EARTH_RADIUS_KM = 6371.0088
+
+DEFAULT_GEOCODER = 'events.geocoding.GazetteerGeocoder'
+
+# Place name -> (latitude, longitude)
+GAZETTEER = {
+    'dhaka': (23.8103, 90.4125),
+    'chittagong': (22.3569, 91.7832),
+    'chattogram': (22.3569, 91.7832),
+    'khulna': (22.8456, 89.5403),
+    'rajshahi': (24.3745, 88.6042),
+    'sylhet': (24.8949, 91.8687),
+    'barisal': (22.7010, 90.3535),
+    'barishal': (22.7010, 90.3535),
+    'rangpur': (25.7439, 89.2752),
+    'mymensingh': (24.7471, 90.4203),
+    'comilla': (23.4607, 91.1809),
+    'cumilla': (23.4607, 91.1809),
+    'narayanganj': (23.6238, 90.5000),
+    'gazipur': (23.9999, 90.4203),
+    "cox's bazar": (21.4272, 92.0058),
+    'coxs bazar': (21.4272, 92.0058),
+    'noakhali': (22.8696, 91.0995),
+    'feni': (23.0159, 91.3976),
+    'bogura': (24.8465, 89.3773),
+    'bogra': (24.8465, 89.3773),
+    'jessore': (23.1664, 89.2081),
+    'jashore': (23.1664, 89.2081),
+    'dinajpur': (25.6217, 88.6354),
+    'tangail': (24.2513, 89.9167),
+    'pabna': (24.0064, 89.2372),
+    'kushtia': (23.9013, 89.1204),
+    'faridpur': (23.6070, 89.8429),
+    'bhola': (22.6859, 90.6482),
+    'patuakhali': (22.3596, 90.3299),
+    'rangamati': (22.6533, 92.1789),
+    'bandarban': (22.1953, 92.2184),
+    'sunamganj': (25.0658, 91.3950),
+    'habiganj': (24.3745, 91.4155),
+    'satkhira': (22.7185, 89.0705),
+    'bagerhat': (22.6516, 89.7859),
+    'kolkata': (22.5726, 88.3639),
+    'delhi': (28.7041, 77.1025),
+    'karachi': (24.8607, 67.0011),
+    'lahore': (31.5204, 74.3587),
+    'london': (51.5072, -0.1276),
+    'new york': (40.7128, -74.0060),
+}
+
+
+class GeocoderError(Exception):
+    """The geocoder could not be reached; worth trying again later"""
+
+
+def _place_key(name):
+    return ' '.join(name.split()).casefold()
+
+
+class GazetteerGeocoder:
+    """Offline lookup of the most specific known part of a location"""
+
+    # Seconds to leave between lookups when geocoding many events
+    min_interval = 0
+
+    def __init__(self, places=None):
+        places = GAZETTEER if places is None else places
+        self.places = {_place_key(name): coordinates for name, coordinates in places.items()}
+
+    def geocode(self, location):
+        """(latitude, longitude) or None"""
+        candidates = [location] + location.split(',')
+        for candidate in candidates:
+            coordinates = self.places.get(_place_key(candidate))
+            if coordinates:
+                return coordinates
+        return None
+
+
+class NominatimGeocoder:
+    """OpenStreetMap Nominatim search API (one request per call)"""
+
+    url = 'https://nominatim.openstreetmap.org/search'
+    # Usage policy: at most one request per second
+    min_interval = 1
+
+    def __init__(self, user_agent='voluntree', timeout=5):
+        self.user_agent = user_agent
+        self.timeout = timeout
+
+    def geocode(self, location):
+        query = urllib.parse.urlencode({'q': location, 'format': 'json', 'limit': 1})
+        request = urllib.request.Request(f'{self.url}?{query}', headers={'User-Agent': self.user_agent})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                results = json.load(response)
+        except (urllib.error.URLError, OSError, ValueError) as exc:
+            raise GeocoderError(f'Nominatim lookup failed: {exc}') from exc
+        if not results:
+            return None
+        return float(results[0]['lat']), float(results[0]['lon'])
+
+
+_geocoder = None
+
+
+def get_geocoder():
+    """The configured geocoder (cached per process)"""
+    global _geocoder
+    if _geocoder is None:
+        _geocoder = import_string(getattr(settings, 'EVENT_GEOCODER', DEFAULT_GEOCODER))()
+    return _geocoder
+
+
+def parse_point(value):
+    """'lat,lng' -> (lat, lng) floats, or None if malformed or out of range"""
+    try:
+        latitude, longitude = (float(part) for part in value.split(','))
+    except ValueError:
+        return None
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+    return latitude, longitude
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    (min_lat, max_lat, min_lng, max_lng) enclosing a circle on the sphere.
+
+    Longitude bounds are None when the box reaches a pole or crosses the
+    antimeridian, in which case only the latitude range can be used.
+    """
+    delta_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = latitude - delta_lat, latitude + delta_lat
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90), min(max_lat, 90), None, None
+
+    delta_lng = math.degrees(math.asin(min(1.0, math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(latitude)))))
+    min_lng, max_lng = longitude - delta_lng, longitude + delta_lng
+    if min_lng < -180 or max_lng > 180:
+        return min_lat, max_lat, None, None
+    return min_lat, max_lat, min_lng, max_lng
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Great-circle distance in km"""
+    dlat = math.radians(lat2 - lat1)
+    dlng = math.radians(lng2 - lng1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def distance_expression(latitude, longitude, lat_field='latitude', lng_field='longitude'):
+    """haversine_km() from a fixed point to each row, as an ORM expression"""
+    lat1 = Value(math.radians(latitude), output_field=FloatField())
+    lng1 = Value(math.radians(longitude), output_field=FloatField())
+    lat2 = Radians(F(lat_field))
+    lng2 = Radians(F(lng_field))
+    a = (
+        Power(Sin((lat2 - lat1) / 2), 2)
+        + Cos(lat1) * Cos(lat2) * Power(Sin((lng2 - lng1) / 2), 2)
+    )
+    return 2 * EARTH_RADIUS_KM * ASin(Least(Sqrt(a), Value(1.0)))
@@ -0,0 +1,68 @@
+# events/lifecycle.py
+
+"""
+Moves events through their status lifecycle once their date has passed.
+
+An event becomes 'ongoing' when it starts and 'completed' ONGOING_HOURS
+later; completion only happens while PlatformSettings.auto_complete_events
+is on, otherwise past events stay 'ongoing' until the NGO closes them.
+
+Rows are changed with plain UPDATEs over consecutive primary-key ranges,
+each committed on its own, so no run holds locks on more than
+chunk_size events at a time. Every UPDATE re-checks the status and date,
+which makes a run idempotent and safe to repeat or overlap.
+"""
+
+import logging
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+from admin_panel.models import PlatformSettings
+from .models import Event
+
+logger = logging.getLogger(__name__)
+
+ONGOING_HOURS = 24
+CHUNK_SIZE = 1000
+
+
+def _update_in_chunks(events, chunk_size, **changes):
+    """UPDATE `events` one primary-key range at a time; returns the rows changed"""
+    bounds = events.aggregate(first=Min('pk'), last=Max('pk'))
+    if bounds['first'] is None:
+        return 0
+
+    changed = 0
+    for start in range(bounds['first'], bounds['last'] + 1, chunk_size):
+        with transaction.atomic():
+            changed += events.filter(pk__gte=start, pk__lt=start + chunk_size).update(**changes)
+    return changed
+
+
+def advance_event_statuses(now=None, ongoing_hours=ONGOING_HOURS, chunk_size=CHUNK_SIZE):
+    """
+    Mark started events 'ongoing' and, if enabled, finished ones 'completed'.
+
+    Returns {'ongoing': n, 'completed': n, 'auto_complete': bool}.
+    """
+    now = now or timezone.now()
+    auto_complete = PlatformSettings.load().auto_complete_events
+    finished_before = now - timedelta(hours=ongoing_hours)
+
+    # updated_at moves with the status so cached cards and pages refresh
+    completed = 0
+    if auto_complete:
+        completed = _update_in_chunks(
+            Event.objects.filter(status__in=['published', 'ongoing'], date__lte=finished_before),
+            chunk_size, status='completed', updated_at=now,
+        )
+
+    started = Event.objects.filter(status='published', date__lte=now)
+    if auto_complete:
+        started = started.filter(date__gt=finished_before)
+    ongoing = _update_in_chunks(started, chunk_size, status='ongoing', updated_at=now)
+
+    logger.info('Event lifecycle: %d ongoing, %d completed (auto-complete %s)',
+                ongoing, completed, 'on' if auto_complete else 'off')
+    return {'ongoing': ongoing, 'completed': completed, 'auto_complete': auto_complete}
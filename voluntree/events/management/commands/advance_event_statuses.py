@@ -0,0 +1,26 @@
+# events/management/commands/advance_event_statuses.py
+
+from django.core.management.base import BaseCommand
+from events.lifecycle import CHUNK_SIZE, ONGOING_HOURS, advance_event_statuses
+
+
+class Command(BaseCommand):
+    help = ("Move past events to 'ongoing'/'completed' (honors PlatformSettings.auto_complete_events). "
+            "Safe to run from cron as often as needed.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ongoing-hours', type=int, default=ONGOING_HOURS,
+                            help=f'Hours after its start an event is completed (default {ONGOING_HOURS})')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                            help=f'Events per UPDATE (default {CHUNK_SIZE})')
+
+    def handle(self, *args, **options):
+        result = advance_event_statuses(ongoing_hours=options['ongoing_hours'], chunk_size=options['chunk_size'])
+
+        self.stdout.write(f"{result['ongoing']} event(s) marked ongoing.")
+        if result['auto_complete']:
+            self.stdout.write(f"{result['completed']} event(s) marked completed.")
+        else:
+            self.stdout.write(self.style.WARNING('Auto-complete is turned off in platform settings; '
+                                                 'no events were completed.'))
+        self.stdout.write(self.style.SUCCESS('Event statuses are up to date.'))
@@ -0,0 +1,62 @@
+# events/management/commands/bench_api.py
+
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from accounts.models import NGO, User
+from events.models import Event
+
+
+class Command(BaseCommand):
+    help = 'Compare request throughput of the JSON API and the HTML event pages (seed data is rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=2000)
+        parser.add_argument('--requests', type=int, default=200)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            event_id = self._seed(options['events'])
+            client = Client(HTTP_HOST='localhost')
+
+            pairs = [
+                ('list', reverse('event_list'), reverse('api_event_list') + '?limit=12'),
+                ('detail', reverse('event_detail', args=[event_id]), reverse('api_event_detail', args=[event_id])),
+            ]
+            for name, html_url, api_url in pairs:
+                html = self._throughput(client, html_url, options['requests'])
+                api = self._throughput(client, api_url, options['requests'])
+                self.stdout.write(self.style.SUCCESS(
+                    f'{name}: HTML {html:.0f} req/s, API {api:.0f} req/s ({api / html:.1f}x)'
+                ))
+
+            transaction.set_rollback(True)
+
+    def _seed(self, count):
+        user = User.objects.create_user(username='bench-api-ngo', email='bench-api-ngo@example.com',
+                                        password=None, user_type='ngo')
+        ngo = NGO.objects.create(user=user, organization_name='Bench NGO', registration_number='BENCH-API',
+                                 status='approved')
+        start = timezone.now() + timedelta(days=1)
+        events = Event.objects.bulk_create(
+            Event(ngo=ngo, title=f'Bench event {index}', description='Benchmark event. ' * 20,
+                  location='Dhaka', required_skills='Teaching, First Aid',
+                  date=start + timedelta(minutes=index), max_volunteers=50)
+            for index in range(count)
+        )
+        return events[0].pk
+
+    def _throughput(self, client, url, requests):
+        # Warm up caches and lazy imports
+        for _ in range(5):
+            response = client.get(url)
+            assert response.status_code == 200, (url, response.status_code)
+
+        started = time.perf_counter()
+        for _ in range(requests):
+            client.get(url)
+        return requests / (time.perf_counter() - started)
@@ -0,0 +1,64 @@
+# events/management/commands/bench_recommendations.py
+
+import time
+import numpy as np
+from django.core.management.base import BaseCommand
+from events.recommendations import EventFeatureIndex
+
+
+class Command(BaseCommand):
+    help = 'Benchmark recommendation scoring over a synthetic in-memory event matrix (no database writes)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=100000)
+        parser.add_argument('--skills', type=int, default=500)
+        parser.add_argument('--cities', type=int, default=200)
+        parser.add_argument('--ngos', type=int, default=2000)
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options['seed'])
+        count = options['events']
+        now = time.time()
+
+        records = [
+            (
+                event_id,
+                int(rng.integers(options['ngos'])),
+                f'City {rng.integers(options["cities"])}, Country',
+                now + 86400 * float(rng.uniform(1, 365)),
+                rng.choice(options['skills'], size=int(rng.integers(1, 6)), replace=False).tolist(),
+            )
+            for event_id in range(1, count + 1)
+        ]
+
+        index = EventFeatureIndex()
+        started = time.perf_counter()
+        index.add_events(records)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        # Re-vectorize 1% of events, as the incremental sync would
+        changed = records[:max(1, count // 100)]
+        started = time.perf_counter()
+        index.add_events(changed)
+        update_ms = (time.perf_counter() - started) * 1000
+
+        timings = []
+        for _ in range(options['repeat']):
+            weights = np.zeros(len(index.columns))
+            weights[rng.choice(len(index.columns), size=12, replace=False)] = rng.uniform(1, 3, size=12)
+            exclude = rng.integers(1, count + 1, size=20)
+            started = time.perf_counter()
+            index.score(weights, exclude_ids=exclude, limit=12)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        timings = np.array(timings)
+        self.stdout.write(
+            f'{count} events, {len(index.entry_rows)} non-zeros, {len(index.columns)} features\n'
+            f'build: {build_ms:.1f} ms, incremental update of {len(changed)}: {update_ms:.1f} ms'
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'score x{options["repeat"]}: mean {timings.mean():.2f} ms, '
+            f'p95 {np.percentile(timings, 95):.2f} ms, max {timings.max():.2f} ms'
+        ))
@@ -0,0 +1,20 @@
+# events/management/commands/card_cache_stats.py
+
+from django.core.management.base import BaseCommand
+from events.cards import card_cache_stats, reset_card_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Show (or reset) the event card fragment cache hit/miss counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Zero the counters after printing them')
+
+    def handle(self, *args, **options):
+        stats = card_cache_stats()
+        rate = 'n/a' if stats['hit_rate'] is None else f'{stats["hit_rate"]:.1%}'
+        self.stdout.write(f'hits: {stats["hits"]}, misses: {stats["misses"]}, hit rate: {rate}')
+
+        if options['reset']:
+            reset_card_cache_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset.'))
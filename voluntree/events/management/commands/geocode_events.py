@@ -0,0 +1,46 @@
+# events/management/commands/geocode_events.py
+
+import time
+from django.core.management.base import BaseCommand
+from events.geocoding import get_geocoder
+from events.models import Event
+
+
+class Command(BaseCommand):
+    help = 'Fill in latitude/longitude for events using the configured geocoder'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true',
+                            help='Re-geocode every event, not only those without coordinates')
+        parser.add_argument('--delay', type=float, default=None,
+                            help="Seconds between lookups (default: the geocoder's limit, 1 for Nominatim)")
+
+    def handle(self, *args, **options):
+        events = Event.objects.all() if options['all'] else Event.objects.filter(latitude__isnull=True)
+        delay = options['delay']
+        if delay is None:
+            delay = get_geocoder().min_interval
+
+        resolved = unresolved = failed = 0
+        for index, event in enumerate(events.only('pk', 'location').iterator(chunk_size=500)):
+            if index and delay:
+                time.sleep(delay)
+            try:
+                event.geocode()
+            except Exception as exc:
+                # One bad lookup must not abort the backfill; a rerun picks it up again
+                self.stdout.write(self.style.WARNING(f'Failed: event {event.pk} ({event.location}): {exc}'))
+                failed += 1
+                continue
+            # Plain UPDATE: leaves updated_at and the save() signals alone
+            Event.objects.filter(pk=event.pk).update(latitude=event.latitude, longitude=event.longitude)
+            if event.latitude is None:
+                unresolved += 1
+            else:
+                resolved += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Geocoded {resolved} event(s).'))
+        if unresolved:
+            self.stdout.write(self.style.WARNING(f'{unresolved} location(s) could not be resolved.'))
+        if failed:
+            self.stdout.write(self.style.WARNING(f'{failed} lookup(s) failed; run the command again to retry them.'))
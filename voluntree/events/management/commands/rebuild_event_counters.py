@@ -0,0 +1,55 @@
+# events/management/commands/rebuild_event_counters.py
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from events.cards import invalidate_event_card
+from events.models import Event, EventRegistration
+
+
+def _counted(status):
+    """Correlated subquery counting one event's registrations in a status"""
+    return Coalesce(Subquery(
+        EventRegistration.objects.filter(event=OuterRef('pk'), status=status)
+        .order_by().values('event').annotate(total=Count('pk')).values('total')
+    ), 0)
+
+
+class Command(BaseCommand):
+    help = 'Rebuild (or verify) the denormalized approved/pending counters on Event'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Only report events whose counters drifted, do not write anything',
+        )
+
+    def handle(self, *args, **options):
+        drifted = Event.objects.with_counted_stats().filter(
+            ~Q(approved_count=F('counted_approved')) | ~Q(pending_count=F('counted_pending'))
+        ).values_list('pk', 'approved_count', 'counted_approved', 'pending_count', 'counted_pending')
+
+        mismatches = list(drifted)
+        for pk, approved, counted_approved, pending, counted_pending in mismatches:
+            self.stdout.write(
+                f'Event {pk}: approved {approved} -> {counted_approved}, pending {pending} -> {counted_pending}'
+            )
+
+        if options['verify']:
+            if mismatches:
+                self.stdout.write(self.style.WARNING(f'{len(mismatches)} event(s) have drifted counters.'))
+            else:
+                self.stdout.write(self.style.SUCCESS('All event counters are in sync.'))
+            return
+
+        # Recount inside the UPDATE so registrations made since the scan are included
+        event_ids = [row[0] for row in mismatches]
+        Event.objects.filter(pk__in=event_ids).update(
+            approved_count=_counted('approved'),
+            pending_count=_counted('pending'),
+        )
+        for event_id in event_ids:
+            invalidate_event_card(event_id)
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt counters for {len(mismatches)} event(s).'))
@@ -0,0 +1,17 @@
+# events/management/commands/rebuild_search_index.py
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from events.models import Event
+from events.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for all events'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        with transaction.atomic():
+            count = backend.rebuild(Event.objects.all())
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} event(s) with {type(backend).__name__}.'))
@@ -0,0 +1,25 @@
+# events/management/commands/send_event_reminders.py
+
+from django.core.management.base import BaseCommand
+from events.reminders import REMINDER_BATCH_SIZE, send_event_reminders
+
+
+class Command(BaseCommand):
+    help = ('Queue reminder emails for approved volunteers of events starting soon '
+            '(honors PlatformSettings.send_event_reminders). Safe to run from cron as often as needed.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int,
+                            help='Remind of events starting within this many hours (default from platform settings)')
+        parser.add_argument('--batch-size', type=int, default=REMINDER_BATCH_SIZE,
+                            help=f'Reminders queued per transaction (default {REMINDER_BATCH_SIZE})')
+
+    def handle(self, *args, **options):
+        result = send_event_reminders(hours=options['hours'], batch_size=options['batch_size'])
+
+        if not result['enabled']:
+            self.stdout.write(self.style.WARNING('Event reminders are turned off in platform settings.'))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['sent']} reminder(s) queued, {result['skipped']} skipped for inactive accounts."
+        ))
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:45
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_counters(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    EventRegistration = apps.get_model('events', 'EventRegistration')
+
+    def counted(status):
+        return Coalesce(Subquery(
+            EventRegistration.objects.filter(event=OuterRef('pk'), status=status)
+            .order_by().values('event').annotate(total=Count('pk')).values('total')
+        ), 0)
+
+    Event.objects.update(approved_count=counted('approved'), pending_count=counted('pending'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='approved_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='pending_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
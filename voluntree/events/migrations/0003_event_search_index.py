@@ -0,0 +1,60 @@
+# Full-text search side index for events (see events/search.py)
+
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    Event = apps.get_model('events', 'Event')
+
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA compile_options')
+            if 'ENABLE_FTS5' not in {row[0] for row in cursor.fetchall()}:
+                return  # falls back to icontains search
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE events_event_fts USING fts5("
+            "title, description, location, organization, tokenize='unicode61 remove_diacritics 2')"
+        )
+        for event in Event.objects.select_related('ngo').iterator():
+            schema_editor.execute(
+                'INSERT INTO events_event_fts (rowid, title, description, location, organization) '
+                'VALUES (%s, %s, %s, %s, %s)',
+                [event.pk, event.title, event.description, event.location, event.ngo.organization_name],
+            )
+
+    elif connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE TABLE events_event_search ('
+            'event_id bigint PRIMARY KEY REFERENCES events_event (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, '
+            'document tsvector NOT NULL)'
+        )
+        schema_editor.execute('CREATE INDEX events_event_search_document ON events_event_search USING GIN (document)')
+        schema_editor.execute(
+            "INSERT INTO events_event_search (event_id, document) "
+            "SELECT e.id, setweight(to_tsvector('simple', e.title), 'A') || "
+            "setweight(to_tsvector('simple', e.description), 'C') || "
+            "setweight(to_tsvector('simple', e.location), 'B') || "
+            "setweight(to_tsvector('simple', n.organization_name), 'B') "
+            "FROM events_event e JOIN accounts_ngo n ON n.id = e.ngo_id"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS events_event_fts')
+    elif connection.vendor == 'postgresql':
+        schema_editor.execute('DROP TABLE IF EXISTS events_event_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('events', '0002_event_registration_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:57
+
+from django.db import migrations, models
+
+
+def _tags_for(Skill, cache, text):
+    """Skills for a comma-separated string, creating missing ones"""
+    tags = []
+    for name in (item.strip() for item in (text or '').split(',')):
+        key = ' '.join(name.split()).casefold()
+        if not key:
+            continue
+        if key not in cache:
+            cache[key], _ = Skill.objects.get_or_create(canonical_name=key, defaults={'name': ' '.join(name.split())})
+        tags.append(cache[key])
+    return tags
+
+
+def populate_event_tags(apps, schema_editor):
+    Skill = apps.get_model('accounts', 'Skill')
+    Event = apps.get_model('events', 'Event')
+    cache = {}
+    for event in Event.objects.iterator():
+        event.skill_tags.set(_tags_for(Skill, cache, event.required_skills))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_skill'),
+        ('events', '0004_event_date_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='skill_tags',
+            field=models.ManyToManyField(blank=True, related_name='events', to='accounts.skill'),
+        ),
+        migrations.RunPython(populate_event_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_event_skill_tags'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
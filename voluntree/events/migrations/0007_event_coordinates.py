@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_skill'),
+        ('events', '0006_event_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['latitude', 'longitude'], name='events_event_lat_lng_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_event_coordinates'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='last_waitlist_position',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='eventregistration',
+            name='waitlist_position',
+            field=models.IntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='eventregistration',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('withdrawn', 'Withdrawn'), ('waitlisted', 'Waitlisted')], default='pending', max_length=20),
+        ),
+        migrations.AddConstraint(
+            model_name='eventregistration',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'waitlisted')), fields=('event', 'waitlist_position'), name='events_registration_waitlist_position'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_skill'),
+        ('events', '0008_registration_waitlist'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['status', 'date'], name='events_event_status_date_idx'),
+        ),
+    ]
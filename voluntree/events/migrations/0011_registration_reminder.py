@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0010_calendar_feed'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventregistration',
+            name='reminder_sent_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='eventregistration',
+            index=models.Index(condition=models.Q(('reminder_sent_at__isnull', True), ('status', 'approved')), fields=['event'], name='events_registration_reminder'),
+        ),
+    ]
@@ -1,10 +1,124 @@
 # events/models.py
 
-from django.db import models
+import secrets
+from functools import partial
+from django.db import models, transaction
+from django.db.models import Count, F, Q
+from django.dispatch import Signal
 from django.utils import timezone
-from accounts.models import User, NGO
+from accounts.models import User, NGO, Skill, SkillTagsMixin
+from .geocoding import bounding_box, distance_expression, get_geocoder
 
-class Event(models.Model):
+# Registration status -> denormalized counter column on Event
+COUNTER_FIELDS = {
+    'approved': 'approved_count',
+    'pending': 'pending_count',
+}
+
+
+# Moved only by F() updates; saving a stale Event instance must not rewind them
+DENORMALIZED_FIELDS = ('approved_count', 'pending_count', 'last_waitlist_position')
+
+
+class EventFullError(Exception):
+    """Raised when approving a registration would exceed max_volunteers"""
+
+
+# Sent by EventRegistration.change_status() and the Event bulk actions,
+# whose UPDATEs bypass post_save
+registration_status_changed = Signal()
+
+BULK_APPROVE_ATTEMPTS = 3
+
+
+class _CapacityChanged(Exception):
+    """Internal: the counters moved between reading and reserving spots"""
+
+
+def promote_waitlisted(event_id):
+    """
+    Fill an event's free spots from the head of its waitlist.
+
+    The head is found with one lookup on the (event, waitlist_position)
+    index, and each promotion is a capacity-guarded approval, so two
+    requests freeing spots at once can never overfill the event.
+    Returns the promoted registrations.
+    """
+    promoted = []
+    while True:
+        head = EventRegistration.objects.filter(
+            event_id=event_id, status='waitlisted'
+        ).order_by('waitlist_position').first()
+        if head is None:
+            break
+        try:
+            if head.change_status('approved', enforce_capacity=True):
+                promoted.append(head)
+        except EventFullError:
+            break
+    return promoted
+
+
+def _next_waitlist_position(event_id):
+    """Take the next position in an event's waitlist (call inside a transaction)"""
+    events = Event.objects.filter(pk=event_id)
+    # The UPDATE locks the event row until the transaction ends
+    events.update(last_waitlist_position=F('last_waitlist_position') + 1)
+    return events.values_list('last_waitlist_position', flat=True).get()
+
+
+def _send_status_changed(event, rows, previous_status, status):
+    """registration_status_changed for each (pk, volunteer_id) moved in bulk"""
+    for pk, volunteer_id in rows:
+        registration = EventRegistration(pk=pk, event=event, volunteer_id=volunteer_id, status=status)
+        registration._saved_status = status
+        registration_status_changed.send(
+            sender=EventRegistration, instance=registration, previous_status=previous_status
+        )
+
+
+class EventQuerySet(models.QuerySet):
+
+    def with_stats(self):
+        """Annotate available spots from the denormalized counters"""
+        return self.annotate(annotated_available=F('max_volunteers') - F('approved_count'))
+
+    def with_counted_stats(self):
+        """Aggregate the real approved/pending counts from registrations"""
+        return self.annotate(
+            counted_approved=Count('registrations', filter=Q(registrations__status='approved')),
+            counted_pending=Count('registrations', filter=Q(registrations__status='pending')),
+        )
+
+    def near(self, latitude, longitude, radius_km):
+        """
+        Events within radius_km of a point, annotated with `distance` in km.
+
+        The bounding box lets the (latitude, longitude) index discard most
+        rows before the exact haversine distance is computed.
+        """
+        min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius_km)
+        events = self.filter(latitude__range=(min_lat, max_lat))
+        if min_lng is not None:
+            events = events.filter(longitude__range=(min_lng, max_lng))
+        return events.annotate(distance=distance_expression(latitude, longitude)).filter(distance__lte=radius_km)
+
+    def adjust_counters(self, old_status, new_status):
+        """Move one registration between counters with F() expressions"""
+        old_field = COUNTER_FIELDS.get(old_status)
+        new_field = COUNTER_FIELDS.get(new_status)
+        if old_field == new_field:
+            return 0
+
+        deltas = {}
+        if old_field:
+            deltas[old_field] = F(old_field) - 1
+        if new_field:
+            deltas[new_field] = F(new_field) + 1
+        return self.update(**deltas)
+
+
+class Event(SkillTagsMixin, models.Model):
     STATUS_CHOICES = (
         ('published', 'Published'),
         ('ongoing', 'Ongoing'),
@@ -17,26 +131,77 @@ class Event(models.Model):
     image = models.ImageField(upload_to='events/', blank=True, null=True)
     date = models.DateTimeField()
     location = models.CharField(max_length=300)
+    # Filled from location by the configured geocoder on save
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
     required_skills = models.TextField(blank=True, help_text="Comma-separated skills")
+    skill_tags = models.ManyToManyField(Skill, blank=True, related_name='events')
     max_volunteers = models.IntegerField()
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='published')
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    # Denormalized registration counters, kept in sync by EventRegistration.save()
+    # and rebuilt by the rebuild_event_counters management command
+    approved_count = models.IntegerField(default=0, editable=False)
+    pending_count = models.IntegerField(default=0, editable=False)
+    # Last position handed out on the waitlist; positions only ever grow
+    last_waitlist_position = models.IntegerField(default=0, editable=False)
+
+    objects = EventQuerySet.as_manager()
+
+    skill_tag_fields = {'required_skills': 'skill_tags'}
+
+    # Location the coordinates were last geocoded from
+    _geocoded_location = None
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._geocoded_location = instance.__dict__.get('location')
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Save; a changed location clears the coordinates and queues geocode_event"""
+        update_fields = kwargs.get('update_fields')
+        relocated = self.location != self._geocoded_location and (update_fields is None or 'location' in update_fields)
+        if relocated:
+            self.latitude = self.longitude = None
+            self._geocoded_location = self.location
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'latitude', 'longitude'}
+        if update_fields is None and not self._state.adding:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in DENORMALIZED_FIELDS
+            ]
+        super().save(*args, **kwargs)
+        if relocated:
+            from .tasks import geocode_event
+            # On commit: the worker must see the new location, and a rolled back save geocodes nothing
+            transaction.on_commit(partial(geocode_event.delay, self.pk))
+
+    def geocode(self):
+        """Set latitude/longitude from the location (None if it cannot be resolved; GeocoderError if unreachable)"""
+        self.latitude, self.longitude = get_geocoder().geocode(self.location) or (None, None)
+        self._geocoded_location = self.location
+
     def get_registered_count(self):
         """Count approved volunteers"""
-        return self.registrations.filter(status='approved').count()
+        return self.approved_count
 
     def get_pending_count(self):
         """Count pending applications"""
-        return self.registrations.filter(status='pending').count()
+        return self.pending_count
 
     def get_available_spots(self):
-        """Calculate remaining spots"""
-        return self.max_volunteers - self.get_registered_count()
+        """Calculate remaining spots (uses with_stats() annotation when present)"""
+        if hasattr(self, 'annotated_available'):
+            return self.annotated_available
+        return self.max_volunteers - self.approved_count
 
     def is_full(self):
         """Check if event is at capacity"""
@@ -46,6 +211,81 @@ class Event(models.Model):
         """Check if event date has passed"""
         return self.date < timezone.now()
 
+    def approve_registrations(self, registration_ids):
+        """
+        Approve pending registrations in bulk, as many as capacity allows.
+
+        Remaining capacity is read once with the event row locked, the
+        earliest applicants up to that capacity are approved with a single
+        UPDATE, and the counter update is guarded so a concurrent approval
+        can never push approved_count past max_volunteers.
+        Returns (approved_ids, overflow_ids); ids that are not pending
+        registrations of this event appear in neither.
+        """
+        for _ in range(BULK_APPROVE_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    return self._approve_within_capacity(registration_ids)
+            except _CapacityChanged:
+                continue
+        raise EventFullError(f'Capacity of event {self.pk} kept changing; try again.')
+
+    def _approve_within_capacity(self, registration_ids):
+        event = Event.objects.select_for_update().only('max_volunteers', 'approved_count').get(pk=self.pk)
+        pending = list(
+            self.registrations.filter(pk__in=registration_ids, status='pending')
+            .order_by('applied_at', 'pk').values_list('pk', 'volunteer_id')
+        )
+        room = max(event.max_volunteers - event.approved_count, 0)
+        chosen, overflow = pending[:room], pending[room:]
+        if not chosen:
+            return [], [pk for pk, _ in overflow]
+
+        chosen_ids = [pk for pk, _ in chosen]
+        claimed = EventRegistration.objects.filter(pk__in=chosen_ids, status='pending').update(
+            status='approved', updated_at=timezone.now()
+        )
+        reserved = Event.objects.filter(
+            pk=self.pk, approved_count__lte=F('max_volunteers') - claimed
+        ).update(approved_count=F('approved_count') + claimed, pending_count=F('pending_count') - claimed)
+        if claimed != len(chosen_ids) or not reserved:
+            # Someone else approved or withdrew in between: roll back and re-read
+            raise _CapacityChanged
+
+        self._refresh_counters()
+        _send_status_changed(self, chosen, 'pending', 'approved')
+        return chosen_ids, [pk for pk, _ in overflow]
+
+    def reject_registrations(self, registration_ids):
+        """Reject pending registrations in bulk with one UPDATE; returns the rejected ids"""
+        with transaction.atomic():
+            pending = list(
+                self.registrations.select_for_update().filter(pk__in=registration_ids, status='pending')
+                .values_list('pk', 'volunteer_id')
+            )
+            if not pending:
+                return []
+            ids = [pk for pk, _ in pending]
+            rejected = EventRegistration.objects.filter(pk__in=ids, status='pending').update(
+                status='rejected', updated_at=timezone.now()
+            )
+            Event.objects.filter(pk=self.pk).update(pending_count=F('pending_count') - rejected)
+
+        self._refresh_counters()
+        _send_status_changed(self, pending, 'pending', 'rejected')
+        return ids
+
+    def promote_waitlisted(self):
+        """Move waitlisted volunteers into any free spots, e.g. after raising max_volunteers"""
+        promoted = promote_waitlisted(self.pk)
+        if promoted:
+            self._refresh_counters()
+        return promoted
+
+    def _refresh_counters(self):
+        self.refresh_from_db(fields=['approved_count', 'pending_count'])
+        self.__dict__.pop('annotated_available', None)
+
     # ADD THESE TWO METHODS HERE (INSIDE THE CLASS)
     def has_certificate(self):
         """Check if event has a certificate uploaded"""
@@ -59,6 +299,14 @@ class Event(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination of the public listing
+            models.Index(fields=['date', 'id'], name='events_event_date_id_idx'),
+            # Bounding-box prefilter for EventQuerySet.near()
+            models.Index(fields=['latitude', 'longitude'], name='events_event_lat_lng_idx'),
+            # Candidates of the status lifecycle job (events/lifecycle.py)
+            models.Index(fields=['status', 'date'], name='events_event_status_date_idx'),
+        ]
 
 
 class EventRegistration(models.Model):
@@ -67,6 +315,7 @@ class EventRegistration(models.Model):
         ('approved', 'Approved'),
         ('rejected', 'Rejected'),
         ('withdrawn', 'Withdrawn'),
+        ('waitlisted', 'Waitlisted'),
     )
 
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='registrations')
@@ -74,10 +323,165 @@ class EventRegistration(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     applied_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Place in the event's waitlist, set only while status is 'waitlisted'
+    waitlist_position = models.IntegerField(null=True, blank=True, editable=False)
+    # When the reminder email was queued (see events/reminders.py)
+    reminder_sent_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    # Status as last loaded from / written to the database
+    _saved_status = None
 
     def __str__(self):
         return f"{self.volunteer.username} - {self.event.title}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_status = instance.__dict__.get('status')
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        Save and move the event's approved/pending counters atomically.
+
+        Joining the waitlist takes the next position; freeing an approved
+        spot (or joining while a spot is free) promotes the head of the
+        waitlist in the same transaction.
+        """
+        with transaction.atomic():
+            previous_status = self._saved_status
+            if previous_status is None and not self._state.adding:
+                previous_status = EventRegistration.objects.filter(
+                    pk=self.pk
+                ).values_list('status', flat=True).first()
+
+            if self.status == 'waitlisted':
+                if self.waitlist_position is None:
+                    self.waitlist_position = _next_waitlist_position(self.event_id)
+            else:
+                self.waitlist_position = None
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'status' in update_fields:
+                kwargs['update_fields'] = {*update_fields, 'waitlist_position'}
+
+            super().save(*args, **kwargs)
+            changed = Event.objects.filter(pk=self.event_id).adjust_counters(previous_status, self.status)
+            self._saved_status = self.status
+
+            freed_spot = previous_status == 'approved' and self.status != 'approved'
+            joined_waitlist = self.status == 'waitlisted' and previous_status != 'waitlisted'
+            if freed_spot or joined_waitlist:
+                for promoted in promote_waitlisted(self.event_id):
+                    if promoted.pk == self.pk:
+                        self.status = self._saved_status = promoted.status
+                        self.waitlist_position = None
+                        changed = True
+
+        if changed:
+            self._refresh_cached_event()
+
+    def change_status(self, status, enforce_capacity=False):
+        """
+        Atomically move this registration to a new status.
+
+        The status write is a compare-and-swap against the status this
+        instance was loaded with, and with enforce_capacity an approval
+        reserves its spot through a conditional UPDATE on the event, so
+        concurrent requests can never push approved_count past
+        max_volunteers. Returns False if another request changed the
+        registration first; raises EventFullError if no spot is left.
+        """
+        previous_status = self._saved_status
+        if previous_status == status:
+            return True
+
+        with transaction.atomic():
+            changes = {'status': status, 'updated_at': timezone.now()}
+            if previous_status == 'waitlisted':
+                changes['waitlist_position'] = None
+            claimed = EventRegistration.objects.filter(pk=self.pk, status=previous_status).update(**changes)
+            if not claimed:
+                self.refresh_from_db(fields=['status', 'updated_at'])
+                self._saved_status = self.status
+                return False
+
+            events = Event.objects.filter(pk=self.event_id)
+            if enforce_capacity and status == 'approved':
+                events = events.filter(approved_count__lt=F('max_volunteers'))
+                if not events.adjust_counters(previous_status, status):
+                    # Rolls back the status write above
+                    raise EventFullError(f'Event {self.event_id} is at full capacity.')
+            else:
+                events.adjust_counters(previous_status, status)
+
+            self.status = self._saved_status = status
+            if previous_status == 'waitlisted':
+                self.waitlist_position = None
+            if previous_status == 'approved':
+                # The freed spot goes to the head of the waitlist
+                promote_waitlisted(self.event_id)
+
+        self._refresh_cached_event()
+        registration_status_changed.send(sender=EventRegistration, instance=self, previous_status=previous_status)
+        return True
+
+    def get_waitlist_rank(self):
+        """1-based place in the waitlist, or None when not waitlisted"""
+        if self.status != 'waitlisted' or self.waitlist_position is None:
+            return None
+        return EventRegistration.objects.filter(
+            event_id=self.event_id, status='waitlisted', waitlist_position__lte=self.waitlist_position
+        ).count()
+
+    def _refresh_cached_event(self):
+        """Keep an already loaded event instance in step with the database"""
+        if self._meta.get_field('event').is_cached(self):
+            self.event.refresh_from_db(fields=['approved_count', 'pending_count'])
+
     class Meta:
         unique_together = ('event', 'volunteer')
-        ordering = ['-applied_at']
\ No newline at end of file
+        ordering = ['-applied_at']
+        constraints = [
+            # Partial, so it only covers the waitlist: finding the head of an
+            # event's queue is a single index seek however many applied
+            models.UniqueConstraint(
+                fields=['event', 'waitlist_position'],
+                condition=Q(status='waitlisted'),
+                name='events_registration_waitlist_position',
+            ),
+        ]
+        indexes = [
+            # Registrations still owed a reminder; entries drop out as reminders are sent
+            models.Index(
+                fields=['event'],
+                condition=Q(status='approved', reminder_sent_at__isnull=True),
+                name='events_registration_reminder',
+            ),
+        ]
+
+
+class CalendarFeed(models.Model):
+    """Secret token of a user's iCalendar feed URL (see events/calendar.py)"""
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='calendar_feed')
+    token = models.CharField(max_length=64, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Calendar feed of {self.user.username}"
+
+    @staticmethod
+    def new_token():
+        return secrets.token_urlsafe(32)
+
+    @classmethod
+    def for_user(cls, user):
+        feed, created = cls.objects.get_or_create(user=user, defaults={'token': cls.new_token()})
+        return feed
+
+    def regenerate(self):
+        """Issue a new token; the old feed URL stops working"""
+        old_token = self.token
+        self.token = self.new_token()
+        self.save(update_fields=['token'])
+        return old_token
@@ -0,0 +1,87 @@
+# events/pagination.py
+
+"""
+Keyset (cursor) pagination.
+
+Instead of OFFSET, each page is fetched with a WHERE clause that starts
+right after the last row of the previous page, so page 500 costs the same
+as page 1 as long as the ordering columns are indexed. The ordering must
+end in a unique column (the primary key) to be a total order.
+"""
+
+import base64
+import datetime
+import json
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded for the given ordering"""
+
+
+def _encode_value(value):
+    # Full precision: DjangoJSONEncoder would drop microseconds
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    raise TypeError(f'Cannot encode {type(value).__name__} in a cursor')
+
+
+class KeysetPaginator:
+
+    def __init__(self, queryset, ordering, page_size):
+        self.queryset = queryset
+        self.ordering = list(ordering)
+        self.page_size = page_size
+
+    def _field_name(self, key):
+        return key.lstrip('-')
+
+    def _to_python(self, key, value):
+        name = self._field_name(key)
+        try:
+            field = self.queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # Annotations such as search_rank are plain numbers
+            return value
+        return field.to_python(value)
+
+    def encode_cursor(self, obj):
+        values = [getattr(obj, self._field_name(key)) for key in self.ordering]
+        raw = json.dumps(values, default=_encode_value, separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise InvalidCursor(cursor)
+            return [self._to_python(key, value) for key, value in zip(self.ordering, values)]
+        except (ValueError, TypeError, ValidationError) as exc:
+            raise InvalidCursor(cursor) from exc
+
+    def _after(self, values):
+        """WHERE clause for rows strictly after the given key values"""
+        condition = Q()
+        for index, key in enumerate(self.ordering):
+            name = self._field_name(key)
+            lookup = 'lt' if key.startswith('-') else 'gt'
+            step = Q(**{f'{name}__{lookup}': values[index]})
+            for previous_key, previous_value in zip(self.ordering[:index], values[:index]):
+                step &= Q(**{self._field_name(previous_key): previous_value})
+            condition |= step
+        return condition
+
+    def page(self, cursor=None):
+        """Return (items, next_cursor); next_cursor is None on the last page"""
+        queryset = self.queryset.order_by(*self.ordering)
+        if cursor:
+            queryset = queryset.filter(self._after(self.decode_cursor(cursor)))
+
+        # One extra row tells us whether another page exists
+        items = list(queryset[:self.page_size + 1])
+        has_next = len(items) > self.page_size
+        items = items[:self.page_size]
+        next_cursor = self.encode_cursor(items[-1]) if has_next else None
+        return items, next_cursor
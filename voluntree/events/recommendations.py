@@ -0,0 +1,312 @@
+# events/recommendations.py
+
+"""
+"Recommended for you" scoring.
+
+Every upcoming event is a sparse feature row (required skills, city parts of
+its location, organizing NGO) stored in COO form as NumPy arrays. A
+volunteer is a dense weight vector over the same feature columns, built from
+their skills, interests, city and past registrations. Scoring all events is
+then one gather, one multiply and one np.bincount, with no per-event Python.
+
+The event matrix is built once per process and then synced incrementally:
+changed events get a fresh row appended and their old row masked out, and
+the arrays are compacted once enough dead rows pile up.
+
+Volunteer vectors are kept in a per-process LRU of VOLUNTEER_CACHE_SIZE
+entries, keyed on a per-volunteer version token, the profile's updated_at
+and the number of feature columns. The signals in events/signals.py
+replace the token when the profile, its tags or the volunteer's
+registrations change. Like the event card versions, tokens live in the
+shared cache, so a change made in one process reaches the others.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+from accounts.models import canonical_skill_name
+from .models import Event, EventRegistration
+
+# Volunteer-side weights per kind of match
+SKILL_WEIGHT = 3.0
+INTEREST_WEIGHT = 2.0
+CITY_WEIGHT = 2.5
+PAST_NGO_WEIGHT = 1.5
+PAST_SKILL_WEIGHT = 1.0
+
+# Compact the arrays when this share of rows is dead
+COMPACT_RATIO = 0.25
+
+# Volunteer weight vectors kept per process, least recently used dropped first
+VOLUNTEER_CACHE_SIZE = 1000
+
+
+def _volunteer_version_key(user_id):
+    return f'recommendation-volunteer-version:{user_id}'
+
+
+def location_parts(location):
+    """Comma-separated parts of a free-text location, canonicalized"""
+    return {canonical_skill_name(part) for part in location.split(',') if part.strip()}
+
+
+class EventFeatureIndex:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.columns = {}
+        self._reset()
+
+    def _reset(self):
+        self.entry_rows = np.empty(0, dtype=np.int64)
+        self.entry_cols = np.empty(0, dtype=np.int64)
+        self.entry_vals = np.empty(0, dtype=np.float64)
+        self.event_ids = np.empty(0, dtype=np.int64)
+        self.event_dates = np.empty(0, dtype=np.float64)
+        self.alive = np.empty(0, dtype=bool)
+        self.positions = {}
+        self.dirty = set()
+        self.synced_at = None
+
+    def column(self, key):
+        """Column for a feature key, allocating a new one on first sight"""
+        column = self.columns.get(key)
+        if column is None:
+            column = self.columns[key] = len(self.columns)
+        return column
+
+    # ---- building -------------------------------------------------------
+
+    def _fetch(self, events):
+        """(id, ngo_id, location, timestamp, skill_ids) for events still open to volunteers"""
+        rows = list(
+            events.filter(date__gte=timezone.now()).exclude(status='completed')
+            .values_list('id', 'ngo_id', 'location', 'date')
+        )
+        skills = {}
+        through = Event.skill_tags.through.objects.filter(event_id__in=[row[0] for row in rows])
+        for event_id, skill_id in through.values_list('event_id', 'skill_id').iterator(chunk_size=5000):
+            skills.setdefault(event_id, []).append(skill_id)
+        return [
+            (event_id, ngo_id, location, date.timestamp(), skills.get(event_id, []))
+            for event_id, ngo_id, location, date in rows
+        ]
+
+    def add_events(self, records):
+        """Append one row per record, masking out any earlier row for the same event"""
+        if not records:
+            return
+
+        rows, cols, vals = [], [], []
+        start = len(self.event_ids)
+        for offset, (event_id, ngo_id, location, timestamp, skill_ids) in enumerate(records):
+            row = start + offset
+            old = self.positions.get(event_id)
+            if old is not None:
+                self.alive[old] = False
+            self.positions[event_id] = row
+
+            if skill_ids:
+                # Scale by 1/sqrt(n) so events listing many skills are not favoured
+                weight = 1.0 / math.sqrt(len(skill_ids))
+                for skill_id in skill_ids:
+                    rows.append(row)
+                    cols.append(self.column(('skill', skill_id)))
+                    vals.append(weight)
+            for part in location_parts(location):
+                rows.append(row)
+                cols.append(self.column(('city', part)))
+                vals.append(1.0)
+            rows.append(row)
+            cols.append(self.column(('ngo', ngo_id)))
+            vals.append(1.0)
+
+        self.entry_rows = np.concatenate([self.entry_rows, np.asarray(rows, dtype=np.int64)])
+        self.entry_cols = np.concatenate([self.entry_cols, np.asarray(cols, dtype=np.int64)])
+        self.entry_vals = np.concatenate([self.entry_vals, np.asarray(vals, dtype=np.float64)])
+        self.event_ids = np.concatenate([self.event_ids, np.fromiter((r[0] for r in records), np.int64)])
+        self.event_dates = np.concatenate([self.event_dates, np.fromiter((r[3] for r in records), np.float64)])
+        self.alive = np.concatenate([self.alive, np.ones(len(records), dtype=bool)])
+
+    def remove_events(self, event_ids):
+        for event_id in event_ids:
+            row = self.positions.pop(event_id, None)
+            if row is not None:
+                self.alive[row] = False
+
+    def compact(self):
+        """Drop dead rows and renumber the live ones"""
+        keep = np.flatnonzero(self.alive)
+        renumber = np.full(len(self.alive), -1, dtype=np.int64)
+        renumber[keep] = np.arange(len(keep))
+
+        entries = self.alive[self.entry_rows]
+        self.entry_rows = renumber[self.entry_rows[entries]]
+        self.entry_cols = self.entry_cols[entries]
+        self.entry_vals = self.entry_vals[entries]
+        self.event_ids = self.event_ids[keep]
+        self.event_dates = self.event_dates[keep]
+        self.alive = np.ones(len(keep), dtype=bool)
+        self.positions = {int(event_id): row for row, event_id in enumerate(self.event_ids)}
+
+    def mark_dirty(self, event_id):
+        self.dirty.add(event_id)
+
+    def sync(self):
+        """Bring the matrix up to date with the events table"""
+        with self._lock:
+            started = timezone.now()
+            if self.synced_at is None:
+                self._reset()
+                self.add_events(self._fetch(Event.objects.all()))
+            else:
+                # Events saved by any process since the last sync, plus local signals
+                condition = Q(updated_at__gte=self.synced_at)
+                if self.dirty:
+                    condition |= Q(pk__in=self.dirty)
+                dirty, self.dirty = self.dirty, set()
+                changed = Event.objects.filter(condition)
+                records = self._fetch(changed)
+                # Deleted events, and ones that no longer qualify (completed, moved into the past)
+                gone = (dirty | set(changed.values_list('pk', flat=True))) - {record[0] for record in records}
+                self.remove_events(gone)
+                self.add_events(records)
+
+            if len(self.alive) and (~self.alive).sum() > COMPACT_RATIO * len(self.alive):
+                self.compact()
+            self.synced_at = started
+
+    # ---- scoring --------------------------------------------------------
+
+    def _snapshot(self):
+        """
+        The arrays as of one moment, for scoring. sync() replaces them (and
+        masks rows in place) from other threads, so they are read together
+        under the lock; `alive` is copied because it is written in place.
+        """
+        with self._lock:
+            return (self.entry_rows, self.entry_cols, self.entry_vals, self.event_ids, self.event_dates,
+                    self.alive.copy(), len(self.columns))
+
+    def score(self, weights, exclude_ids=(), limit=10, now=None):
+        """Top `limit` (event_id, score) pairs for a volunteer weight vector"""
+        entry_rows, entry_cols, entry_vals, event_ids, event_dates, alive, column_count = self._snapshot()
+        size = len(event_ids)
+        if not size:
+            return []
+
+        vector = np.zeros(column_count, dtype=np.float64)
+        vector[:len(weights)] = weights[:column_count]
+        scores = np.bincount(entry_rows, weights=entry_vals * vector[entry_cols], minlength=size)
+
+        now = (now or timezone.now()).timestamp()
+        valid = alive & (event_dates >= now) & (scores > 0)
+        if len(exclude_ids):
+            valid &= ~np.isin(event_ids, np.asarray(list(exclude_ids), dtype=np.int64))
+        candidates = np.flatnonzero(valid)
+        if not len(candidates):
+            return []
+
+        if len(candidates) > limit:
+            top = np.argpartition(-scores[candidates], limit - 1)[:limit]
+            candidates = candidates[top]
+        # Best first, soonest first on ties
+        order = np.lexsort((event_dates[candidates], -scores[candidates]))
+        candidates = candidates[order]
+        return [(int(event_ids[row]), float(scores[row])) for row in candidates]
+
+    def volunteer_weights(self, profile):
+        """Dense weight vector over the known feature columns for one volunteer"""
+        weights = np.zeros(len(self.columns), dtype=np.float64)
+
+        def bump(key, amount):
+            column = self.columns.get(key)
+            if column is not None:
+                weights[column] += amount
+
+        for skill_id in profile.skill_tags.values_list('pk', flat=True):
+            bump(('skill', skill_id), SKILL_WEIGHT)
+        for skill_id in profile.interest_tags.values_list('pk', flat=True):
+            bump(('skill', skill_id), INTEREST_WEIGHT)
+        if profile.city:
+            bump(('city', canonical_skill_name(profile.city)), CITY_WEIGHT)
+
+        # History: NGOs and skills of events the volunteer was approved for
+        history = EventRegistration.objects.filter(volunteer_id=profile.user_id, status='approved')
+        for ngo_id in history.values_list('event__ngo_id', flat=True).distinct():
+            bump(('ngo', ngo_id), PAST_NGO_WEIGHT)
+        past_skills = Event.skill_tags.through.objects.filter(
+            event__registrations__in=history
+        ).values_list('skill_id', flat=True).distinct()
+        for skill_id in past_skills:
+            bump(('skill', skill_id), PAST_SKILL_WEIGHT)
+        return weights
+
+
+class Recommender:
+    """Process-wide event index plus an LRU cache of volunteer weight vectors"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Drop everything; the next request rebuilds from the database"""
+        self.index = EventFeatureIndex()
+        self._volunteer_cache = OrderedDict()
+        self._volunteer_lock = threading.Lock()
+
+    def invalidate_event(self, event_id):
+        self.index.mark_dirty(event_id)
+
+    def invalidate_volunteer(self, user_id):
+        """Orphan the volunteer's cached vector in every process by giving it a new version"""
+        cache.set(_volunteer_version_key(user_id), time.time_ns(), None)
+
+    def _volunteer_version(self, user_id):
+        key = _volunteer_version_key(user_id)
+        version = cache.get(key)
+        if version is None:
+            # Missing (or evicted): start fresh so no process can reuse an old vector
+            version = time.time_ns()
+            cache.add(key, version, None)
+            version = cache.get(key, version)
+        return version
+
+    def volunteer_weights(self, profile):
+        """The volunteer's weight vector, from the LRU while it is current"""
+        # New feature columns may have appeared since the vector was built
+        key = (self._volunteer_version(profile.user_id), profile.updated_at, len(self.index.columns))
+        with self._volunteer_lock:
+            cached = self._volunteer_cache.get(profile.user_id)
+            if cached is not None and cached[0] == key:
+                self._volunteer_cache.move_to_end(profile.user_id)
+                return cached[1]
+
+        weights = self.index.volunteer_weights(profile)
+        with self._volunteer_lock:
+            self._volunteer_cache[profile.user_id] = (key, weights)
+            self._volunteer_cache.move_to_end(profile.user_id)
+            while len(self._volunteer_cache) > VOLUNTEER_CACHE_SIZE:
+                self._volunteer_cache.popitem(last=False)
+        return weights
+
+    def recommend(self, profile, limit=10):
+        """Top upcoming events for a volunteer profile, best first"""
+        self.index.sync()
+        weights = self.volunteer_weights(profile)
+
+        registered = EventRegistration.objects.filter(volunteer_id=profile.user_id).values_list('event_id', flat=True)
+        ranked = self.index.score(weights, exclude_ids=set(registered), limit=limit)
+        if not ranked:
+            return []
+
+        events = Event.objects.with_stats().select_related('ngo').in_bulk([event_id for event_id, _ in ranked])
+        return [events[event_id] for event_id, _ in ranked if event_id in events]
+
+
+recommender = Recommender()
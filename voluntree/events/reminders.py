@@ -0,0 +1,89 @@
+# events/reminders.py
+
+"""
+Reminder emails for approved volunteers of events starting soon.
+
+Meant to run from cron (`manage.py send_event_reminders`) as often as
+wanted. Each run takes the registrations still owed a reminder for events
+in the next PlatformSettings.event_reminder_hours, REMINDER_BATCH_SIZE at
+a time, and in one transaction per batch queues their notifications and
+stamps reminder_sent_at. Stamped rows drop out of the partial
+events_registration_reminder index, so every batch is the same indexed
+query with no offset, memory stays flat however many reminders are due,
+and a rerun (or a run that died halfway) only picks up what is left.
+"""
+
+from datetime import timedelta
+from django.db import transaction
+from django.utils import dateformat, timezone
+from admin_panel.models import PlatformSettings
+from core.notifications import build_notification, queue_notifications
+from .models import Event, EventRegistration
+
+REMINDER_BATCH_SIZE = 500
+REMINDER_VOLUNTEER_FIELDS = ['username', 'first_name', 'last_name', 'email', 'is_active']
+
+
+def due_reminders(now, hours):
+    """Approved registrations without a reminder for events starting within `hours`"""
+    return (
+        EventRegistration.objects.filter(
+            status='approved', reminder_sent_at__isnull=True,
+            event__date__gte=now, event__date__lt=now + timedelta(hours=hours),
+        )
+        # Only what the email needs; events are loaded once each, not per row
+        .select_related('volunteer')
+        .only('event_id', *(f'volunteer__{field}' for field in REMINDER_VOLUNTEER_FIELDS))
+        .order_by('event__date', 'event_id', 'pk')
+    )
+
+
+def _event_context(event_ids, contexts, site_name):
+    """Template context per event, built once per run"""
+    missing = [event_id for event_id in event_ids if event_id not in contexts]
+    for event in Event.objects.select_related('ngo').filter(pk__in=missing):
+        contexts[event.pk] = {
+            'site_name': site_name,
+            'event': event,
+            'starts': dateformat.format(timezone.localtime(event.date), 'l, F j, Y, g:i A'),
+        }
+    return contexts
+
+
+def send_event_reminders(now=None, hours=None, batch_size=REMINDER_BATCH_SIZE):
+    """
+    Queue reminder emails for events starting within `hours` (default from
+    PlatformSettings). Returns {'sent', 'skipped', 'enabled'}.
+    """
+    now = now or timezone.now()
+    platform = PlatformSettings.load()
+    result = {'sent': 0, 'skipped': 0, 'enabled': platform.send_event_reminders}
+    if not platform.send_event_reminders:
+        return result
+
+    hours = hours or platform.event_reminder_hours
+    contexts = {}
+    due = due_reminders(now, hours)
+
+    while True:
+        batch = list(due[:batch_size])
+        if not batch:
+            break
+
+        _event_context({registration.event_id for registration in batch}, contexts, platform.site_name)
+        notifications = [
+            build_notification(
+                registration.volunteer, f"Reminder: {contexts[registration.event_id]['event'].title} starts soon",
+                'events/emails/event_reminder.txt', contexts[registration.event_id],
+                dedupe_key=f'reminder:{registration.pk}',
+            )
+            for registration in batch if registration.volunteer.is_active
+        ]
+        with transaction.atomic():
+            queue_notifications(notifications)
+            EventRegistration.objects.filter(pk__in=[registration.pk for registration in batch]) \
+                .update(reminder_sent_at=now)
+
+        result['sent'] += len(notifications)
+        result['skipped'] += len(batch) - len(notifications)
+    return result
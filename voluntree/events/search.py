@@ -0,0 +1,204 @@
+# events/search.py
+
+"""
+Full-text search over events.
+
+The index lives in a side table keyed by event id: an FTS5 virtual table on
+SQLite, or a tsvector column with a GIN index on PostgreSQL. Both are
+created by migration 0003 and kept up to date by the signals in
+events/signals.py. Any other engine (or SQLite built without FTS5) falls
+back to the old icontains filters.
+
+Views search through get_search_backend().search(), which works on any
+queryset whose model points at Event, e.g. Certificate via 'event'.
+"""
+
+import re
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+SQLITE_TABLE = 'events_event_fts'
+POSTGRES_TABLE = 'events_event_search'
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(query):
+    """Split user input into plain word tokens (drops any query syntax)"""
+    return TOKEN_RE.findall(query.lower())
+
+
+def _event_column(queryset, event_field):
+    """Quoted SQL column on the queryset's base table holding the event id"""
+    opts = queryset.model._meta
+    field = opts.pk if event_field == 'pk' else opts.get_field(event_field)
+    quote = connection.ops.quote_name
+    return f'{quote(opts.db_table)}.{quote(field.column)}'
+
+
+def _document(event):
+    """Columns indexed for an event"""
+    return [event.title, event.description, event.location, event.ngo.organization_name]
+
+
+class IcontainsSearchBackend:
+    """Fallback: unranked LIKE filtering, same fields as the index"""
+
+    # order_by() key for best-first results, None when results are unranked
+    rank_ordering = None
+
+    def search(self, queryset, query, event_field='pk', rank=True):
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset.none()
+
+        prefix = '' if event_field == 'pk' else f'{event_field}__'
+        for token in tokens:
+            queryset = queryset.filter(
+                Q(**{f'{prefix}title__icontains': token}) |
+                Q(**{f'{prefix}description__icontains': token}) |
+                Q(**{f'{prefix}location__icontains': token}) |
+                Q(**{f'{prefix}ngo__organization_name__icontains': token})
+            )
+        return queryset
+
+    def index(self, event):
+        pass
+
+    def remove(self, event_id):
+        pass
+
+    def rebuild(self, events):
+        return 0
+
+
+class SqliteFTSSearchBackend:
+    """SQLite FTS5 virtual table ranked with bm25()"""
+
+    rank_ordering = 'search_rank'
+
+    def _match(self, tokens):
+        # Quoted prefix terms, implicitly ANDed: safe for any user input
+        return ' '.join(f'"{token}"*' for token in tokens)
+
+    def search(self, queryset, query, event_field='pk', rank=True):
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset.none()
+
+        match = self._match(tokens)
+        queryset = queryset.filter(**{
+            f'{event_field}__in': RawSQL(f'SELECT rowid FROM {SQLITE_TABLE} WHERE {SQLITE_TABLE} MATCH %s', [match])
+        })
+        if not rank:
+            return queryset
+
+        column = _event_column(queryset, event_field)
+        # bm25() is lower-is-better
+        return queryset.annotate(search_rank=RawSQL(
+            f'SELECT bm25({SQLITE_TABLE}) FROM {SQLITE_TABLE} '
+            f'WHERE {SQLITE_TABLE} MATCH %s AND {SQLITE_TABLE}.rowid = {column}',
+            [match],
+        )).order_by(self.rank_ordering)
+
+    def index(self, event):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SQLITE_TABLE} WHERE rowid = %s', [event.pk])
+            cursor.execute(
+                f'INSERT INTO {SQLITE_TABLE} (rowid, title, description, location, organization) '
+                'VALUES (%s, %s, %s, %s, %s)',
+                [event.pk, *_document(event)],
+            )
+
+    def remove(self, event_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SQLITE_TABLE} WHERE rowid = %s', [event_id])
+
+    def rebuild(self, events):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SQLITE_TABLE}')
+            count = 0
+            for event in events.select_related('ngo').iterator(chunk_size=1000):
+                cursor.execute(
+                    f'INSERT INTO {SQLITE_TABLE} (rowid, title, description, location, organization) '
+                    'VALUES (%s, %s, %s, %s, %s)',
+                    [event.pk, *_document(event)],
+                )
+                count += 1
+        return count
+
+
+class PostgresSearchBackend:
+    """tsvector side table with a GIN index, ranked with ts_rank()"""
+
+    rank_ordering = '-search_rank'
+
+    VECTOR_SQL = (
+        "setweight(to_tsvector('simple', %s), 'A') || "
+        "setweight(to_tsvector('simple', %s), 'C') || "
+        "setweight(to_tsvector('simple', %s), 'B') || "
+        "setweight(to_tsvector('simple', %s), 'B')"
+    )
+
+    def _tsquery(self, tokens):
+        return ' & '.join(f'{token}:*' for token in tokens)
+
+    def search(self, queryset, query, event_field='pk', rank=True):
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset.none()
+
+        tsquery = self._tsquery(tokens)
+        queryset = queryset.filter(**{
+            f'{event_field}__in': RawSQL(
+                f"SELECT event_id FROM {POSTGRES_TABLE} WHERE document @@ to_tsquery('simple', %s)", [tsquery]
+            )
+        })
+        if not rank:
+            return queryset
+
+        column = _event_column(queryset, event_field)
+        return queryset.annotate(search_rank=RawSQL(
+            f"SELECT ts_rank(document, to_tsquery('simple', %s)) FROM {POSTGRES_TABLE} "
+            f"WHERE {POSTGRES_TABLE}.event_id = {column}",
+            [tsquery],
+        )).order_by(self.rank_ordering)
+
+    def index(self, event):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {POSTGRES_TABLE} (event_id, document) VALUES (%s, {self.VECTOR_SQL}) '
+                'ON CONFLICT (event_id) DO UPDATE SET document = EXCLUDED.document',
+                [event.pk, *_document(event)],
+            )
+
+    def remove(self, event_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {POSTGRES_TABLE} WHERE event_id = %s', [event_id])
+
+    def rebuild(self, events):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {POSTGRES_TABLE}')
+        count = 0
+        for event in events.select_related('ngo').iterator(chunk_size=1000):
+            self.index(event)
+            count += 1
+        return count
+
+
+_backend = None
+
+
+def get_search_backend():
+    """Pick the backend for the configured database engine (cached per process)"""
+    global _backend
+    if _backend is None:
+        tables = connection.introspection.table_names()
+        if connection.vendor == 'sqlite' and SQLITE_TABLE in tables:
+            _backend = SqliteFTSSearchBackend()
+        elif connection.vendor == 'postgresql' and POSTGRES_TABLE in tables:
+            _backend = PostgresSearchBackend()
+        else:
+            _backend = IcontainsSearchBackend()
+    return _backend
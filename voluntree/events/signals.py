@@ -0,0 +1,168 @@
+# events/signals.py
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from accounts.models import NGO, VolunteerProfile
+from core.images import variants_generated
+from certificates.models import Certificate
+from .models import CalendarFeed, Event, EventRegistration, promote_waitlisted, registration_status_changed
+from .calendar import forget_token, invalidate_calendar_feed
+from .cards import invalidate_event_card
+from .recommendations import recommender
+from .search import get_search_backend
+from .tasks import notify_registration_status
+
+
+@receiver(post_delete, sender=EventRegistration)
+def release_registration_counter(sender, instance, origin=None, **kwargs):
+    """Decrement the event's counter when a registration row is deleted"""
+    # The event itself is going away, nothing to keep in sync
+    if isinstance(origin, Event) or getattr(origin, 'model', None) is Event:
+        return
+
+    Event.objects.filter(pk=instance.event_id).adjust_counters(instance.status, None)
+    if instance.status == 'approved':
+        promote_waitlisted(instance.event_id)
+
+
+@receiver(post_save, sender=Event)
+def index_event(sender, instance, raw=False, **kwargs):
+    """Keep the full-text search index in step with the event"""
+    if not raw:
+        get_search_backend().index(instance)
+
+
+@receiver(post_delete, sender=Event)
+def unindex_event(sender, instance, **kwargs):
+    get_search_backend().remove(instance.pk)
+
+
+@receiver(post_save, sender=NGO)
+def reindex_ngo_events(sender, instance, created=False, raw=False, **kwargs):
+    """Organization names are indexed with each event"""
+    if created or raw:
+        return
+
+    backend = get_search_backend()
+    for event in instance.events.all():
+        event.ngo = instance
+        backend.index(event)
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def refresh_event_features(sender, instance, **kwargs):
+    """Re-vectorize the event on the next recommendation request"""
+    recommender.invalidate_event(instance.pk)
+
+
+@receiver(m2m_changed, sender=Event.skill_tags.through)
+def refresh_event_skill_features(sender, instance, action, reverse=False, pk_set=None, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        # Changed from the Skill side: every affected event is stale
+        for event_id in pk_set or instance.events.values_list('pk', flat=True):
+            recommender.invalidate_event(event_id)
+    else:
+        recommender.invalidate_event(instance.pk)
+
+
+@receiver(post_save, sender=VolunteerProfile)
+def refresh_volunteer_features(sender, instance, **kwargs):
+    recommender.invalidate_volunteer(instance.user_id)
+
+
+@receiver(m2m_changed, sender=VolunteerProfile.skill_tags.through)
+@receiver(m2m_changed, sender=VolunteerProfile.interest_tags.through)
+def refresh_volunteer_skill_features(sender, instance, action, reverse=False, **kwargs):
+    if action.startswith('post_') and not reverse:
+        recommender.invalidate_volunteer(instance.user_id)
+
+
+@receiver(post_save, sender=EventRegistration)
+@receiver(post_delete, sender=EventRegistration)
+@receiver(registration_status_changed, sender=EventRegistration)
+def refresh_volunteer_history(sender, instance, **kwargs):
+    """Registration history feeds into the volunteer's vector"""
+    recommender.invalidate_volunteer(instance.volunteer_id)
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_card(sender, instance, **kwargs):
+    invalidate_event_card(instance.pk)
+
+
+@receiver(post_save, sender=EventRegistration)
+@receiver(post_delete, sender=EventRegistration)
+@receiver(registration_status_changed, sender=EventRegistration)
+@receiver(post_save, sender=Certificate)
+@receiver(post_delete, sender=Certificate)
+def invalidate_related_card(sender, instance, **kwargs):
+    """Cards show spot counts and certificate status"""
+    invalidate_event_card(instance.event_id)
+
+
+@receiver(post_save, sender=NGO)
+def invalidate_ngo_cards(sender, instance, created=False, raw=False, **kwargs):
+    """Cards show the organization name"""
+    if created or raw:
+        return
+
+    for event_id in instance.events.values_list('pk', flat=True):
+        invalidate_event_card(event_id)
+
+
+@receiver(post_save, sender=EventRegistration)
+@receiver(post_delete, sender=EventRegistration)
+@receiver(registration_status_changed, sender=EventRegistration)
+def refresh_volunteer_calendar(sender, instance, **kwargs):
+    """The volunteer's feed lists their approved events"""
+    invalidate_calendar_feed(instance.volunteer_id)
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def refresh_event_calendars(sender, instance, raw=False, **kwargs):
+    """Feeds of the organizing NGO and of every approved volunteer show the event"""
+    if raw:
+        return
+
+    user_ids = list(NGO.objects.filter(pk=instance.ngo_id).values_list('user_id', flat=True))
+    user_ids += instance.registrations.filter(status='approved').values_list('volunteer_id', flat=True)
+    invalidate_calendar_feed(*user_ids)
+
+
+@receiver(post_save, sender=NGO)
+def refresh_ngo_calendars(sender, instance, created=False, raw=False, **kwargs):
+    """The organization name and email appear in every feed listing its events"""
+    if created or raw:
+        return
+
+    volunteer_ids = EventRegistration.objects.filter(
+        event__ngo=instance, status='approved'
+    ).values_list('volunteer_id', flat=True).distinct()
+    invalidate_calendar_feed(instance.user_id, *volunteer_ids)
+
+
+@receiver(post_delete, sender=CalendarFeed)
+def revoke_calendar_token(sender, instance, **kwargs):
+    forget_token(instance.token)
+
+
+@receiver(variants_generated)
+def refresh_cards_with_image(sender, name, **kwargs):
+    """Cached cards still point at the original until re-rendered"""
+    for event_id in Event.objects.filter(image=name).values_list('pk', flat=True):
+        invalidate_event_card(event_id)
+
+
+@receiver(registration_status_changed, sender=EventRegistration)
+def email_registration_decision(sender, instance, **kwargs):
+    """Approved/rejected volunteers are emailed once the change is committed"""
+    if instance.status in ('approved', 'rejected'):
+        # robust: the decision is already committed, so a mail problem must not fail the request
+        registration_id = instance.pk
+        transaction.on_commit(lambda: notify_registration_status.delay(registration_id), robust=True)
@@ -0,0 +1,103 @@
+# events/tasks.py
+
+from django.db import transaction
+from admin_panel.models import PlatformSettings
+from core.notifications import INSERT_BATCH_SIZE, build_notification, queue_notifications
+from core.taskqueue import task
+from accounts.models import User
+from .models import Event, EventRegistration
+
+NOTIFY_CHUNK_SIZE = 2000
+
+
+def _fan_out(users, make_notification, replace=False):
+    """Queue one notification per user without holding them all in memory"""
+    batch = []
+    for user in users.iterator(chunk_size=NOTIFY_CHUNK_SIZE):
+        batch.append(make_notification(user))
+        if len(batch) >= INSERT_BATCH_SIZE:
+            queue_notifications(batch, replace=replace)
+            # Only the first batch replaces, or it would remove the batches before it
+            batch, replace = [], False
+    queue_notifications(batch, replace=replace)
+
+
+@task
+def notify_registration_status(registration_id):
+    """Tell a volunteer their registration was approved or rejected"""
+    platform = PlatformSettings.load()
+    registration = (
+        EventRegistration.objects.select_related('event__ngo', 'volunteer')
+        .filter(pk=registration_id, status__in=['approved', 'rejected']).first()
+    )
+    if registration is None or not platform.send_approval_emails:
+        return
+
+    event = registration.event
+    if registration.status == 'approved':
+        subject = f'You are confirmed for {event.title}'
+    else:
+        subject = f'Your registration for {event.title}'
+    # Keyed per registration: if the NGO changes its mind before we send, only the final decision goes out
+    queue_notifications([build_notification(
+        registration.volunteer, subject, f'events/emails/registration_{registration.status}.txt',
+        {'event': event, 'site_name': platform.site_name}, dedupe_key=f'registration-status:{registration.pk}',
+    )], replace=True)
+
+
+@task
+def notify_event_published(event_id):
+    """Tell volunteers who have worked with the NGO about its new event"""
+    platform = PlatformSettings.load()
+    event = Event.objects.select_related('ngo').filter(pk=event_id).first()
+    if event is None or not platform.notify_on_new_event:
+        return
+
+    volunteers = User.objects.filter(
+        is_active=True,
+        event_registrations__event__ngo_id=event.ngo_id, event_registrations__status='approved',
+    ).distinct().order_by('pk')
+    context = {'event': event, 'site_name': platform.site_name}
+    _fan_out(volunteers, lambda user: build_notification(
+        user, f'New event from {event.ngo.organization_name}: {event.title}', 'events/emails/event_published.txt',
+        context, dedupe_key=f'event-published:{event.pk}',
+    ))
+
+
+@task
+def notify_event_updated(event_id):
+    """Tell everyone registered for an event that its details changed"""
+    platform = PlatformSettings.load()
+    event = Event.objects.select_related('ngo').filter(pk=event_id).first()
+    if event is None or not platform.notify_on_event_update:
+        return
+
+    volunteers = User.objects.filter(
+        is_active=True,
+        event_registrations__event=event, event_registrations__status__in=['approved', 'pending', 'waitlisted'],
+    ).distinct().order_by('pk')
+    context = {'event': event, 'site_name': platform.site_name}
+    # Several edits in a row: the pending notice is replaced, so volunteers get the final details once
+    _fan_out(volunteers, lambda user: build_notification(
+        user, f'{event.title} has changed', 'events/emails/event_updated.txt',
+        context, dedupe_key=f'event-updated:{event.pk}',
+    ), replace=True)
+
+
+@task(max_attempts=3)
+def geocode_event(event_id):
+    """Fill in an event's coordinates from its location (see events/geocoding.py)"""
+    event = Event.objects.filter(pk=event_id).only('pk', 'location').first()
+    if event is None:
+        return
+    # Outside any transaction: a remote geocoder may take seconds
+    event.geocode()
+
+    with transaction.atomic():
+        current = Event.objects.select_for_update().filter(pk=event_id, location=event.location).first()
+        if current is None:
+            # Deleted, or moved again meanwhile: that save queued its own geocode_event
+            return
+        current.latitude, current.longitude = event.latitude, event.longitude
+        # save() for the signals (cards, calendars); updated_at is left alone
+        current.save(update_fields=['latitude', 'longitude'])
@@ -0,0 +1,101 @@
+# events/tests/test_api.py
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from accounts.models import User, NGO
+from ..models import Event, EventRegistration
+
+
+class EventAPITests(TestCase):
+
+    def setUp(self):
+        ngo_user = User.objects.create_user(username='apingo', password='password', user_type='ngo',
+                                            email='apingo@test.com')
+        self.ngo = NGO.objects.create(user=ngo_user, organization_name='API NGO', registration_number='A-1',
+                                      city='Dhaka', country='Bangladesh', status='approved')
+        self.volunteer = User.objects.create_user(username='apivol', password='password', user_type='volunteer',
+                                                  email='apivol@test.com')
+        date = timezone.now() + timedelta(days=3)
+        # Geocoded as they commit, for the 'near' filter
+        with override_settings(TASK_QUEUE_EAGER=True), self.captureOnCommitCallbacks(execute=True):
+            self.events = [
+                Event.objects.create(ngo=self.ngo, title=f'API Event {index}', description='...', location='Dhaka',
+                                     required_skills='Teaching, First Aid', date=date + timedelta(hours=index),
+                                     max_volunteers=5)
+                for index in range(3)
+            ]
+        registration = EventRegistration.objects.create(event=self.events[0], volunteer=self.volunteer)
+        registration.change_status('approved')
+
+    def test_event_list_default_fields(self):
+        response = self.client.get(reverse('api_event_list'))
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertIn('max-age=60', response['Cache-Control'])
+        self.assertTrue(response.has_header('ETag'))
+
+        data = response.json()['data']
+        self.assertEqual([row['id'] for row in data], [event.pk for event in self.events])
+        self.assertEqual(data[0]['available_spots'], 4)
+        self.assertEqual(data[0]['ngo_name'], 'API NGO')
+        self.assertTrue(data[0]['url'].endswith(f'/events/{self.events[0].pk}/'))
+
+    def test_sparse_fieldsets_select_only_needed_columns(self):
+        with self.assertNumQueries(1) as queries:
+            response = self.client.get(reverse('api_event_list'), {'fields': 'id,title'})
+        self.assertEqual(response.json()['data'][0], {'id': self.events[0].pk, 'title': 'API Event 0'})
+        sql = queries.captured_queries[0]['sql']
+        self.assertIn('"title"', sql)
+        self.assertNotIn('"description"', sql)
+
+        response = self.client.get(reverse('api_event_list'), {'fields': 'id,password'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('password', response.json()['error'])
+
+    def test_event_list_pagination_and_filters(self):
+        first = self.client.get(reverse('api_event_list'), {'limit': 2}).json()
+        second = self.client.get(reverse('api_event_list'), {'limit': 2, 'cursor': first['next_cursor']}).json()
+        self.assertEqual([row['id'] for row in first['data'] + second['data']], [event.pk for event in self.events])
+        self.assertIsNone(second['next_cursor'])
+
+        self.assertEqual(self.client.get(reverse('api_event_list'), {'cursor': 'bogus'}).status_code, 400)
+        response = self.client.get(reverse('api_event_list'), {'near': '23.81,90.41', 'fields': 'id,distance'})
+        self.assertLess(response.json()['data'][0]['distance'], 5)
+
+    def test_event_detail(self):
+        response = self.client.get(reverse('api_event_detail', args=[self.events[0].pk]))
+        data = response.json()['data']
+        self.assertEqual(data['skills'], ['Teaching', 'First Aid'])
+        self.assertEqual(data['registered'], 1)
+        self.assertIsNone(data['image'])
+
+        self.assertEqual(self.client.get(reverse('api_event_detail', args=[0])).status_code, 404)
+
+    def test_availability(self):
+        ids = ','.join(str(event.pk) for event in self.events[:2])
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('api_event_availability'), {'ids': ids})
+        data = response.json()['data']
+        self.assertEqual(data[0], {'id': self.events[0].pk, 'max_volunteers': 5, 'registered': 1, 'pending': 0,
+                                   'available_spots': 4, 'is_full': False})
+        self.assertIn('max-age=10', response['Cache-Control'])
+
+        self.assertEqual(self.client.get(reverse('api_event_availability'), {'ids': 'x'}).status_code, 400)
+
+    def test_ngo_summaries(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('api_ngo_list'), {'fields': 'id,name,upcoming_events,total_volunteers'})
+        self.assertEqual(response.json()['data'], [
+            {'id': self.ngo.pk, 'name': 'API NGO', 'upcoming_events': 3, 'total_volunteers': 1}
+        ])
+
+        detail = self.client.get(reverse('api_ngo_detail', args=[self.ngo.pk])).json()['data']
+        self.assertEqual(detail['focus_areas'], [])
+
+    def test_read_only_and_conditional(self):
+        url = reverse('api_event_list')
+        self.assertEqual(self.client.post(url).status_code, 405)
+
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
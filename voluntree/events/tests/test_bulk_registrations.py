@@ -0,0 +1,88 @@
+# events/tests/test_bulk_registrations.py
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from accounts.models import User, NGO
+from ..models import Event, EventRegistration
+
+
+class BulkRegistrationTests(TestCase):
+
+    def setUp(self):
+        ngo_user = User.objects.create_user(username='bulkngo', password='password', user_type='ngo',
+                                            email='bulkngo@test.com')
+        self.ngo = NGO.objects.create(user=ngo_user, organization_name='Bulk NGO', registration_number='B-1')
+        self.event = Event.objects.create(
+            ngo=self.ngo, title='Bulk Event', description='...', location='Dhaka',
+            date=timezone.now() + timedelta(days=3), max_volunteers=3
+        )
+        self.registrations = []
+        for index in range(5):
+            volunteer = User.objects.create_user(username=f'bulkvol{index}', password='password',
+                                                 user_type='volunteer', email=f'bulkvol{index}@test.com')
+            self.registrations.append(EventRegistration.objects.create(event=self.event, volunteer=volunteer))
+        self.ids = [registration.pk for registration in self.registrations]
+
+    def _statuses(self):
+        return list(EventRegistration.objects.filter(pk__in=self.ids).order_by('pk').values_list('status', flat=True))
+
+    def test_approve_up_to_capacity(self):
+        self.registrations[0].change_status('approved')
+
+        # Savepoint, locked read, candidates, two UPDATEs, counter refresh, release
+        with self.assertNumQueries(7):
+            approved, overflow = self.event.approve_registrations(self.ids[1:])
+        self.assertEqual(approved, self.ids[1:3])
+        self.assertEqual(overflow, self.ids[3:])
+        self.assertEqual(self._statuses(), ['approved'] * 3 + ['pending'] * 2)
+        self.assertEqual((self.event.approved_count, self.event.pending_count), (3, 2))
+        self.assertTrue(self.event.is_full())
+
+        # Already full: everything overflows, nothing changes
+        self.assertEqual(self.event.approve_registrations(self.ids[3:]), ([], self.ids[3:]))
+
+    def test_non_pending_ids_are_ignored(self):
+        self.registrations[0].change_status('rejected')
+        other = Event.objects.create(ngo=self.ngo, title='Other', description='...', location='Dhaka',
+                                     date=timezone.now() + timedelta(days=3), max_volunteers=3)
+        foreign = EventRegistration.objects.create(event=other, volunteer=self.registrations[1].volunteer)
+
+        approved, overflow = self.event.approve_registrations([self.ids[0], self.ids[1], foreign.pk])
+        self.assertEqual((approved, overflow), ([self.ids[1]], []))
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.status, 'pending')
+
+    def test_reject_in_bulk(self):
+        rejected = self.event.reject_registrations(self.ids[:4])
+        self.assertEqual(sorted(rejected), self.ids[:4])
+        self.assertEqual(self._statuses(), ['rejected'] * 4 + ['pending'])
+        self.assertEqual(self.event.pending_count, 1)
+
+    def test_bulk_view_reports_overflow(self):
+        self.client.force_login(self.ngo.user)
+        url = reverse('bulk_update_registrations', args=[self.event.pk])
+
+        response = self.client.post(url, {'action': 'approve', 'registration_ids': self.ids})
+        overflow = ','.join(map(str, self.ids[3:]))
+        self.assertRedirects(response, f"{reverse('manage_registrations', args=[self.event.pk])}?overflow={overflow}",
+                             fetch_redirect_response=False)
+
+        page = self.client.get(response.url)
+        self.assertContains(page, 'could not be approved')
+        self.assertContains(page, 'class="registration-card status-pending overflow"', count=2)
+
+        response = self.client.post(url, {'action': 'reject', 'registration_ids': self.ids[3:]}, follow=True)
+        self.assertContains(response, '2 application(s) rejected.')
+        self.assertEqual(self._statuses(), ['approved'] * 3 + ['rejected'] * 2)
+
+    def test_bulk_view_requires_event_owner(self):
+        other_user = User.objects.create_user(username='bulkngo2', password='password', user_type='ngo',
+                                              email='bulkngo2@test.com')
+        NGO.objects.create(user=other_user, organization_name='Other NGO', registration_number='B-2')
+        self.client.force_login(other_user)
+
+        self.client.post(reverse('bulk_update_registrations', args=[self.event.pk]),
+                         {'action': 'approve', 'registration_ids': self.ids})
+        self.assertEqual(self._statuses(), ['pending'] * 5)
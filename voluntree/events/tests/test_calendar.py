@@ -0,0 +1,87 @@
+# events/tests/test_calendar.py
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from accounts.models import User, NGO
+from ..models import CalendarFeed, Event, EventRegistration
+
+
+class CalendarFeedTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.ngo_user = User.objects.create_user(username='calngo', password='password', user_type='ngo',
+                                                 email='calngo@test.com')
+        self.ngo = NGO.objects.create(user=self.ngo_user, organization_name='Calendar, NGO',
+                                      registration_number='C-1', email='contact@calngo.org')
+        self.volunteer = User.objects.create_user(username='calvol', password='password', user_type='volunteer',
+                                                  email='calvol@test.com')
+        self.approved_event = self._event('Beach; Cleanup')
+        self.pending_event = self._event('Tree Planting')
+        EventRegistration.objects.create(event=self.approved_event, volunteer=self.volunteer).change_status('approved')
+        EventRegistration.objects.create(event=self.pending_event, volunteer=self.volunteer)
+
+        self.feed = CalendarFeed.for_user(self.volunteer)
+        self.url = reverse('calendar_feed', args=[self.feed.token])
+
+    def _event(self, title):
+        return Event.objects.create(
+            ngo=self.ngo, title=title, description='Line one\nLine two', location='Dhaka',
+            date=timezone.now() + timedelta(days=3), max_volunteers=5
+        )
+
+    def test_volunteer_feed_lists_approved_events(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        body = response.content.decode()
+        self.assertTrue(body.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertEqual(body.count('BEGIN:VEVENT'), 1)
+        self.assertIn(f'UID:event-{self.approved_event.pk}@testserver', body)
+        self.assertIn(r'SUMMARY:Beach\; Cleanup', body)
+        self.assertIn('DESCRIPTION:Line one\\nLine two', body)
+        self.assertIn('ORGANIZER;CN=Calendar\\, NGO:mailto:contact@calngo.org', body)
+
+    def test_repeat_polls_skip_the_database(self):
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+            not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_changes_bump_the_feed(self):
+        before = self.client.get(self.url)
+
+        self.approved_event.title = 'Renamed Cleanup'
+        self.approved_event.save()
+        after = self.client.get(self.url)
+        self.assertNotEqual(after['ETag'], before['ETag'])
+        self.assertIn('SUMMARY:Renamed Cleanup', after.content.decode())
+
+        EventRegistration.objects.get(event=self.pending_event).change_status('approved')
+        self.assertEqual(self.client.get(self.url).content.decode().count('BEGIN:VEVENT'), 2)
+
+    def test_ngo_feed_lists_own_events(self):
+        feed = CalendarFeed.for_user(self.ngo_user)
+        body = self.client.get(reverse('calendar_feed', args=[feed.token])).content.decode()
+        self.assertEqual(body.count('BEGIN:VEVENT'), 2)
+        self.assertIn('X-WR-CALNAME:Voluntree - My NGO events', body)
+
+    def test_reset_revokes_old_url(self):
+        self.client.get(self.url)
+        self.client.login(username='calvol', password='password')
+        response = self.client.post(reverse('calendar_feed_reset'))
+        self.assertRedirects(response, reverse('my_events'), fetch_redirect_response=False)
+
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.feed.refresh_from_db()
+        self.assertEqual(self.client.get(reverse('calendar_feed', args=[self.feed.token])).status_code, 200)
+
+    def test_my_events_shows_feed_link(self):
+        self.client.login(username='calvol', password='password')
+        response = self.client.get(reverse('my_events'))
+        self.assertContains(response, f'webcal://testserver{self.url}')
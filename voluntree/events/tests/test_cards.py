@@ -0,0 +1,92 @@
+# events/tests/test_cards.py
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from accounts.models import User, NGO
+from certificates.models import Certificate
+from core.checks import check_shared_cache
+from ..cards import CSRF_PLACEHOLDER, card_cache_stats, render_event_cards
+from ..models import Event, EventRegistration
+
+CARD = 'events/partials/event_card.html'
+NGO_CARD = 'events/partials/ngo_event_card.html'
+
+
+class EventCardCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        ngo_user = User.objects.create_user(username='cardngo', password='password', user_type='ngo',
+                                            email='cardngo@test.com')
+        self.ngo = NGO.objects.create(user=ngo_user, organization_name='Card NGO', registration_number='C-1')
+        self.volunteer = User.objects.create_user(username='cardvol', password='password', user_type='volunteer',
+                                                  email='cardvol@test.com')
+        self.event = Event.objects.create(
+            ngo=self.ngo, title='Card Event', description='...', location='Dhaka',
+            date=timezone.now() + timedelta(days=3), max_volunteers=10
+        )
+
+    def _render(self, template=CARD):
+        return render_event_cards(Event.objects.with_stats().filter(pk=self.event.pk), template)[0].card_html
+
+    def test_unchanged_card_is_served_from_cache(self):
+        first = self._render()
+        self.assertEqual(card_cache_stats()['misses'], 1)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self._render(), first)
+        self.assertEqual(card_cache_stats(), {'hits': 1, 'misses': 1, 'hit_rate': 0.5})
+
+    def test_event_edit_invalidates(self):
+        self._render()
+        self.event.title = 'Renamed Event'
+        self.event.save()
+        self.assertIn('Renamed Event', self._render())
+
+    def test_registration_changes_invalidate(self):
+        self.assertIn('10 spots left', self._render())
+
+        registration = EventRegistration.objects.create(event=self.event, volunteer=self.volunteer)
+        registration.change_status('approved')
+        self.assertIn('9 spots left', self._render())
+
+        registration.delete()
+        self.assertIn('10 spots left', self._render())
+
+    def test_counters_are_part_of_the_key(self):
+        self.assertIn('10 spots left', self._render())
+        # As seen by a process that missed the version bump: the counters alone must tell
+        Event.objects.filter(pk=self.event.pk).update(approved_count=3)
+        self.assertIn('7 spots left', self._render())
+
+    def test_certificate_changes_invalidate(self):
+        self.assertIn('No Certificate Uploaded', self._render(NGO_CARD))
+        certificate = Certificate.objects.create(event=self.event, certificate_file='certificates/templates/t.pdf')
+        self.assertIn('Pending Approval', self._render(NGO_CARD))
+
+        certificate.delete()
+        self.assertIn('No Certificate Uploaded', self._render(NGO_CARD))
+
+    def test_ngo_rename_invalidates(self):
+        self._render()
+        self.ngo.organization_name = 'Renamed NGO'
+        self.ngo.save()
+        self.assertIn('Renamed NGO', self._render())
+
+    def test_csrf_token_is_filled_per_request(self):
+        self.client.force_login(self.ngo.user)
+        for _ in range(2):
+            response = self.client.get(reverse('ngo_events'))
+            self.assertNotContains(response, CSRF_PLACEHOLDER)
+            self.assertContains(response, 'name="csrfmiddlewaretoken"')
+        self.assertEqual(card_cache_stats()['hits'], 1)
+
+    def test_deploy_check_requires_a_shared_cache(self):
+        self.assertEqual([warning.id for warning in check_shared_cache(None)], ['core.W001'])
+        shared = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+                              'LOCATION': 'redis://127.0.0.1:6379'}}
+        with override_settings(CACHES=shared):
+            self.assertEqual(check_shared_cache(None), [])
@@ -0,0 +1,81 @@
+# events/tests/test_concurrency.py
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.db import OperationalError, connection
+from django.test import TransactionTestCase
+from django.utils import timezone
+from accounts.models import User, NGO
+from ..models import Event, EventFullError, EventRegistration
+
+
+class CapacityStressTests(TransactionTestCase):
+    """Hammer registration and approval from many threads at once"""
+
+    VOLUNTEERS = 200
+    CAPACITY = 25
+    WORKERS = 50
+
+    def setUp(self):
+        ngo_user = User.objects.create_user(username='burstngo', password='password', user_type='ngo',
+                                            email='burstngo@test.com')
+        ngo = NGO.objects.create(user=ngo_user, organization_name='Burst NGO', registration_number='BURST-1')
+        self.event = Event.objects.create(
+            ngo=ngo, title='Popular Event', date=timezone.now() + timedelta(days=1), max_volunteers=self.CAPACITY
+        )
+        User.objects.bulk_create([
+            User(username=f'burst{i}', email=f'burst{i}@test.com', user_type='volunteer')
+            for i in range(self.VOLUNTEERS)
+        ])
+        self.volunteer_ids = list(User.objects.filter(user_type='volunteer').values_list('pk', flat=True))
+        self.start = threading.Barrier(self.WORKERS)
+
+    def _run_threaded(self, func, items):
+        def worker(item):
+            self.start.wait()
+            try:
+                # Simulate client retries when SQLite reports lock contention
+                for _ in range(1000):
+                    try:
+                        return func(item)
+                    except OperationalError:
+                        time.sleep(random.uniform(0, 0.02))
+                raise AssertionError('worker never got the database lock')
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=self.WORKERS) as pool:
+            return list(pool.map(worker, items))
+
+    def _register(self, volunteer_id):
+        EventRegistration.objects.create(event_id=self.event.pk, volunteer_id=volunteer_id)
+
+    def _approve(self, registration_id):
+        registration = EventRegistration.objects.get(pk=registration_id)
+        try:
+            # Approve twice to mimic a double-clicked button
+            first = registration.change_status('approved', enforce_capacity=True)
+            second = registration.change_status('approved', enforce_capacity=True)
+            return 'approved' if first and second else 'stale'
+        except EventFullError:
+            return 'full'
+
+    def test_cap_never_exceeded(self):
+        self._run_threaded(self._register, self.volunteer_ids)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.pending_count, self.VOLUNTEERS)
+
+        registration_ids = list(EventRegistration.objects.values_list('pk', flat=True))
+        outcomes = self._run_threaded(self._approve, registration_ids)
+
+        self.event.refresh_from_db()
+        approved = EventRegistration.objects.filter(event=self.event, status='approved').count()
+        self.assertEqual(approved, self.CAPACITY)
+        self.assertEqual(self.event.approved_count, self.CAPACITY)
+        self.assertEqual(self.event.pending_count, self.VOLUNTEERS - self.CAPACITY)
+        self.assertEqual(outcomes.count('approved'), self.CAPACITY)
+        self.assertEqual(outcomes.count('full'), self.VOLUNTEERS - self.CAPACITY)
+        self.assertTrue(self.event.is_full())
@@ -0,0 +1,94 @@
+# events/tests/test_conditional.py
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from accounts.models import User, NGO
+from certificates.models import Certificate
+from ..models import Event, EventRegistration
+
+
+class ConditionalGetTests(TestCase):
+
+    def setUp(self):
+        ngo_user = User.objects.create_user(username='etagngo', password='password', user_type='ngo',
+                                            email='etagngo@test.com')
+        self.ngo = NGO.objects.create(user=ngo_user, organization_name='ETag NGO', registration_number='E-1')
+        self.volunteer = User.objects.create_user(username='etagvol', password='password', user_type='volunteer',
+                                                  email='etagvol@test.com')
+        self.event = Event.objects.create(
+            ngo=self.ngo, title='ETag Event', description='...', location='Dhaka',
+            date=timezone.now() + timedelta(days=3), max_volunteers=10
+        )
+        self.list_url = reverse('event_list')
+        self.detail_url = reverse('event_detail', args=[self.event.pk])
+
+    def _revalidate(self, url, response):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_unchanged_pages_return_304(self):
+        for url in [self.list_url, self.detail_url]:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('no-cache', response['Cache-Control'])
+            self.assertEqual(self._revalidate(url, response).status_code, 304)
+
+            modified = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+            self.assertEqual(modified.status_code, 304)
+
+    def test_related_changes_invalidate(self):
+        response = self.client.get(self.detail_url)
+
+        registration = EventRegistration.objects.create(event=self.event, volunteer=self.volunteer)
+        response = self._revalidate(self.detail_url, response)
+        self.assertEqual(response.status_code, 200)
+
+        registration.change_status('approved')
+        response = self._revalidate(self.detail_url, response)
+        self.assertEqual(response.status_code, 200)
+
+        Certificate.objects.create(event=self.event, certificate_file='certificates/templates/t.pdf')
+        response = self._revalidate(self.detail_url, response)
+        self.assertEqual(response.status_code, 200)
+
+        registration.delete()
+        self.assertEqual(self._revalidate(self.detail_url, response).status_code, 200)
+
+    def test_list_tracks_filtered_set(self):
+        response = self.client.get(self.list_url, {'search': 'event'})
+        url = f'{self.list_url}?search=event'
+
+        # Events outside the filter do not affect the page
+        Event.objects.create(
+            ngo=self.ngo, title='Other', description='...', location='Khulna',
+            date=timezone.now() + timedelta(days=3), max_volunteers=5
+        )
+        self.assertEqual(self._revalidate(url, response).status_code, 304)
+
+        self.event.delete()
+        self.assertEqual(self._revalidate(url, response).status_code, 200)
+
+    def test_authenticated_responses_are_per_user(self):
+        anonymous = self.client.get(self.detail_url)
+
+        self.client.force_login(self.volunteer)
+        response = self._revalidate(self.detail_url, anonymous)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+        self.assertFalse(response.has_header('Last-Modified'))
+        self.assertEqual(self._revalidate(self.detail_url, response).status_code, 304)
+
+        # The user's own registration changes the page
+        EventRegistration.objects.create(event=self.event, volunteer=self.volunteer)
+        self.assertEqual(self._revalidate(self.detail_url, response).status_code, 200)
+
+    def test_pending_messages_force_render(self):
+        self.client.force_login(self.volunteer)
+        response = self.client.get(self.detail_url)
+
+        # Registering flashes a message that the next render must consume
+        self.client.post(reverse('event_register', args=[self.event.pk]))
+        response = self._revalidate(self.detail_url, response)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['messages']), 1)
@@ -0,0 +1,99 @@
+# events/tests/test_exports.py
+
+import csv
+import io
+import zipfile
+from xml.etree import ElementTree
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from accounts.models import User, NGO, VolunteerProfile
+from ..exports import stream_csv, stream_xlsx
+from ..models import Event, EventRegistration
+
+SHEET_NS = {'s': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+
+
+def _xlsx_rows(content):
+    with zipfile.ZipFile(io.BytesIO(content)) as workbook:
+        root = ElementTree.fromstring(workbook.read('xl/worksheets/sheet1.xml'))
+    return [
+        [''.join(cell.itertext()) for cell in row.findall('s:c', SHEET_NS)]
+        for row in root.find('s:sheetData', SHEET_NS).findall('s:row', SHEET_NS)
+    ]
+
+
+class StreamingWriterTests(TestCase):
+
+    def test_header_is_sent_before_rows_are_read(self):
+        def rows():
+            raise AssertionError('rows read too early')
+            yield
+
+        self.assertEqual(next(stream_csv(['a', 'b'], rows())), '\ufeffa,b\r\n')
+        self.assertTrue(next(stream_xlsx(['a', 'b'], rows())).startswith(b'PK'))
+
+    def test_csv_neutralizes_formulas(self):
+        content = ''.join(stream_csv(['name', 'count'], iter([['=HYPERLINK("x")', -3], ['plain', 2]])))
+        rows = list(csv.reader(io.StringIO(content.lstrip('\ufeff'))))
+        self.assertEqual(rows[1:], [['\'=HYPERLINK("x")', '-3'], ['plain', '2']])
+
+    def test_xlsx_round_trips_many_rows(self):
+        data = ([index, f'name <{index}> & co', None] for index in range(1200))
+        content = b''.join(stream_xlsx(['id', 'name', 'empty'], data))
+
+        rows = _xlsx_rows(content)
+        self.assertEqual(rows[0], ['id', 'name', 'empty'])
+        self.assertEqual(len(rows), 1201)
+        self.assertEqual(rows[-1], ['1199', 'name <1199> & co', ''])
+
+
+class RegistrationExportTests(TestCase):
+
+    def setUp(self):
+        self.ngo_user = User.objects.create_user(username='exportngo', password='password', user_type='ngo',
+                                                 email='exportngo@test.com')
+        ngo = NGO.objects.create(user=self.ngo_user, organization_name='Export NGO', registration_number='X-1')
+        self.event = Event.objects.create(
+            ngo=ngo, title='Export Event', description='...', location='Dhaka',
+            date=timezone.now() + timedelta(days=3), max_volunteers=5
+        )
+        for index in range(3):
+            volunteer = User.objects.create_user(username=f'exportvol{index}', password='password',
+                                                 user_type='volunteer', email=f'exportvol{index}@test.com')
+            VolunteerProfile.objects.create(user=volunteer, phone=f'0170000000{index}', city='Dhaka')
+            registration = EventRegistration.objects.create(event=self.event, volunteer=volunteer)
+        registration.change_status('approved')
+        self.url = reverse('export_registrations', args=[self.event.pk])
+
+    def test_csv_roster(self):
+        self.client.login(username='exportngo', password='password')
+        response = self.client.get(self.url)
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Disposition'],
+                         f'attachment; filename="registrations-event-{self.event.pk}.csv"')
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode('utf-8-sig'))))
+        self.assertEqual(rows[0][:3], ['Name', 'Username', 'Email'])
+        self.assertEqual([row[1] for row in rows[1:]], ['exportvol0', 'exportvol1', 'exportvol2'])
+        self.assertEqual(rows[3][6], 'Approved')
+
+    def test_xlsx_roster_filtered_by_status(self):
+        self.client.login(username='exportngo', password='password')
+        response = self.client.get(self.url, {'format': 'xlsx', 'status': 'approved'})
+
+        self.assertEqual(response['Content-Type'],
+                         'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+        rows = _xlsx_rows(b''.join(response.streaming_content))
+        self.assertEqual([row[1] for row in rows[1:]], ['exportvol2'])
+
+    def test_other_users_cannot_export(self):
+        other = User.objects.create_user(username='otherngo', password='password', user_type='ngo',
+                                         email='otherngo@test.com')
+        NGO.objects.create(user=other, organization_name='Other NGO', registration_number='X-2')
+        self.client.login(username='otherngo', password='password')
+        self.assertRedirects(self.client.get(self.url), reverse('ngo_events'), fetch_redirect_response=False)
+
+        self.client.login(username='exportvol0', password='password')
+        self.assertRedirects(self.client.get(self.url), reverse('event_list'), fetch_redirect_response=False)
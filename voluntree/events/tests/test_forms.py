@@ -7,6 +7,7 @@ from ..forms import EventForm
 from ..models import Event
 from accounts.models import User, NGO
 from certificates.models import Certificate
+from certificates.rendering import sample_template
 
 
 class EventFormTests(TestCase):
@@ -44,7 +45,22 @@ class EventFormTests(TestCase):
         form = EventForm(form_data, file_data)
         self.assertFalse(form.is_valid())
         self.assertIn('certificate_file', form.errors)
-        self.assertIn('Only PDF, Word documents, and images are allowed.', form.errors['certificate_file'][0])
+        self.assertIn('Only PNG or JPEG images are allowed.', form.errors['certificate_file'][0])
+
+    def test_certificate_template_must_be_an_image(self):
+        form_data = {
+            'title': 'Test Event', 'date': timezone.now(), 'location': 'Here',
+            'max_volunteers': 10, 'status': 'published', 'description': 'desc', 'required_skills': 'none'
+        }
+        for name, content in [('cert.pdf', b'%PDF-1.4'), ('cert.png', b'%PDF-1.4 renamed')]:
+            with self.subTest(name=name):
+                form = EventForm(form_data, {'certificate_file': SimpleUploadedFile(name, content)})
+                self.assertFalse(form.is_valid())
+                self.assertEqual(form.errors['certificate_file'], ['Only PNG or JPEG images are allowed.'])
+
+        form = EventForm(form_data, {'certificate_file': SimpleUploadedFile('cert.png', sample_template())})
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.cleaned_data['certificate_file'].read(8), b'\x89PNG\r\n\x1a\n')
 
     def test_form_with_file_too_large(self):
         large_content = b'a' * (11 * 1024 * 1024)
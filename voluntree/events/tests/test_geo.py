@@ -0,0 +1,159 @@
+# events/tests/test_geo.py
+
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from accounts.models import User, NGO
+from core.models import Task
+from ..geocoding import GazetteerGeocoder, GeocoderError, bounding_box, haversine_km, parse_point
+from ..models import Event
+
+DHAKA = (23.8103, 90.4125)
+
+
+class GeocodingTests(TestCase):
+
+    def test_gazetteer_uses_most_specific_known_part(self):
+        geocoder = GazetteerGeocoder()
+        self.assertEqual(geocoder.geocode('Mirpur 10, Dhaka, Bangladesh'), DHAKA)
+        self.assertEqual(geocoder.geocode("  cox's   BAZAR "), (21.4272, 92.0058))
+        self.assertIsNone(geocoder.geocode('Atlantis'))
+
+    def test_parse_point(self):
+        self.assertEqual(parse_point('23.8,90.4'), (23.8, 90.4))
+        self.assertIsNone(parse_point('91,0'))
+        self.assertIsNone(parse_point('dhaka'))
+        self.assertIsNone(parse_point('1,2,3'))
+
+    def test_bounding_box_contains_circle(self):
+        min_lat, max_lat, min_lng, max_lng = bounding_box(*DHAKA, 50)
+        self.assertAlmostEqual(haversine_km(min_lat, DHAKA[1], *DHAKA), 50, places=3)
+        self.assertGreaterEqual(haversine_km(DHAKA[0], min_lng, *DHAKA), 50 - 1e-6)
+        # Near the antimeridian only the latitude range is usable
+        self.assertEqual(bounding_box(0, 179.9, 50)[2:], (None, None))
+
+
+@override_settings(TASK_QUEUE_EAGER=True)
+class EventNearTests(TestCase):
+
+    def setUp(self):
+        ngo_user = User.objects.create_user(username='geongo', password='password', user_type='ngo',
+                                            email='geongo@test.com')
+        self.ngo = NGO.objects.create(user=ngo_user, organization_name='Geo NGO', registration_number='G-1')
+        self.dhaka = self._event('Dhaka Drive', 'Dhanmondi, Dhaka')
+        self.gazipur = self._event('Gazipur Drive', 'Gazipur')
+        self.khulna = self._event('Khulna Drive', 'Khulna')
+        self.nowhere = self._event('Online Drive', 'Online')
+
+    def _event(self, title, location):
+        # geocode_event runs once the save commits
+        with self.captureOnCommitCallbacks(execute=True):
+            event = Event.objects.create(
+                ngo=self.ngo, title=title, description='...', location=location,
+                date=timezone.now() + timedelta(days=3), max_volunteers=10
+            )
+        event.refresh_from_db()
+        return event
+
+    def test_coordinates_follow_location(self):
+        self.assertEqual((self.dhaka.latitude, self.dhaka.longitude), DHAKA)
+        self.assertIsNone(self.nowhere.latitude)
+
+        event = Event.objects.get(pk=self.nowhere.pk)
+        event.location = 'Sylhet'
+        with self.captureOnCommitCallbacks(execute=True):
+            event.save()
+        event.refresh_from_db()
+        self.assertEqual((event.latitude, event.longitude), (24.8949, 91.8687))
+
+    @override_settings(TASK_QUEUE_EAGER=False)
+    def test_saving_queues_geocoding_instead_of_waiting_for_it(self):
+        event = Event.objects.get(pk=self.dhaka.pk)
+        event.location = 'Khulna'
+        with mock.patch('events.models.get_geocoder') as get_geocoder:
+            with self.captureOnCommitCallbacks(execute=True):
+                event.save()
+        get_geocoder.assert_not_called()
+        event.refresh_from_db()
+        self.assertIsNone(event.latitude)
+        self.assertEqual([task.args for task in Task.objects.filter(name__endswith='geocode_event')], [[event.pk]])
+
+        # Unchanged location: nothing to geocode
+        Task.objects.all().delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            event.save()
+        self.assertFalse(Task.objects.exists())
+
+    def test_near_filters_and_sorts_by_distance(self):
+        events = list(Event.objects.near(*DHAKA, 50).order_by('distance'))
+        self.assertEqual(events, [self.dhaka, self.gazipur])
+        self.assertAlmostEqual(events[1].distance, haversine_km(*DHAKA, 23.9999, 90.4203), places=6)
+
+        self.assertIn(self.khulna, Event.objects.near(*DHAKA, 200))
+
+    def test_bounding_box_uses_index(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Query plan check is SQLite-specific')
+        self.assertIn('events_event_lat_lng_idx', Event.objects.near(*DHAKA, 50).explain())
+
+    def test_event_list_near_parameter(self):
+        response = self.client.get(reverse('event_list'), {'near': '23.81,90.41', 'radius': '50'})
+        self.assertEqual(list(response.context['events']), [self.dhaka, self.gazipur])
+        self.assertContains(response, 'km away')
+
+        # Malformed points are ignored
+        response = self.client.get(reverse('event_list'), {'near': 'nowhere'})
+        self.assertEqual(len(response.context['events']), 4)
+
+    def test_near_pages_by_distance(self):
+        url = reverse('event_list_feed')
+        for index in range(15):
+            self._event(f'Extra {index}', 'Dhaka')
+        first = self.client.get(url, {'near': '23.81,90.41', 'radius': '50'}).json()
+        second = self.client.get(url, {'near': '23.81,90.41', 'radius': '50', 'cursor': first['next_cursor']}).json()
+        ids = [card['id'] for card in first['events'] + second['events']]
+        self.assertEqual(len(ids), 17)
+        self.assertEqual(ids[-1], self.gazipur.pk)
+
+
+class GeocodeEventsCommandTests(TestCase):
+
+    def setUp(self):
+        ngo_user = User.objects.create_user(username='backfillngo', password='password', user_type='ngo',
+                                            email='backfillngo@test.com')
+        ngo = NGO.objects.create(user=ngo_user, organization_name='Backfill NGO', registration_number='G-2')
+        # Created without running geocode_event, as events from before coordinates existed
+        self.events = [
+            Event.objects.create(ngo=ngo, title=location, description='...', location=location,
+                                 date=timezone.now() + timedelta(days=3), max_volunteers=10)
+            for location in ['Dhaka', 'Unreachable', 'Sylhet']
+        ]
+
+    def test_failed_lookups_are_reported_and_skipped(self):
+        gazetteer = GazetteerGeocoder()
+
+        def geocode(location):
+            if location == 'Unreachable':
+                raise GeocoderError('timed out')
+            return gazetteer.geocode(location)
+
+        geocoder = mock.Mock(min_interval=1, geocode=geocode)
+        out = StringIO()
+        with mock.patch('events.models.get_geocoder', return_value=geocoder), \
+                mock.patch('events.management.commands.geocode_events.get_geocoder', return_value=geocoder), \
+                mock.patch('events.management.commands.geocode_events.time.sleep') as sleep:
+            call_command('geocode_events', stdout=out)
+
+        # The geocoder's rate limit is kept between lookups
+        self.assertEqual(sleep.call_args_list, [mock.call(1), mock.call(1)])
+        self.assertIn('Geocoded 2 event(s).', out.getvalue())
+        self.assertIn('1 lookup(s) failed', out.getvalue())
+        self.assertEqual(
+            list(Event.objects.filter(latitude__isnull=False).order_by('pk').values_list('title', flat=True)),
+            ['Dhaka', 'Sylhet'],
+        )
@@ -0,0 +1,69 @@
+# events/tests/test_lifecycle.py
+
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from datetime import timedelta
+from accounts.models import User, NGO
+from admin_panel.models import PlatformSettings
+from ..lifecycle import advance_event_statuses
+from ..models import Event
+
+
+class EventLifecycleTests(TestCase):
+
+    def setUp(self):
+        ngo_user = User.objects.create_user(username='lifengo', password='password', user_type='ngo',
+                                            email='lifengo@test.com')
+        self.ngo = NGO.objects.create(user=ngo_user, organization_name='Life NGO', registration_number='L-1')
+        self.now = timezone.now()
+        self.upcoming = self._event(hours=5)
+        self.started = self._event(hours=-2)
+        self.finished = [self._event(hours=-30 - index) for index in range(5)]
+
+    def _event(self, hours):
+        return Event.objects.create(
+            ngo=self.ngo, title='Lifecycle Event', description='...', location='Dhaka',
+            date=self.now + timedelta(hours=hours), max_volunteers=5
+        )
+
+    def _status(self, event):
+        return Event.objects.values_list('status', flat=True).get(pk=event.pk)
+
+    def test_advances_and_is_idempotent(self):
+        result = advance_event_statuses(now=self.now, chunk_size=2)
+        self.assertEqual((result['ongoing'], result['completed']), (1, 5))
+        self.assertEqual(self._status(self.upcoming), 'published')
+        self.assertEqual(self._status(self.started), 'ongoing')
+        self.assertTrue(all(self._status(event) == 'completed' for event in self.finished))
+
+        result = advance_event_statuses(now=self.now, chunk_size=2)
+        self.assertEqual((result['ongoing'], result['completed']), (0, 0))
+
+    def test_ongoing_event_completes_later(self):
+        advance_event_statuses(now=self.now)
+        result = advance_event_statuses(now=self.now + timedelta(hours=23))
+        self.assertEqual((result['ongoing'], result['completed']), (1, 1))
+        self.assertEqual(self._status(self.started), 'completed')
+        self.assertEqual(self._status(self.upcoming), 'ongoing')
+
+    def test_bumps_updated_at(self):
+        before = Event.objects.get(pk=self.started.pk).updated_at
+        advance_event_statuses(now=self.now + timedelta(seconds=1))
+        self.assertGreater(Event.objects.get(pk=self.started.pk).updated_at, before)
+
+    def test_auto_complete_disabled(self):
+        settings = PlatformSettings.load()
+        settings.auto_complete_events = False
+        settings.save()
+
+        result = advance_event_statuses(now=self.now)
+        self.assertEqual((result['ongoing'], result['completed']), (6, 0))
+        self.assertTrue(all(self._status(event) == 'ongoing' for event in self.finished))
+
+    def test_command_reports_counts(self):
+        out = StringIO()
+        call_command('advance_event_statuses', '--chunk-size', '3', stdout=out)
+        self.assertIn('1 event(s) marked ongoing.', out.getvalue())
+        self.assertIn('5 event(s) marked completed.', out.getvalue())
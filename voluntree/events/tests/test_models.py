@@ -1,5 +1,7 @@
 # events/tests/test_models.py
 
+from io import StringIO
+from django.core.management import call_command
 from django.test import TestCase
 from django.utils import timezone
 from datetime import timedelta
@@ -49,4 +51,75 @@ class EventModelTests(TestCase):
         self.assertFalse(self.future_event.is_full())
 
         EventRegistration.objects.create(event=self.future_event, volunteer=self.volunteer2, status='approved')
-        self.assertTrue(self.future_event.is_full())
\ No newline at end of file
+        self.assertTrue(self.future_event.is_full())
+
+    def test_with_stats_annotations(self):
+        EventRegistration.objects.create(event=self.future_event, volunteer=self.volunteer1, status='approved')
+        EventRegistration.objects.create(event=self.future_event, volunteer=self.volunteer2, status='pending')
+
+        event = Event.objects.with_stats().get(pk=self.future_event.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(event.get_registered_count(), 1)
+            self.assertEqual(event.get_pending_count(), 1)
+            self.assertEqual(event.get_available_spots(), 1)
+            self.assertFalse(event.is_full())
+
+    def test_with_stats_single_query_for_listing(self):
+        EventRegistration.objects.create(event=self.future_event, volunteer=self.volunteer1, status='approved')
+
+        with self.assertNumQueries(1):
+            spots = {event.pk: event.get_available_spots() for event in Event.objects.with_stats()}
+        self.assertEqual(spots, {self.future_event.pk: 1, self.past_event.pk: 2})
+
+
+class EventCounterTests(TestCase):
+
+    def setUp(self):
+        ngo_user = User.objects.create_user(username='counterngo', password='password', user_type='ngo',
+                                            email='counterngo@test.com')
+        self.ngo = NGO.objects.create(user=ngo_user, organization_name='Counter NGO')
+        self.volunteer = User.objects.create_user(username='countervol', password='password', user_type='volunteer',
+                                                  email='countervol@test.com')
+        self.event = Event.objects.create(
+            ngo=self.ngo, title='Counted Event', date=timezone.now() + timedelta(days=3), max_volunteers=5
+        )
+
+    def _counters(self):
+        self.event.refresh_from_db()
+        return self.event.approved_count, self.event.pending_count
+
+    def test_counters_follow_status_changes(self):
+        registration = EventRegistration.objects.create(event=self.event, volunteer=self.volunteer)
+        self.assertEqual(self._counters(), (0, 1))
+
+        registration = EventRegistration.objects.get(pk=registration.pk)
+        registration.status = 'approved'
+        registration.save()
+        self.assertEqual(self._counters(), (1, 0))
+
+        # Saving again without a status change must not double count
+        registration.save()
+        self.assertEqual(self._counters(), (1, 0))
+
+        registration.status = 'withdrawn'
+        registration.save()
+        self.assertEqual(self._counters(), (0, 0))
+
+    def test_counters_released_on_delete(self):
+        registration = EventRegistration.objects.create(event=self.event, volunteer=self.volunteer, status='approved')
+        self.assertEqual(self._counters(), (1, 0))
+
+        registration.delete()
+        self.assertEqual(self._counters(), (0, 0))
+
+    def test_rebuild_command_repairs_drift(self):
+        EventRegistration.objects.create(event=self.event, volunteer=self.volunteer, status='approved')
+        Event.objects.filter(pk=self.event.pk).update(approved_count=4, pending_count=2)
+
+        out = StringIO()
+        call_command('rebuild_event_counters', '--verify', stdout=out)
+        self.assertIn('1 event(s) have drifted counters.', out.getvalue())
+        self.assertEqual(self._counters(), (4, 2))
+
+        call_command('rebuild_event_counters', stdout=StringIO())
+        self.assertEqual(self._counters(), (1, 0))
@@ -0,0 +1,77 @@
+# events/tests/test_pagination.py
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from accounts.models import User, NGO
+from ..models import Event
+from ..pagination import InvalidCursor, KeysetPaginator
+from ..views import EVENT_PAGE_SIZE
+
+
+class KeysetPaginationTests(TestCase):
+
+    def setUp(self):
+        ngo_user = User.objects.create_user(username='pagengo', password='password', user_type='ngo',
+                                            email='pagengo@test.com')
+        self.ngo = NGO.objects.create(user=ngo_user, organization_name='Paging NGO', registration_number='P-1')
+        start = timezone.now() + timedelta(days=1)
+        # Pairs of events share a date so the id tie-breaker is exercised
+        self.events = [
+            Event.objects.create(
+                ngo=self.ngo, title=f'Event {i}', description='Garden work' if i % 3 == 0 else 'Cleanup',
+                location='City', date=start + timedelta(hours=i // 2), max_volunteers=5,
+                status='ongoing' if i % 4 == 0 else 'published',
+            )
+            for i in range(EVENT_PAGE_SIZE * 2 + 5)
+        ]
+
+    def _walk(self, params):
+        """Follow the JSON feed until the last page, returning event ids in order"""
+        ids, cursor = [], None
+        while True:
+            query = dict(params, **({'cursor': cursor} if cursor else {}))
+            data = self.client.get(reverse('event_list_feed'), query).json()
+            self.assertLessEqual(len(data['events']), EVENT_PAGE_SIZE)
+            ids += [card['id'] for card in data['events']]
+            cursor = data['next_cursor']
+            if not cursor:
+                return ids
+
+    def test_pages_cover_listing_in_date_order(self):
+        ids = self._walk({})
+        expected = [event.pk for event in sorted(self.events, key=lambda event: (event.date, event.pk))]
+        self.assertEqual(ids, expected)
+
+    def test_pages_stable_with_filters(self):
+        ids = self._walk({'status': 'published', 'search': 'garden'})
+        expected = [
+            event.pk for event in sorted(self.events, key=lambda event: (event.date, event.pk))
+            if event.status == 'published' and event.description == 'Garden work'
+        ]
+        self.assertCountEqual(ids, expected)
+        self.assertEqual(len(ids), len(set(ids)))
+
+    def test_deep_page_query_has_no_offset(self):
+        paginator = KeysetPaginator(Event.objects.all(), ['date', 'id'], EVENT_PAGE_SIZE)
+        _, cursor = paginator.page()
+        with self.assertNumQueries(1) as queries:
+            paginator.page(cursor)
+        self.assertNotIn('OFFSET', queries.captured_queries[0]['sql'])
+
+    def test_invalid_cursor(self):
+        paginator = KeysetPaginator(Event.objects.all(), ['date', 'id'], EVENT_PAGE_SIZE)
+        with self.assertRaises(InvalidCursor):
+            paginator.decode_cursor('not-a-cursor')
+
+        response = self.client.get(reverse('event_list_feed'), {'cursor': 'bogus'})
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.get(reverse('event_list'), {'cursor': 'bogus', 'status': 'published'})
+        self.assertRedirects(response, reverse('event_list') + '?status=published')
+
+    def test_html_page_links_to_next_page(self):
+        response = self.client.get(reverse('event_list'))
+        self.assertEqual(len(response.context['events']), EVENT_PAGE_SIZE)
+        self.assertIn('cursor=', response.context['next_page_query'])
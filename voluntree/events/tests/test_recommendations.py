@@ -0,0 +1,153 @@
+# events/tests/test_recommendations.py
+
+import threading
+from unittest import mock
+import numpy as np
+from django.test import TestCase
+from django.utils import timezone
+from datetime import timedelta
+from accounts.models import User, NGO, VolunteerProfile
+from ..models import Event, EventRegistration
+from ..recommendations import EventFeatureIndex, Recommender, recommender
+
+
+class RecommendationTests(TestCase):
+
+    def setUp(self):
+        recommender.reset()
+        ngo_user = User.objects.create_user(username='recngo', password='password', user_type='ngo',
+                                            email='recngo@test.com')
+        self.ngo = NGO.objects.create(user=ngo_user, organization_name='Green Hands', registration_number='R-1')
+        other_user = User.objects.create_user(username='recngo2', password='password', user_type='ngo',
+                                              email='recngo2@test.com')
+        self.other_ngo = NGO.objects.create(user=other_user, organization_name='City Aid', registration_number='R-2')
+
+        self.volunteer = User.objects.create_user(username='recvol', password='password', user_type='volunteer',
+                                                  email='recvol@test.com')
+        self.profile = VolunteerProfile.objects.create(
+            user=self.volunteer, skills='Teaching', interests='Environment', city='Lahore'
+        )
+
+        date = timezone.now() + timedelta(days=7)
+        self.teaching = self._event('Reading Club', 'Karachi', 'Teaching', date)
+        self.local = self._event('Park Cleanup', 'Gulberg, Lahore', '', date, ngo=self.other_ngo)
+        self.unrelated = self._event('Blood Drive', 'Quetta', 'First Aid', date, ngo=self.other_ngo)
+
+    def _event(self, title, location, skills, date, ngo=None):
+        return Event.objects.create(
+            ngo=ngo or self.ngo, title=title, description='...', location=location,
+            required_skills=skills, date=date, max_volunteers=10
+        )
+
+    def test_ranks_by_skill_then_city(self):
+        self.assertEqual(recommender.recommend(self.profile), [self.teaching, self.local])
+
+    def test_excludes_past_completed_and_registered_events(self):
+        past = self._event('Old Class', 'Lahore', 'Teaching', timezone.now() - timedelta(days=1))
+        done = self._event('Done Class', 'Lahore', 'Teaching', timezone.now() + timedelta(days=1))
+        done.status = 'completed'
+        done.save()
+        EventRegistration.objects.create(event=self.teaching, volunteer=self.volunteer)
+
+        events = recommender.recommend(self.profile)
+        self.assertNotIn(past, events)
+        self.assertNotIn(done, events)
+        self.assertNotIn(self.teaching, events)
+
+    def test_registration_history_boosts_ngo(self):
+        finished = self._event('Earlier Drive', 'Quetta', '', timezone.now() + timedelta(days=1), ngo=self.other_ngo)
+        EventRegistration.objects.create(event=finished, volunteer=self.volunteer, status='approved')
+
+        self.assertIn(self.unrelated, recommender.recommend(self.profile))
+
+    def test_incremental_sync_follows_changes(self):
+        recommender.recommend(self.profile)
+        rows = len(recommender.index.event_ids)
+
+        self.unrelated.required_skills = 'Teaching, First Aid'
+        self.unrelated.save()
+        self.local.delete()
+        new = self._event('Math Tutoring', 'Multan', 'teaching', timezone.now() + timedelta(days=3))
+
+        events = recommender.recommend(self.profile)
+        self.assertEqual(events[0], new)
+        self.assertIn(self.unrelated, events)
+        self.assertNotIn(self.local.pk, [event.pk for event in events])
+        # Changed rows were appended, not rebuilt
+        self.assertGreaterEqual(len(recommender.index.event_ids), rows)
+
+    def test_profile_changes_invalidate_volunteer_vector(self):
+        self.profile.skills = 'First Aid'
+        self.profile.save()
+        self.assertEqual(recommender.recommend(self.profile)[0], self.unrelated)
+
+    def test_changes_made_in_another_process_reach_cached_vectors(self):
+        # Its own cache, untouched by this process's signals except through the shared version tokens
+        other_process = Recommender()
+        self.assertNotIn(self.unrelated, other_process.recommend(self.profile))
+
+        finished = self._event('Earlier Drive', 'Quetta', '', timezone.now() + timedelta(days=1), ngo=self.other_ngo)
+        EventRegistration.objects.create(event=finished, volunteer=self.volunteer, status='approved')
+        self.assertIn(self.unrelated, other_process.recommend(self.profile))
+
+    def test_volunteer_cache_is_bounded(self):
+        profiles = [self.profile]
+        for index in range(2):
+            user = User.objects.create_user(username=f'lruvol{index}', password='password', user_type='volunteer',
+                                            email=f'lruvol{index}@test.com')
+            profiles.append(VolunteerProfile.objects.create(user=user, skills='Teaching', city='Lahore'))
+
+        with mock.patch('events.recommendations.VOLUNTEER_CACHE_SIZE', 2):
+            for profile in profiles:
+                recommender.recommend(profile)
+        self.assertEqual(list(recommender._volunteer_cache), [profiles[1].user_id, profiles[2].user_id])
+
+
+class EventFeatureIndexTests(TestCase):
+
+    def _records(self, count):
+        date = timezone.now().timestamp() + 3600
+        return [(event_id, event_id % 3, f'City {event_id % 5}', date, [event_id % 7]) for event_id in range(1, count + 1)]
+
+    def test_compact_preserves_scores(self):
+        index = EventFeatureIndex()
+        index.add_events(self._records(50))
+        index.remove_events(range(1, 21))
+        weights = np.ones(len(index.columns))
+        before = index.score(weights, limit=50)
+
+        index.compact()
+        self.assertEqual(len(index.event_ids), 30)
+        self.assertEqual(index.score(weights, limit=50), before)
+
+    def test_top_k_matches_full_sort(self):
+        index = EventFeatureIndex()
+        index.add_events(self._records(200))
+        weights = np.random.default_rng(1).uniform(size=len(index.columns))
+
+        ranked = index.score(weights, limit=200)
+        top = index.score(weights, limit=10)
+        self.assertEqual([score for _, score in top], [score for _, score in ranked[:10]])
+
+    def test_scoring_while_another_thread_syncs(self):
+        index = EventFeatureIndex()
+        index.add_events(self._records(200))
+        weights = np.ones(len(index.columns))
+        done = threading.Event()
+
+        def churn():
+            # What sync() does: mask old rows, append new ones, compact
+            for round_number in range(200):
+                with index._lock:
+                    index.add_events(self._records(50 + round_number % 50))
+                    index.compact()
+            done.set()
+
+        worker = threading.Thread(target=churn)
+        worker.start()
+        try:
+            while not done.is_set():
+                ranked = index.score(weights, limit=20)
+                self.assertTrue(all(1 <= event_id <= 200 for event_id, _ in ranked))
+        finally:
+            worker.join()
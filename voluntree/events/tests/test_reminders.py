@@ -0,0 +1,81 @@
+# events/tests/test_reminders.py
+
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from accounts.models import User, NGO
+from admin_panel.models import PlatformSettings
+from core.models import Notification
+from ..models import Event, EventRegistration
+from ..reminders import due_reminders, send_event_reminders
+
+
+class EventReminderTests(TestCase):
+
+    def setUp(self):
+        ngo_user = User.objects.create_user(username='remindngo', password='password', user_type='ngo',
+                                            email='remindngo@test.com')
+        self.ngo = NGO.objects.create(user=ngo_user, organization_name='Remind NGO', registration_number='R-1')
+        self.now = timezone.now()
+        self.soon = self._event('Soon', hours=5)
+        self.later = self._event('Later', hours=72)
+        self.volunteers = [
+            User.objects.create_user(username=f'remindvol{index}', password='password',
+                                     user_type='volunteer', email=f'remindvol{index}@test.com')
+            for index in range(5)
+        ]
+
+    def _event(self, title, hours):
+        return Event.objects.create(ngo=self.ngo, title=title, description='...', location='Dhaka',
+                                    date=self.now + timedelta(hours=hours), max_volunteers=10)
+
+    def _register(self, event, volunteer, status='approved'):
+        return EventRegistration.objects.create(event=event, volunteer=volunteer, status=status)
+
+    def test_reminds_approved_volunteers_of_upcoming_events_once(self):
+        for volunteer in self.volunteers[:3]:
+            self._register(self.soon, volunteer)
+        self._register(self.soon, self.volunteers[3], status='pending')
+        self._register(self.later, self.volunteers[4])
+
+        self.assertEqual(send_event_reminders(now=self.now, batch_size=2),
+                         {'sent': 3, 'skipped': 0, 'enabled': True})
+        reminders = Notification.objects.filter(dedupe_key__startswith='reminder:')
+        self.assertEqual(sorted(reminders.values_list('user__username', flat=True)),
+                         ['remindvol0', 'remindvol1', 'remindvol2'])
+        self.assertIn('Soon', reminders.first().body)
+
+        # Reruns find nothing left to send
+        self.assertEqual(send_event_reminders(now=self.now)['sent'], 0)
+        # A longer lead time picks up the later event
+        self.assertEqual(send_event_reminders(now=self.now, hours=96)['sent'], 1)
+
+    def test_disabled_in_platform_settings(self):
+        self._register(self.soon, self.volunteers[0])
+        platform = PlatformSettings.load()
+        platform.send_event_reminders = False
+        platform.save()
+
+        out = StringIO()
+        call_command('send_event_reminders', stdout=out)
+        self.assertIn('turned off', out.getvalue())
+        self.assertFalse(EventRegistration.objects.filter(reminder_sent_at__isnull=False).exists())
+
+    def test_command_reports_inactive_accounts(self):
+        self._register(self.soon, self.volunteers[0])
+        self._register(self.soon, self.volunteers[1])
+        User.objects.filter(pk=self.volunteers[1].pk).update(is_active=False)
+
+        out = StringIO()
+        call_command('send_event_reminders', stdout=out)
+        self.assertIn('1 reminder(s) queued, 1 skipped', out.getvalue())
+
+    def test_due_reminders_use_the_partial_index(self):
+        sql, params = due_reminders(self.now, 24).query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(str(row) for row in cursor.fetchall())
+        self.assertIn('events_registration_reminder', plan)
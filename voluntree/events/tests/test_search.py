@@ -0,0 +1,61 @@
+# events/tests/test_search.py
+
+from django.test import TestCase
+from django.utils import timezone
+from datetime import timedelta
+from accounts.models import User, NGO
+from certificates.models import Certificate
+from ..models import Event
+from ..search import SqliteFTSSearchBackend, get_search_backend
+
+
+class EventSearchTests(TestCase):
+
+    def setUp(self):
+        ngo_user = User.objects.create_user(username='searchngo', password='password', user_type='ngo',
+                                            email='searchngo@test.com')
+        self.ngo = NGO.objects.create(user=ngo_user, organization_name='Ocean Friends', registration_number='S-1')
+        date = timezone.now() + timedelta(days=7)
+        self.beach = Event.objects.create(
+            ngo=self.ngo, title='Beach Cleanup', description='Clean the beach and the beach path.',
+            location='Clifton', date=date, max_volunteers=10
+        )
+        self.trees = Event.objects.create(
+            ngo=self.ngo, title='Tree Planting', description='Plant trees near the beach.',
+            location='Karachi', date=date, max_volunteers=10
+        )
+        self.backend = get_search_backend()
+
+    def _search(self, query, queryset=None, **kwargs):
+        return list(self.backend.search(queryset or Event.objects.all(), query, **kwargs))
+
+    def test_uses_fts5_on_sqlite(self):
+        self.assertIsInstance(self.backend, SqliteFTSSearchBackend)
+
+    def test_results_ranked_by_relevance(self):
+        self.assertEqual(self._search('beach'), [self.beach, self.trees])
+
+    def test_prefix_and_multiple_terms(self):
+        self.assertEqual(self._search('plant kara'), [self.trees])
+        self.assertCountEqual(self._search('ocean'), [self.beach, self.trees])
+
+    def test_query_syntax_is_neutralised(self):
+        self.assertEqual(self._search('"tree* -('), [self.trees])
+        self.assertEqual(self._search('!!!'), [])
+
+    def test_index_follows_save_and_delete(self):
+        self.trees.title = 'Mangrove Restoration'
+        self.trees.save()
+        self.assertEqual(self._search('mangrove'), [self.trees])
+
+        self.trees.delete()
+        self.assertEqual(self._search('mangrove'), [])
+
+    def test_index_follows_ngo_rename(self):
+        self.ngo.organization_name = 'Sea Guardians'
+        self.ngo.save()
+        self.assertEqual(len(self._search('guardians')), 2)
+
+    def test_search_through_related_model(self):
+        certificate = Certificate.objects.create(event=self.trees, certificate_file='certificates/templates/t.pdf')
+        self.assertEqual(self._search('planting', Certificate.objects.all(), event_field='event'), [certificate])
@@ -1,7 +1,8 @@
 # events/tests/test_views.py
 
 import tempfile
-from django.test import LiveServerTestCase, override_settings
+from django.test import LiveServerTestCase, TestCase, override_settings
+from django.urls import reverse
 from django.utils import timezone
 from datetime import timedelta
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -15,6 +16,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 
 from accounts.models import User, NGO
+from certificates.rendering import sample_template
 from ..models import Event, EventRegistration
 
 
@@ -75,8 +77,9 @@ class EventFlowsTests(LiveServerTestCase):
         image_path = tempfile.NamedTemporaryFile(suffix=".jpg", delete=False).name
         self.driver.find_element(By.NAME, 'image').send_keys(image_path)
 
-        cert_path = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False).name
-        self.driver.find_element(By.NAME, 'certificate_file').send_keys(cert_path)
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as cert_file:
+            cert_file.write(sample_template())
+        self.driver.find_element(By.NAME, 'certificate_file').send_keys(cert_file.name)
 
         self.driver.find_element(By.CSS_SELECTOR, 'button[type="submit"]').click()
 
@@ -155,4 +158,28 @@ class EventFlowsTests(LiveServerTestCase):
         rejected_badge = WebDriverWait(self.driver, 10).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, ".registration-card.status-rejected .status-badge"))
         )
-        self.assertEqual('Rejected', rejected_badge.text)
\ No newline at end of file
+        self.assertEqual('Rejected', rejected_badge.text)
+
+
+class EventListViewTests(TestCase):
+
+    def setUp(self):
+        ngo_user = User.objects.create_user(username='listngo', password='password', user_type='ngo',
+                                            email='listngo@test.com')
+        self.ngo = NGO.objects.create(user=ngo_user, organization_name='List NGO')
+
+    def test_skill_filter_on_event_list(self):
+        first_aid = Event.objects.create(
+            ngo=self.ngo, title='First Aid Event', date=timezone.now() + timedelta(days=10), max_volunteers=2,
+            status='published', required_skills='Gardening, First Aid'
+        )
+        other = Event.objects.create(
+            ngo=self.ngo, title='Other Event', date=timezone.now() + timedelta(days=5), max_volunteers=2,
+            required_skills='Teaching'
+        )
+
+        response = self.client.get(reverse('event_list'), {'skill': 'first aid'})
+        self.assertEqual(list(response.context['events']), [first_aid])
+        self.assertCountEqual([skill.name for skill in response.context['skills']],
+                              ['Gardening', 'First Aid', 'Teaching'])
+        self.assertNotIn(other, response.context['events'])
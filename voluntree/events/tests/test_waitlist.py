@@ -0,0 +1,119 @@
+# events/tests/test_waitlist.py
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from accounts.models import User, NGO
+from ..models import Event, EventRegistration
+
+
+class WaitlistTests(TestCase):
+
+    def setUp(self):
+        ngo_user = User.objects.create_user(username='waitngo', password='password', user_type='ngo',
+                                            email='waitngo@test.com')
+        self.ngo = NGO.objects.create(user=ngo_user, organization_name='Wait NGO', registration_number='W-1')
+        self.event = Event.objects.create(
+            ngo=self.ngo, title='Waitlist Event', description='...', location='Dhaka',
+            date=timezone.now() + timedelta(days=3), max_volunteers=1
+        )
+        self.volunteers = [
+            User.objects.create_user(username=f'waitvol{index}', password='password',
+                                     user_type='volunteer', email=f'waitvol{index}@test.com')
+            for index in range(4)
+        ]
+        self.approved = EventRegistration.objects.create(event=self.event, volunteer=self.volunteers[0])
+        self.approved.change_status('approved')
+
+    def _join(self, volunteer):
+        return EventRegistration.objects.create(event=self.event, volunteer=volunteer, status='waitlisted')
+
+    def _status(self, registration):
+        registration.refresh_from_db()
+        return registration.status
+
+    def test_positions_are_ordered(self):
+        first, second = self._join(self.volunteers[1]), self._join(self.volunteers[2])
+        self.assertEqual((first.waitlist_position, second.waitlist_position), (1, 2))
+        self.assertEqual((first.get_waitlist_rank(), second.get_waitlist_rank()), (1, 2))
+
+        first.change_status('withdrawn')
+        first.refresh_from_db()
+        self.assertIsNone(first.waitlist_position)
+        self.assertEqual(second.get_waitlist_rank(), 1)
+
+    def test_withdrawal_promotes_head_of_waitlist(self):
+        first, second = self._join(self.volunteers[1]), self._join(self.volunteers[2])
+
+        self.approved.change_status('withdrawn')
+        self.assertEqual(self._status(first), 'approved')
+        self.assertIsNone(first.waitlist_position)
+        self.assertEqual(self._status(second), 'waitlisted')
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.approved_count, 1)
+
+    def test_rejection_and_deletion_free_spots(self):
+        first, second = self._join(self.volunteers[1]), self._join(self.volunteers[2])
+
+        self.approved.change_status('rejected')
+        self.assertEqual(self._status(first), 'approved')
+
+        first.delete()
+        self.assertEqual(self._status(second), 'approved')
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.approved_count, 1)
+
+    def test_raising_capacity_promotes(self):
+        waiting = [self._join(volunteer) for volunteer in self.volunteers[1:]]
+
+        self.event.max_volunteers = 3
+        self.event.save()
+        promoted = self.event.promote_waitlisted()
+        self.assertEqual([registration.pk for registration in promoted], [waiting[0].pk, waiting[1].pk])
+        self.assertEqual(self.event.approved_count, 3)
+        self.assertEqual(self._status(waiting[2]), 'waitlisted')
+
+    def test_joining_with_free_spot_is_promoted(self):
+        # A spot freed between the is_full() check and joining the waitlist
+        self.event.max_volunteers = 2
+        self.event.save()
+        registration = self._join(self.volunteers[1])
+        self.assertEqual(registration.status, 'approved')
+        self.assertEqual(self._status(registration), 'approved')
+
+    def test_stale_event_save_keeps_counters(self):
+        stale = Event.objects.get(pk=self.event.pk)
+        self._join(self.volunteers[1])
+        stale.title = 'Renamed'
+        stale.save()
+
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.approved_count, self.event.last_waitlist_position), (1, 1))
+        self.assertEqual(self._join(self.volunteers[2]).waitlist_position, 2)
+
+    def test_head_lookup_uses_waitlist_index(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Query plan check is SQLite specific')
+        queryset = EventRegistration.objects.filter(
+            event_id=self.event.pk, status='waitlisted'
+        ).order_by('waitlist_position')[:1]
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+        self.assertIn('events_registration_waitlist_position', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_register_view_joins_waitlist(self):
+        self.client.login(username='waitvol1', password='password')
+        response = self.client.post(reverse('event_register', args=[self.event.pk]), follow=True)
+
+        registration = EventRegistration.objects.get(event=self.event, volunteer=self.volunteers[1])
+        self.assertEqual(registration.status, 'waitlisted')
+        self.assertContains(response, 'number 1 on the waitlist')
+
+        self.client.login(username='waitvol0', password='password')
+        self.client.post(reverse('event_withdraw', args=[self.approved.pk]))
+        self.assertEqual(self._status(registration), 'approved')
@@ -5,6 +5,7 @@ from . import views
 
 urlpatterns = [
     path('', views.event_list, name='event_list'),
+    path('feed/', views.event_list_feed, name='event_list_feed'),
     path('<int:pk>/', views.event_detail, name='event_detail'),
     path('create/', views.event_create, name='event_create'),
     path('<int:pk>/edit/', views.event_edit, name='event_edit'),
@@ -12,8 +13,13 @@ urlpatterns = [
     path('<int:pk>/register/', views.event_register, name='event_register'),
     path('registration/<int:pk>/withdraw/', views.event_withdraw, name='event_withdraw'),
     path('my-events/', views.my_events, name='my_events'),
+    path('recommended/', views.recommended_events, name='recommended_events'),
     path('ngo-events/', views.ngo_events, name='ngo_events'),
+    path('calendar/<str:token>.ics', views.calendar_feed, name='calendar_feed'),
+    path('calendar/reset/', views.calendar_feed_reset, name='calendar_feed_reset'),
     path('<int:pk>/manage/', views.manage_registrations, name='manage_registrations'),
+    path('<int:pk>/manage/bulk/', views.bulk_update_registrations, name='bulk_update_registrations'),
+    path('<int:pk>/manage/export/', views.export_registrations, name='export_registrations'),
     path('registration/<int:pk>/approve/', views.approve_registration, name='approve_registration'),
     path('registration/<int:pk>/reject/', views.reject_registration, name='reject_registration'),
 ]
\ No newline at end of file
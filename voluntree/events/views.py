@@ -1,46 +1,103 @@
 #events/views.py
 
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
+from django.http import Http404, HttpResponse, JsonResponse
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Q
+from django.db import IntegrityError
 from django.utils import timezone
-from .models import Event, EventRegistration
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.http import require_POST, require_safe
+from .models import CalendarFeed, Event, EventFullError, EventRegistration
+from .calendar import calendar_body, feed_etag, feed_version, forget_token, resolve_token
+from .cards import render_event_cards
+from .conditional import conditional_page, event_set_state
+from .exports import REGISTRATION_HEADER, export_response, registration_rows
+from .filters import filter_public_events
 from .forms import EventForm
-from accounts.models import NGO
+from .pagination import InvalidCursor, KeysetPaginator
+from .recommendations import recommender
+from .tasks import notify_event_published, notify_event_updated
+from accounts.models import NGO, Skill, VolunteerProfile
 from certificates.models import Certificate
 
 
+EVENT_PAGE_SIZE = 12
+EVENT_CARD_TEMPLATE = 'events/partials/event_card.html'
+NGO_EVENT_CARD_TEMPLATE = 'events/partials/ngo_event_card.html'
+RECOMMENDATION_COUNT = 12
+RADIUS_CHOICES_KM = [5, 10, 25, 50, 100]
+
+
+def _filtered_events(request):
+    """The public listing's queryset for the request's filters: (events, ordering, filters)"""
+    return filter_public_events(Event.objects.with_stats().select_related('ngo'), request.GET)
+
+
+def _event_list_page(request):
+    """Keyset-paginated public listing shared by the page and its JSON feed"""
+    events, ordering, filters = _filtered_events(request)
+    paginator = KeysetPaginator(events, ordering, EVENT_PAGE_SIZE)
+    page, next_cursor = paginator.page(request.GET.get('cursor'))
+    return page, next_cursor, filters
+
+
+def _event_list_state(request):
+    events, _, _ = _filtered_events(request)
+    return event_set_state(events)
+
+
+def _event_detail_state(request, pk):
+    return event_set_state(Event.objects.filter(pk=pk))
+
+
+@conditional_page(_event_list_state)
 def event_list(request):
     """Public event listing - anyone can view, hides past events"""
-    # Filter out past events by default
-    events = Event.objects.filter(date__gte=timezone.now())
-
-    # Search functionality
-    search_query = request.GET.get('search', '')
-    if search_query:
-        events = events.filter(
-            Q(title__icontains=search_query) |
-            Q(description__icontains=search_query) |
-            Q(location__icontains=search_query)
-        )
-
-    # Filter by status
-    status_filter = request.GET.get('status', '')
-    if status_filter:
-        events = events.filter(status=status_filter)
+    try:
+        events, next_cursor, filters = _event_list_page(request)
+    except InvalidCursor:
+        # Stale or hand-edited cursor: start from the first page
+        query = request.GET.copy()
+        query.pop('cursor')
+        return redirect(f'{request.path}?{query.urlencode()}')
+
+    next_page_query = ''
+    if next_cursor:
+        query = request.GET.copy()
+        query['cursor'] = next_cursor
+        next_page_query = query.urlencode()
 
     context = {
-        'events': events,
-        'search_query': search_query,
-        'status_filter': status_filter,
+        'events': render_event_cards(events, EVENT_CARD_TEMPLATE, request),
+        **filters,
+        'radius_choices': RADIUS_CHOICES_KM,
+        'skills': Skill.objects.filter(events__date__gte=timezone.now()).distinct(),
+        'next_cursor': next_cursor,
+        'next_page_query': next_page_query,
     }
     return render(request, 'events/event_list.html', context)
 
 
+def event_list_feed(request):
+    """JSON page of event cards for infinite scroll on the event list"""
+    try:
+        events, next_cursor, _ = _event_list_page(request)
+    except InvalidCursor:
+        return JsonResponse({'error': 'Invalid cursor.'}, status=400)
+
+    cards = [
+        {'id': event.pk, 'html': event.card_html}
+        for event in render_event_cards(events, EVENT_CARD_TEMPLATE, request)
+    ]
+    return JsonResponse({'events': cards, 'next_cursor': next_cursor})
+
+
+@conditional_page(_event_detail_state)
 def event_detail(request, pk):
     """Public event detail - anyone can view"""
-    event = get_object_or_404(Event, pk=pk)
+    event = get_object_or_404(Event.objects.with_stats(), pk=pk)
 
     # Check if current user has registered (if logged in)
     user_registration = None
@@ -51,7 +108,7 @@ def event_detail(request, pk):
         ).first()
 
     # Get skill list
-    skills_list = [s.strip() for s in event.required_skills.split(',') if s.strip()]
+    skills_list = event.skill_tags.all()
 
     # Get approved volunteers
     approved_volunteers = event.registrations.filter(status='approved').select_related('volunteer')
@@ -94,6 +151,7 @@ def event_create(request):
                     status='pending'
                 )
 
+            notify_event_published.delay(event.pk)
             messages.success(request, 'Event created successfully! Certificate is pending admin approval.')
             return redirect('ngo_events')
     else:
@@ -120,6 +178,14 @@ def event_edit(request, pk):
         form = EventForm(request.POST, request.FILES, instance=event)
         if form.is_valid():
             event = form.save()
+            # Extra spots go to the waitlist straight away
+            if 'max_volunteers' in form.changed_data:
+                event.promote_waitlisted()
+            if {'title', 'date', 'location'} & set(form.changed_data):
+                notify_event_updated.delay(event.pk)
+            if 'date' in form.changed_data:
+                # Remind again before the new date
+                event.registrations.update(reminder_sent_at=None)
 
             # Handle certificate upload/replacement
             certificate_file = form.cleaned_data.get('certificate_file')
@@ -186,19 +252,31 @@ def event_register(request, pk):
         messages.warning(request, 'You have already applied for this event.')
         return redirect('event_detail', pk=pk)
 
-    # Check if event is full
-    if event.is_full():
-        messages.error(request, 'This event is at full capacity.')
-        return redirect('event_detail', pk=pk)
+    # A full event puts further volunteers on its waitlist
+    status = 'waitlisted' if event.is_full() else 'pending'
 
-    # Create registration
-    EventRegistration.objects.create(
-        event=event,
-        volunteer=request.user,
-        status='pending'
-    )
+    # Create registration (unique_together catches a concurrent double submit)
+    try:
+        registration = EventRegistration.objects.create(
+            event=event,
+            volunteer=request.user,
+            status=status
+        )
+    except IntegrityError:
+        messages.warning(request, 'You have already applied for this event.')
+        return redirect('event_detail', pk=pk)
 
-    messages.success(request, 'Application submitted! Waiting for NGO approval.')
+    if registration.status == 'waitlisted':
+        messages.info(
+            request,
+            f'This event is full. You are number {registration.get_waitlist_rank()} on the waitlist '
+            f'and will be registered automatically when a spot opens up.'
+        )
+    elif status == 'waitlisted':
+        # A spot freed up while joining the waitlist
+        messages.success(request, "A spot just opened up - you're registered for this event!")
+    else:
+        messages.success(request, 'Application submitted! Waiting for NGO approval.')
     return redirect('event_detail', pk=pk)
 
 
@@ -211,16 +289,60 @@ def event_withdraw(request, pk):
 
     registration = get_object_or_404(EventRegistration, pk=pk, volunteer=request.user)
 
-    if registration.status == 'withdrawn':
+    was_waitlisted = registration.status == 'waitlisted'
+    if registration.status == 'withdrawn' or not registration.change_status('withdrawn'):
         messages.warning(request, 'You have already withdrawn from this event.')
+    elif was_waitlisted:
+        messages.success(request, 'You have left the waitlist.')
     else:
-        registration.status = 'withdrawn'
-        registration.save()
         messages.success(request, 'You have withdrawn from the event.')
 
     return redirect('my_events')
 
 
+def _calendar_urls(request):
+    """Feed URL of the user's calendar, plus its webcal:// form for one-click subscribing"""
+    feed = CalendarFeed.for_user(request.user)
+    url = request.build_absolute_uri(reverse('calendar_feed', args=[feed.token]))
+    return {'calendar_url': url, 'calendar_webcal_url': 'webcal://' + url.split('://', 1)[1]}
+
+
+@require_safe
+def calendar_feed(request, token):
+    """
+    Public iCalendar feed behind a secret token (no login: calendar apps
+    cannot send a session). Unchanged feeds are served from the cache.
+    """
+    owner = resolve_token(token)
+    if owner is None:
+        raise Http404('Unknown calendar feed.')
+    user_id, user_type = owner
+
+    version = feed_version(user_id)
+    etag = feed_etag(token, version)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    response = HttpResponse(
+        calendar_body(request, token, user_id, user_type, version), content_type='text/calendar; charset=utf-8'
+    )
+    response['ETag'] = etag
+    response['Content-Disposition'] = 'inline; filename="voluntree.ics"'
+    patch_cache_control(response, private=True, max_age=300)
+    return response
+
+
+@login_required
+@require_POST
+def calendar_feed_reset(request):
+    """Replace the user's feed token, revoking the old URL"""
+    feed = CalendarFeed.for_user(request.user)
+    forget_token(feed.regenerate())
+    messages.success(request, 'Your calendar link was reset. Subscribe again with the new link.')
+    return redirect('ngo_events' if request.user.user_type == 'ngo' else 'my_events')
+
+
 @login_required
 def my_events(request):
     """Volunteer's registered events"""
@@ -236,10 +358,27 @@ def my_events(request):
 
     context = {
         'registrations': registrations,
+        **_calendar_urls(request),
     }
     return render(request, 'events/my_events.html', context)
 
 
+@login_required
+def recommended_events(request):
+    """Upcoming events ranked against the volunteer's skills, interests, city and history"""
+    if request.user.user_type != 'volunteer':
+        messages.error(request, 'Access denied.')
+        return redirect('event_list')
+
+    profile = VolunteerProfile.objects.filter(user=request.user).first()
+    events = recommender.recommend(profile, limit=RECOMMENDATION_COUNT) if profile else []
+
+    context = {
+        'events': render_event_cards(events, EVENT_CARD_TEMPLATE, request),
+    }
+    return render(request, 'events/recommended_events.html', context)
+
+
 @login_required
 def ngo_events(request):
     """NGO's created events"""
@@ -248,11 +387,12 @@ def ngo_events(request):
         return redirect('event_list')
 
     ngo = NGO.objects.get(user=request.user)
-    events = Event.objects.filter(ngo=ngo)
+    events = Event.objects.with_stats().select_related('certificate').filter(ngo=ngo)
 
     context = {
-        'events': events,
+        'events': render_event_cards(events, NGO_EVENT_CARD_TEMPLATE, request),
         'ngo': ngo,
+        **_calendar_urls(request),
     }
     return render(request, 'events/ngo_events.html', context)
 
@@ -264,24 +404,116 @@ def manage_registrations(request, pk):
         messages.error(request, 'Access denied.')
         return redirect('event_list')
 
-    event = get_object_or_404(Event, pk=pk)
+    event = get_object_or_404(Event.objects.with_stats(), pk=pk)
     ngo = NGO.objects.get(user=request.user)
 
     if event.ngo != ngo:
         messages.error(request, 'You can only manage your own events.')
         return redirect('ngo_events')
 
-    registrations = event.registrations.exclude(
+    registrations = list(event.registrations.exclude(
         status='withdrawn'
-    ).select_related('volunteer', 'volunteer__volunteer_profile')
+    ).select_related('volunteer', 'volunteer__volunteer_profile'))
+
+    # Waitlist places, counted from the positions already loaded
+    waitlisted = sorted(
+        (registration for registration in registrations if registration.status == 'waitlisted'),
+        key=lambda registration: registration.waitlist_position,
+    )
+    for rank, registration in enumerate(waitlisted, start=1):
+        registration.waitlist_rank = rank
+
+    # Applications left over by a bulk approval that hit capacity
+    overflow_ids = {int(value) for value in request.GET.get('overflow', '').split(',') if value.isdigit()}
 
     context = {
         'event': event,
         'registrations': registrations,
+        'waitlist_count': len(waitlisted),
+        'overflow_ids': overflow_ids,
     }
     return render(request, 'events/manage_registrations.html', context)
 
 
+@login_required
+def bulk_update_registrations(request, pk):
+    """NGO approves or rejects many registrations of an event at once"""
+    if request.user.user_type != 'ngo':
+        messages.error(request, 'Access denied.')
+        return redirect('event_list')
+
+    event = get_object_or_404(Event, pk=pk)
+    ngo = NGO.objects.get(user=request.user)
+
+    if event.ngo != ngo:
+        messages.error(request, 'You can only manage your own events.')
+        return redirect('ngo_events')
+
+    if request.method != 'POST':
+        return redirect('manage_registrations', pk=pk)
+
+    registration_ids = [int(value) for value in request.POST.getlist('registration_ids') if value.isdigit()]
+    action = request.POST.get('action')
+    if not registration_ids:
+        messages.warning(request, 'Select at least one application first.')
+        return redirect('manage_registrations', pk=pk)
+
+    if action == 'approve':
+        try:
+            approved, overflow = event.approve_registrations(registration_ids)
+        except EventFullError:
+            messages.error(request, 'Spots were changing too quickly. Please try again.')
+            return redirect('manage_registrations', pk=pk)
+
+        if approved:
+            messages.success(request, f'{len(approved)} volunteer(s) approved.')
+        if overflow:
+            messages.warning(
+                request,
+                f'Event is at full capacity: {len(overflow)} application(s) could not be approved '
+                f'and are still selected below.'
+            )
+            return redirect(f"{reverse('manage_registrations', args=[pk])}?overflow={','.join(map(str, overflow))}")
+        skipped = len(registration_ids) - len(approved)
+    elif action == 'reject':
+        rejected = event.reject_registrations(registration_ids)
+        if rejected:
+            messages.success(request, f'{len(rejected)} application(s) rejected.')
+        skipped = len(registration_ids) - len(rejected)
+    else:
+        messages.error(request, 'Unknown action.')
+        return redirect('manage_registrations', pk=pk)
+
+    if skipped:
+        messages.info(request, f'{skipped} selected application(s) were no longer pending and were skipped.')
+    return redirect('manage_registrations', pk=pk)
+
+
+@login_required
+def export_registrations(request, pk):
+    """NGO downloads the roster of an event as CSV (default) or ?format=xlsx"""
+    if request.user.user_type != 'ngo':
+        messages.error(request, 'Access denied.')
+        return redirect('event_list')
+
+    event = get_object_or_404(Event, pk=pk)
+    ngo = NGO.objects.get(user=request.user)
+
+    if event.ngo != ngo:
+        messages.error(request, 'You can only manage your own events.')
+        return redirect('ngo_events')
+
+    registrations = event.registrations.order_by('applied_at', 'pk')
+    status_filter = request.GET.get('status', '')
+    if status_filter:
+        registrations = registrations.filter(status=status_filter)
+
+    return export_response(
+        request.GET.get('format'), f'registrations-event-{event.pk}', REGISTRATION_HEADER,
+        registration_rows(registrations),
+    )
+
+
 @login_required
 def approve_registration(request, pk):
     """NGO approves a volunteer registration"""
@@ -296,13 +528,17 @@ def approve_registration(request, pk):
         messages.error(request, 'Access denied.')
         return redirect('ngo_events')
 
-    # Check if event is full
-    if registration.event.is_full() and registration.status != 'approved':
+    # Capacity is reserved atomically, so concurrent approvals cannot overshoot
+    try:
+        changed = registration.change_status('approved', enforce_capacity=True)
+    except EventFullError:
         messages.error(request, 'Event is at full capacity.')
         return redirect('manage_registrations', pk=registration.event.pk)
 
-    registration.status = 'approved'
-    registration.save()
+    if not changed:
+        messages.warning(request, 'This registration was updated in the meantime. Please review it again.')
+        return redirect('manage_registrations', pk=registration.event.pk)
+
     messages.success(request, f'{registration.volunteer.username} has been approved!')
 
     return redirect('manage_registrations', pk=registration.event.pk)
@@ -322,8 +558,10 @@ def reject_registration(request, pk):
         messages.error(request, 'Access denied.')
         return redirect('ngo_events')
 
-    registration.status = 'rejected'
-    registration.save()
+    if not registration.change_status('rejected'):
+        messages.warning(request, 'This registration was updated in the meantime. Please review it again.')
+        return redirect('manage_registrations', pk=registration.event.pk)
+
     messages.success(request, f'{registration.volunteer.username} has been rejected.')
 
     return redirect('manage_registrations', pk=registration.event.pk)
\ No newline at end of file
@@ -122,6 +122,53 @@
             });
         }
 
+        // ===========================
+        // Assign To All Approved
+        // ===========================
+        const assignAllForm = document.querySelector('.assign-all-form');
+        if (assignAllForm) {
+            assignAllForm.addEventListener('submit', function(e) {
+                const count = this.dataset.count;
+                if (!confirm(`Assign the certificate to all ${count} approved volunteer(s) who don't have it yet?`)) {
+                    e.preventDefault();
+                }
+            });
+        }
+
+        // ===========================
+        // Personalized Certificate Progress
+        // ===========================
+        const generationSection = document.querySelector('.generation-section');
+        if (generationSection && generationSection.dataset.active) {
+            const progress = generationSection.querySelector('.generation-progress');
+            const progressFill = generationSection.querySelector('.progress-fill');
+            const progressText = generationSection.querySelector('.progress-text');
+            const generateBtn = generationSection.querySelector('.generation-form button');
+            const labels = {queued: 'Queued', running: 'Running', done: 'Done', failed: 'Failed'};
+
+            const pollProgress = function() {
+                fetch(generationSection.dataset.statusUrl, {credentials: 'same-origin'})
+                    .then(response => response.json())
+                    .then(data => {
+                        const run = data.run;
+                        if (!run) return;
+                        progress.hidden = false;
+                        progressFill.style.width = `${run.percent}%`;
+                        progressText.textContent = `${run.completed} / ${run.total} · ${labels[run.status]}`;
+                        if (run.status === 'queued' || run.status === 'running') {
+                            setTimeout(pollProgress, 2000);
+                        } else {
+                            generateBtn.disabled = false;
+                            showNotification(run.status === 'done'
+                                ? 'Personalized certificates are ready!'
+                                : 'Certificate generation failed.', run.status === 'done' ? 'success' : 'error');
+                        }
+                    })
+                    .catch(() => setTimeout(pollProgress, 5000));
+            };
+            setTimeout(pollProgress, 2000);
+        }
+
         // ===========================
         // Volunteer Item Click (Select on Row Click)
         // ===========================
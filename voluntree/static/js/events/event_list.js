@@ -506,6 +506,69 @@ viewNgoButtons.forEach(button => {
             });
         }
 
+        // ===========================
+        // Infinite Scroll
+        // ===========================
+        function setupInfiniteScroll() {
+            const eventsGrid = document.querySelector('.events-grid');
+            const loadMore = document.querySelector('.load-more');
+            if (!eventsGrid || !loadMore || !eventsGrid.dataset.nextCursor) return;
+
+            const loadMoreButton = loadMore.querySelector('.btn-load-more');
+            let loading = false;
+
+            function loadNextPage() {
+                const cursor = eventsGrid.dataset.nextCursor;
+                if (loading || !cursor) return;
+                loading = true;
+                loadMoreButton.classList.add('loading');
+                loadMoreButton.textContent = 'Loading...';
+
+                // Keep the current search/status filters, only move the cursor
+                const params = new URLSearchParams(window.location.search);
+                params.set('cursor', cursor);
+
+                fetch(`${eventsGrid.dataset.feedUrl}?${params.toString()}`, {
+                    headers: { 'Accept': 'application/json' }
+                })
+                    .then(response => {
+                        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                        return response.json();
+                    })
+                    .then(data => {
+                        const template = document.createElement('template');
+                        template.innerHTML = data.events.map(event => event.html).join('');
+                        eventsGrid.appendChild(template.content);
+
+                        eventsGrid.dataset.nextCursor = data.next_cursor || '';
+                        if (!data.next_cursor) {
+                            observer.disconnect();
+                            loadMore.remove();
+                        }
+                    })
+                    .catch(() => {
+                        showNotification('Could not load more events', 'error');
+                    })
+                    .finally(() => {
+                        loading = false;
+                        loadMoreButton.classList.remove('loading');
+                        loadMoreButton.textContent = 'Load More Events';
+                    });
+            }
+
+            const observer = new IntersectionObserver((entries) => {
+                if (entries.some(entry => entry.isIntersecting)) {
+                    loadNextPage();
+                }
+            }, { rootMargin: '400px' });
+            observer.observe(loadMore);
+
+            loadMoreButton.addEventListener('click', function(e) {
+                e.preventDefault();
+                loadNextPage();
+            });
+        }
+
         // ===========================
         // Utility Functions
         // ===========================
@@ -674,6 +737,29 @@ viewNgoButtons.forEach(button => {
             console.log(`Ongoing: ${ongoingEvents}`);
         }
 
+        // ===========================
+        // Near Me (browser geolocation)
+        // ===========================
+        function setupNearMe() {
+            const nearButton = document.querySelector('[data-near-me]');
+            const nearInput = document.querySelector('input[name="near"]');
+            if (!nearButton || !nearInput || !('geolocation' in navigator)) return;
+
+            nearButton.hidden = false;
+            nearButton.addEventListener('click', function() {
+                nearButton.disabled = true;
+                nearButton.textContent = 'Locating...';
+                navigator.geolocation.getCurrentPosition(function(position) {
+                    const coords = position.coords;
+                    nearInput.value = coords.latitude.toFixed(4) + ',' + coords.longitude.toFixed(4);
+                    nearInput.form.submit();
+                }, function() {
+                    nearButton.disabled = false;
+                    nearButton.textContent = '📍 Location unavailable';
+                }, { timeout: 10000, maximumAge: 600000 });
+            });
+        }
+
         // ===========================
         // Initialize All Features
         // ===========================
@@ -683,6 +769,8 @@ viewNgoButtons.forEach(button => {
         setupLazyLoading();
         highlightSearchQuery();
         displayStats();
+        setupInfiniteScroll();
+        setupNearMe();
 
         // ===========================
         // Console Message
@@ -89,6 +89,33 @@
             }, stepTime);
         }
 
+        // ===========================
+        // Bulk Selection
+        // ===========================
+        const bulkForm = document.getElementById('bulk-form');
+        if (bulkForm) {
+            const selectAll = document.getElementById('select-all');
+            const rowBoxes = document.querySelectorAll('.registration-select');
+            const selectedCount = bulkForm.querySelector('.selected-count');
+            const bulkButtons = bulkForm.querySelectorAll('.bulk-buttons button');
+
+            function updateBulkState() {
+                const checked = Array.from(rowBoxes).filter(box => box.checked).length;
+                selectedCount.textContent = checked + ' selected';
+                bulkButtons.forEach(button => button.disabled = checked === 0);
+                selectAll.checked = rowBoxes.length > 0 && checked === rowBoxes.length;
+                selectAll.indeterminate = checked > 0 && checked < rowBoxes.length;
+            }
+
+            selectAll.disabled = rowBoxes.length === 0;
+            selectAll.addEventListener('change', function() {
+                rowBoxes.forEach(box => box.checked = selectAll.checked);
+                updateBulkState();
+            });
+            rowBoxes.forEach(box => box.addEventListener('change', updateBulkState));
+            updateBulkState();
+        }
+
         // ===========================
         // Add Ripple Effect to Buttons
         // ===========================
@@ -116,11 +116,44 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Uploads are stored once per distinct content (core/storage.py)
+STORAGES = {
+    'default': {'BACKEND': 'core.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
 AUTH_USER_MODEL = 'accounts.User'  # Custom user model
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'landing'
 LOGOUT_REDIRECT_URL = 'landing'
 
+# Turns Event.location into coordinates for the "near" filter.
+# events.geocoding.NominatimGeocoder looks places up on OpenStreetMap instead.
+EVENT_GEOCODER = 'events.geocoding.GazetteerGeocoder'
+
+# Background tasks (core/taskqueue.py) are run by `manage.py runworker`, which a deployment
+# must keep running next to the web server (`manage.py check --database default` warns when
+# queued tasks sit overdue). TASK_QUEUE_EAGER runs them inline as they are queued; it is for
+# tests (override_settings) only, and `check --deploy` warns if it is on.
+TASK_QUEUE_EAGER = False
+
+# Notification emails (core/notifications.py). Printed to the console until an SMTP
+# backend is configured; tests use the locmem backend.
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+DEFAULT_FROM_EMAIL = 'Voluntree <noreply@voluntree.local>'
+
+# Event card and calendar feed versions (events/cards.py, events/calendar.py), verification
+# results and image manifests are kept in the cache, so every worker process must share it.
+# The default per-process cache only suits a single process such as runserver; with more,
+# set e.g. CACHE_BACKEND=django.core.cache.backends.redis.RedisCache and
+# CACHE_LOCATION=redis://127.0.0.1:6379 (`manage.py check --deploy` warns otherwise).
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    }
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
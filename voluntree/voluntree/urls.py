@@ -12,6 +12,7 @@ urlpatterns = [
     path('events/', include('events.urls')),
     path('certificates/', include('certificates.urls')),  # ADD THIS LINE
     path('admin-panel/', include('admin_panel.urls')),
+    path('api/v1/', include('events.api_urls')),
 ]
 
 # Serve media files in development